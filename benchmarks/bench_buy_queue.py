@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# /root/ux-solsniper/benchmarks/bench_buy_queue.py
+"""Queue drain time of the buy worker pool under bursty input.
+
+Runs the real SniperBot worker code with simulated stage latencies (no
+network, no Telegram) and prints how long each burst takes to drain and the
+worst signal-to-buy delay for several BUY_CONCURRENCY values, with the
+sequential and the pipelined (BUY_PIPELINE, /order overlapping metadata)
+buy path.
+
+    python benchmarks/bench_buy_queue.py --concurrency 1 2 4 8 --bursts 5 --burst-size 3
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger
+import capital
+import sniper
+from capital import CapitalLedger
+from sniper import SniperBot
+from signal_queue import SignalQueue
+from filters import FilterEngine
+
+STAGES = {"metadata": 0.4, "sizing": 0.05, "order": 0.5, "execute": 1.2}
+
+def _jitter(sec: float) -> float:
+    return sec * random.uniform(0.7, 1.3)
+
+async def fake_metadata(session, ca):
+    await asyncio.sleep(_jitter(STAGES["metadata"]))
+    return {"priceUsd": 0.0001, "marketCap": 50_000.0, "liquidity": 10_000.0, "source": "bench"}
+
+async def fake_sizing(session, config, usd_amount=None):
+    await asyncio.sleep(_jitter(STAGES["sizing"]))
+    return int((usd_amount or 10.0) / 150.0 * 1e9), 150.0
+
+async def fake_order(session, output_mint, amount, wallet, config):
+    await asyncio.sleep(_jitter(STAGES["order"]))
+    return SimpleNamespace(mint=output_mint, lamports=amount)
+
+async def fake_buy(session, prepared=None, **kwargs):
+    if prepared is None:
+        await asyncio.sleep(_jitter(STAGES["order"]))
+    await asyncio.sleep(_jitter(STAGES["execute"]))
+    return f"BENCH{random.getrandbits(64):016x}"
+
+class NullMonitor:
+    def add(self, **kwargs):
+        pass
+
+def make_bot(concurrency: int, mev_delay: list[float], pipeline: bool) -> SniperBot:
+    config = {
+        "DRY_RUN": 0,
+        "BUY_PIPELINE": int(pipeline),
+        "MAX_BUYS_PER_DAY": 10_000,
+        "DAILY_CAPITAL_USD": 100.0,
+        "BUY_FEE_PERCENT": 1.0,
+        "TAKE_PROFIT": 40.0,
+        "STOP_LOSS": -20.0,
+        "BUY_CONCURRENCY": concurrency,
+        "MAX_OPEN_POSITIONS": concurrency,
+        "MEV_DELAY_SEC": mev_delay,
+    }
+    # Skip __init__: it needs a wallet and a Telegram session
+    bot = SniperBot.__new__(SniperBot)
+    bot.config = config
+    bot.wallet = None
+    bot.queue = SignalQueue(max_age=3600)
+    bot.capital = CapitalLedger(config)
+    bot.cycle = 0
+    bot.next_reset = None
+    bot.monitor = NullMonitor()
+    bot.filters = FilterEngine(config, lookup=fake_metadata)
+    return bot
+
+async def run(concurrency: int, bursts: int, burst_size: int, gap: float, mev_delay: list[float], pipeline: bool):
+    bot = make_bot(concurrency, mev_delay, pipeline)
+    done_at: dict[str, float] = {}
+    original_confirm = bot.capital.confirm
+
+    def confirm(ca):
+        done_at[ca] = time.perf_counter()
+        original_confirm(ca)
+        bot.capital.release(ca)  # positions close instantly in the bench
+
+    bot.capital.confirm = confirm
+    workers = [asyncio.create_task(bot._buy_worker(i, SimpleNamespace(trade=None, price=None))) for i in range(concurrency)]
+
+    enqueued_at: dict[str, float] = {}
+    started = time.perf_counter()
+    for b in range(bursts):
+        for i in range(burst_size):
+            ca = f"BENCH{b:03d}{i:03d}"
+            enqueued_at[ca] = time.perf_counter()
+            await bot.queue.put(ca)
+        await asyncio.sleep(gap)
+    while len(done_at) < len(enqueued_at):
+        await asyncio.sleep(0.01)
+    drain = time.perf_counter() - started
+
+    for w in workers:
+        w.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    delays = sorted(done_at[ca] - enqueued_at[ca] for ca in enqueued_at)
+    return drain, delays[len(delays) // 2], delays[-1]
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument("--burst-size", type=int, default=3)
+    parser.add_argument("--gap", type=float, default=2.0, help="seconds between bursts")
+    parser.add_argument("--mev-delay", type=float, nargs=2, default=[2.5, 4.0])
+    args = parser.parse_args()
+    logger.remove()
+
+    # Ledger reads the compounding balance from position_state.json
+    capital.get_balance = lambda: 100.0
+    sniper.get_mcap_and_price = fake_metadata
+    sniper.compute_buy_size = fake_sizing
+    sniper.fetch_buy_order = fake_order
+    sniper.execute_jupiter_buy = fake_buy
+    sniper.record_buy = lambda **kwargs: None
+
+    total = args.bursts * args.burst_size
+    print(f"{total} signals in {args.bursts} bursts of {args.burst_size}, {args.gap}s apart")
+    print(f"{'workers':>8} | {'mode':>10} | {'drain':>8} | {'p50 delay':>9} | {'max delay':>9}")
+    for n in args.concurrency:
+        for pipeline in (False, True):
+            drain, p50, worst = await run(n, args.bursts, args.burst_size, args.gap, args.mev_delay, pipeline)
+            mode = "pipelined" if pipeline else "sequential"
+            print(f"{n:>8} | {mode:>10} | {drain:>7.2f}s | {p50:>8.2f}s | {worst:>8.2f}s")
+
+if __name__ == "__main__":
+    asyncio.run(main())
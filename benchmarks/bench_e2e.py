@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# /root/ux-solsniper/benchmarks/bench_e2e.py
+"""Offline end-to-end benchmark: synthetic channel posts → buy → TP/SL exit.
+
+Starts benchmarks/mock_upstreams.py on a local port, points every upstream
+URL at it, and runs the real SniperBot worker (buy pool, price feed, monitor,
+sells, trade store) with a dummy Telegram client. Synthetic 🔥 posts go
+through ingest.handle_message exactly like main.handler. Traces land in a
+temp directory and are summarised at the end:
+
+    signal-to-submit  channel post → /execute response of the buy
+    trigger-to-exit   TP/SL trigger → /execute response of the sell
+
+Buys that never reached /execute (skipped for capital or the daily limit,
+filtered, expired in the queue) are counted apart from failed ones.
+MAX_OPEN_POSITIONS defaults to --signals so every signal gets capital.
+
+    python benchmarks/bench_e2e.py --signals 50 --rate 5 --concurrency 4 \
+        --profile '{"execute": {"ms": 800, "error_rate": 0.1}}'
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from mock_upstreams import MockUpstreams
+
+def configure_env(args, workdir: Path):
+    """Must run before any bot module is imported: they read env at import."""
+    from solders.keypair import Keypair
+    base = f"http://127.0.0.1:{args.port}"
+    os.environ.update({
+        "JUPITER_API_URL": base,
+        "DEXSCREENER_API_URL": base,
+        "COINGECKO_API_URL": base,
+        "TELEGRAM_API_URL": base,
+        "TELEGRAM_BOT_TOKEN": "bench",
+        "TELEGRAM_CHAT_ID": "1",
+        "TELEGRAM_MIN_INTERVAL_SEC": "0",
+        "PRIVATE_KEY": str(Keypair()),
+        "DRY_RUN": "0",
+        "TRACE_FILE": str(workdir / "traces.jsonl"),
+        "TRADE_DB_FILE": str(workdir / "trades.db"),
+        "DEDUP_FILE": str(workdir / "processed_cas.bin"),
+        "DAILY_CAPITAL_USD": "1000",
+        "MAX_BUYS_PER_DAY": str(args.signals * 2),
+        "BUY_CONCURRENCY": str(args.concurrency),
+        "MAX_OPEN_POSITIONS": str(args.max_open or args.signals),
+        "MEV_DELAY_SEC": "0,0",
+        "TAKE_PROFIT": str(args.tp),
+        "STOP_LOSS": str(-abs(args.sl)),
+        "MONITOR_POLL_SEC": str(args.poll),
+        "HOLDINGS_REFRESH_SEC": "1",
+    })
+    os.chdir(workdir)  # reports.py also looks for legacy JSON files in the cwd
+
+def synthetic_message(i: int, mint: str) -> SimpleNamespace:
+    """Just the NewMessage fields handle_message and extract_ca read."""
+    return SimpleNamespace(
+        id=i,
+        message=f"🔥 {mint}",
+        text=f"🔥 {mint}",
+        date=datetime.now(timezone.utc),
+        entities=None,
+        buttons=None,
+    )
+
+def _pct(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] if ordered else float("nan")
+
+def read_traces(path: Path) -> tuple[list[float], list[float], dict[str, int], int]:
+    """Submit/exit latencies, buy outcome counts by trace status, failed sells."""
+    submit, exit_, buys, sells_failed = [], [], {}, 0
+    if not path.exists():
+        return submit, exit_, buys, sells_failed
+    with open(path) as f:
+        for line in f:
+            rec = json.loads(line)
+            if rec["k"] == "buy":
+                status = rec["s"]
+                if status == "ok" and "execute" in rec["st"]:
+                    submit.append(rec["st"]["execute"])
+                elif status == "ok":
+                    status = "failed"  # finished without reaching /execute
+                buys[status] = buys.get(status, 0) + 1
+            elif rec["k"] == "sell":
+                if rec["s"] == "ok" and "execute" in rec["st"]:
+                    exit_.append(rec["st"]["execute"])
+                else:
+                    sells_failed += 1
+    return submit, exit_, buys, sells_failed
+
+async def run(args):
+    workdir = Path(tempfile.mkdtemp(prefix="bench_e2e_"))
+    configure_env(args, workdir)
+
+    from solders.keypair import Keypair
+    from config import load_config
+    from ingest import handle_message
+    from notifier import get_notifier
+    from sniper import SniperBot
+    from tracing import tracer, summarize
+    from upstreams import upstreams
+
+    mock = MockUpstreams(json.loads(args.profile) if args.profile else None,
+                         volatility=args.volatility, seed=args.seed)
+    runner = await mock.start(port=args.port)
+    bot = SniperBot(load_config(), client=object())
+    worker = asyncio.create_task(bot.worker())
+
+    mints = [str(Keypair().pubkey()) for _ in range(args.signals)]
+    started = time.perf_counter()
+    for i, mint in enumerate(mints):
+        await handle_message(bot, synthetic_message(i, mint))
+        await asyncio.sleep(1 / args.rate)
+    fed = time.perf_counter() - started
+
+    # Drain: every buy finished and every position exited (or timeout)
+    deadline = time.perf_counter() + args.timeout
+    while time.perf_counter() < deadline:
+        busy = (not bot.queue.empty() or any(k == "buy" for k, _ in tracer.active)
+                or bot.monitor is None or bot.monitor.positions)
+        if not busy:
+            break
+        await asyncio.sleep(0.2)
+    elapsed = time.perf_counter() - started
+    open_positions = len(bot.monitor.positions) if bot.monitor else 0
+
+    worker.cancel()
+    if bot.monitor is not None:
+        await bot.monitor.stop()
+    await get_notifier().close()
+    tracer.close()
+    bot.processed_cas.save()
+    await runner.cleanup()
+
+    trace_file = workdir / "traces.jsonl"
+    submit, exit_, buys, sells_failed = read_traces(trace_file)
+    not_tried = ", ".join(f"{s} {n}" for s, n in sorted(buys.items()) if s not in ("ok", "failed"))
+    print(f"\n{args.signals} signals fed in {fed:.1f}s, drained in {elapsed:.1f}s | workdir {workdir}")
+    print(f"buys ok {len(submit)} failed {buys.get('failed', 0)} | not attempted: {not_tried or 'none'}")
+    print(f"sells ok {len(exit_)} failed {sells_failed} | still open {open_positions}")
+    print(f"throughput          {len(submit) / elapsed:.2f} buys/s, {(len(submit) + len(exit_)) / elapsed:.2f} trades/s")
+    print(f"{'':<18} {'n':>5} {'p50 ms':>9} {'p99 ms':>9}")
+    for name, values in (("signal-to-submit", submit), ("trigger-to-exit", exit_)):
+        print(f"{name:<18} {len(values):>5} {_pct(values, 50):>9.1f} {_pct(values, 99):>9.1f}")
+    print("\nupstream hits: " + ", ".join(f"{k}={v}" for k, v in sorted(mock.hits.items()) if v))
+    for name, h in sorted(upstreams.snapshot().items()):
+        print(f"  {name:<15} {h['state']:<9} err {h['error_rate']:.0%} p50 {h['p50_ms']}ms trips {h['trips']}")
+    if args.stages and trace_file.exists():
+        from tracing import _print_summary
+        _print_summary(summarize(str(trace_file)))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--signals", type=int, default=30)
+    parser.add_argument("--rate", type=float, default=5.0, help="signals per second")
+    parser.add_argument("--concurrency", type=int, default=4, help="BUY_CONCURRENCY")
+    parser.add_argument("--max-open", type=int, default=0, help="MAX_OPEN_POSITIONS (default: --signals)")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--profile", help="JSON route overrides for the mock, see mock_upstreams.py")
+    parser.add_argument("--volatility", type=float, default=0.08, help="mock log-price stdev per sqrt(s)")
+    parser.add_argument("--tp", type=float, default=20.0)
+    parser.add_argument("--sl", type=float, default=15.0)
+    parser.add_argument("--poll", type=float, default=0.5, help="MONITOR_POLL_SEC")
+    parser.add_argument("--timeout", type=float, default=120.0, help="max seconds to wait for exits")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--stages", action="store_true", help="also print the per-stage trace summary")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# /root/ux-solsniper/benchmarks/bench_extract.py
+"""CA extraction microbenchmark on a corpus of channel messages.
+
+Compares ca_extractor.extract_ca with the two extractors it replaced
+(SniperBot.extract_ca and telegram.extract_ca, copied below) and reports
+per-message time and how often each one returns a mint that actually
+decodes to a 32-byte key.
+
+Corpus format: one JSON object per line with "message", "entity_urls"
+(list) and "button_urls" (list of rows). A sample corpus ships in
+benchmarks/data; point --corpus at a dump of the real channel for tuning.
+
+    python benchmarks/bench_extract.py --corpus benchmarks/data/channel_messages.jsonl
+"""
+import argparse
+import json
+import re
+import sys
+import timeit
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ca_extractor import extract_ca, is_valid_mint
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "data" / "channel_messages.jsonl"
+
+# === LEGACY EXTRACTORS (verbatim logic before ca_extractor) ===
+def legacy_sniper_extract(message) -> str | None:
+    text = getattr(message, "text", "") or message.message or ""
+    full_text = text
+    if message.entities:
+        for entity in message.entities:
+            if hasattr(entity, "url"):
+                full_text += " " + (entity.url or "")
+    full_text = re.sub(r'[\u200B-\u200D\uFEFF\r\n\t]', ' ', full_text)
+    full_text = re.sub(r'\s+', ' ', full_text).strip()
+    if "CA:" in full_text.upper():
+        match = re.search(r'CA:\s*([1-9A-HJ-NP-Za-km-z]{44})\b', full_text, re.IGNORECASE)
+        if match and len(match.group(1)) == 44:
+            return match.group(1)
+    if full_text.lower().startswith("fire"):
+        rest = full_text[5:].strip()
+        match = re.match(r'^([1-9A-HJ-NP-Za-km-z]{44})\b', rest)
+        if match:
+            return match.group(1)
+    for ca in re.findall(r'\b([1-9A-HJ-NP-Za-km-z]{44})\b', full_text):
+        if re.match(r'^[1-9A-HJ-NP-Za-km-z]{44}$', ca):
+            return ca
+    return None
+
+def legacy_telegram_extract(msg) -> str | None:
+    text = getattr(msg, "text", "") or ""
+    buttons = getattr(msg, "buttons", []) or []
+    candidates = []
+    if m := re.search(r"\b([1-9A-HJ-NP-Za-km-z]{32,44})\b", text):
+        candidates.append(m.group(1))
+    patterns = [
+        r"dexscreener\.com/solana/([A-HJ-NP-Za-km-z]{32,44})",
+        r"pump\.fun/([A-HJ-NP-Za-km-z]{32,44})",
+        r"raydium\.io/swap.*?mint=([A-HJ-NP-Za-km-z]{32,44})",
+        r"solscan\.io/token/([A-HJ-NP-Za-km-z]{32,44})",
+    ]
+    for p in patterns:
+        if m := re.search(p, text, re.IGNORECASE):
+            candidates.append(m.group(1))
+    for row in buttons:
+        for btn in row:
+            url = getattr(btn, "url", "")
+            if m := re.search(r"([A-HJ-NP-Za-km-z]{32,44})", url):
+                candidates.append(m.group(1))
+            for p in patterns:
+                if m := re.search(p, url, re.IGNORECASE):
+                    candidates.append(m.group(1))
+    for ca in candidates:
+        if 32 <= len(ca) <= 44 and re.match(r"^[1-9A-HJ-NP-Za-km-z]+$", ca):
+            return ca
+    return None
+
+def load_corpus(path: Path) -> list:
+    messages = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            messages.append(SimpleNamespace(
+                message=rec.get("message", ""),
+                text=rec.get("message", ""),
+                entities=[SimpleNamespace(url=u) for u in rec.get("entity_urls", [])],
+                buttons=[[SimpleNamespace(url=u) for u in row] for row in rec.get("button_urls", [])],
+            ))
+    return messages
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    print(f"{len(corpus)} messages from {args.corpus}")
+    print(f"{'extractor':>18} | {'us/msg':>7} | {'found':>5} | {'valid':>5}")
+    for name, fn in (
+        ("ca_extractor", extract_ca),
+        ("legacy sniper", legacy_sniper_extract),
+        ("legacy telegram", legacy_telegram_extract),
+    ):
+        seconds = timeit.timeit(lambda: [fn(m) for m in corpus], number=args.repeat)
+        results = [fn(m) for m in corpus]
+        found = [r for r in results if r]
+        valid = [r for r in found if is_valid_mint(r)]
+        print(f"{name:>18} | {seconds / args.repeat / len(corpus) * 1e6:>7.1f} | {len(found):>5} | {len(valid):>5}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# /root/ux-solsniper/benchmarks/bench_monitor.py
+"""MonitorEngine vs one monitor_and_sell task per position.
+
+Runs both on a fake price feed (no network) that republishes every price
+each tick with only `--active` of them moved, the way PriceFeed republishes
+quiet tokens. For increasing position counts it prints the engine's
+scheduler CPU (time in MonitorEngine.step) and TP/SL evaluations per tick,
+the engine's total CPU, and the same totals for one task per position.
+Wakeups are the callbacks (task steps, timers) scheduled on the loop
+during the window, counted the same way for both modes.
+
+The scheduler only touches positions whose price changed, so step CPU and
+evaluations per tick stay flat at a fixed number of moving prices however
+many positions are open. Total engine CPU still grows with the position
+count because delivering a price (the feed loop plus one _on_price call)
+costs something per published price, moved or not; the task-per-position
+baseline additionally wakes every task for every price. 50 moving, 10
+polls/s, 3 s per point:
+
+     positions | step cpu/s evals/tick engine cpu/s  wakeups |  tasks cpu/s  wakeups
+            50 |     1.45ms       50.0        6.7ms       92 |        9.7ms     1561
+           200 |     1.42ms       50.0        9.1ms       92 |       22.8ms     6061
+           500 |     1.37ms       50.0       14.6ms       92 |       53.2ms    15061
+          1000 |     1.52ms       50.0       23.8ms       92 |      109.3ms    29059
+
+    python benchmarks/bench_monitor.py --positions 50 200 500 1000 --active 50 --seconds 5
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger
+import sell
+from monitor import MonitorEngine
+
+CONFIG = {"TAKE_PROFIT": 40.0, "STOP_LOSS": -20.0, "MONITOR_POLL_SEC": 0.1}
+
+class CountingLoop(asyncio.SelectorEventLoop):
+    """Counts callbacks scheduled (task steps, timers) while `counting` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.counting = False
+        self.callbacks = 0
+
+    def call_soon(self, *args, **kwargs):
+        self.callbacks += self.counting
+        return super().call_soon(*args, **kwargs)
+
+    def call_at(self, *args, **kwargs):
+        self.callbacks += self.counting
+        return super().call_at(*args, **kwargs)
+
+class FakeFeed:
+    """Subscriber registry, no HTTP: every tick republishes every price, `active` of them moved."""
+
+    def __init__(self, active: int):
+        self.active = active
+        self.subscribers = {}
+        self.prices = {}
+
+    def subscribe(self, mint, cb):
+        self.subscribers.setdefault(mint, set()).add(cb)
+        self.prices.setdefault(mint, 1.0)
+
+    def unsubscribe(self, mint, cb):
+        self.subscribers.get(mint, set()).discard(cb)
+
+    def schedule(self, mint, delay):
+        pass  # ticks on its own fixed interval
+
+    def tick(self):
+        for i, (mint, subs) in enumerate(self.subscribers.items()):
+            p = self.prices[mint]
+            if i < self.active:
+                # Stay inside the TP/SL band so no position exits mid-run
+                p = self.prices[mint] = min(1.3, max(0.85, p * random.uniform(0.99, 1.01)))
+            for cb in list(subs):
+                cb(mint, p)
+
+async def _no_sell(*args, **kwargs):
+    return None
+
+async def _feed_loop(feed, interval, stop) -> int:
+    ticks = 0
+    while not stop.is_set():
+        feed.tick()
+        ticks += 1
+        await asyncio.sleep(interval)
+    return ticks
+
+async def _measure(seconds: float) -> tuple[float, int]:
+    """CPU seconds per second and callbacks scheduled over the next `seconds`."""
+    loop = asyncio.get_running_loop()
+    loop.callbacks, loop.counting = 0, True
+    cpu = time.process_time()
+    await asyncio.sleep(seconds)
+    cpu = time.process_time() - cpu
+    loop.counting = False
+    return cpu / seconds, loop.callbacks
+
+async def bench_engine(n: int, active: int, seconds: float) -> tuple[float, float, float, int]:
+    """(step CPU/s, evaluations per tick, total CPU/s, wakeups)."""
+    feed = FakeFeed(active)
+    engine = MonitorEngine(None, None, CONFIG, feed, sell_fn=_no_sell)
+    for i in range(n):
+        engine.add(f"MINT{i:06d}", 1.0, f"TKN_{i}")
+    stepped = 0.0
+    step = engine.step
+
+    def timed_step(now=None):
+        nonlocal stepped
+        started = time.process_time()
+        try:
+            return step(now)
+        finally:
+            stepped += time.process_time() - started
+
+    engine.step = timed_step
+    stop = asyncio.Event()
+    feeder = asyncio.create_task(_feed_loop(feed, CONFIG["MONITOR_POLL_SEC"], stop))
+    engine.start()
+    await asyncio.sleep(3 * CONFIG["MONITOR_POLL_SEC"])  # first evaluation of every position
+    stepped, evaluations = 0.0, engine.evaluations
+    cpu, wakeups = await _measure(seconds)
+    step_cpu, evaluations = stepped / seconds, engine.evaluations - evaluations
+    stop.set()
+    await engine.stop()
+    await feeder
+    return step_cpu, evaluations * CONFIG["MONITOR_POLL_SEC"] / seconds, cpu, wakeups
+
+async def bench_tasks(n: int, active: int, seconds: float) -> tuple[float, int]:
+    feed = FakeFeed(active)
+    sell.execute_ultra_sell = _no_sell
+    tasks = [
+        asyncio.create_task(sell.monitor_and_sell(
+            f"MINT{i:06d}", 1.0, CONFIG["TAKE_PROFIT"], abs(CONFIG["STOP_LOSS"]),
+            None, CONFIG, f"TKN_{i}", None, feed=feed
+        ))
+        for i in range(n)
+    ]
+    stop = asyncio.Event()
+    feeder = asyncio.create_task(_feed_loop(feed, CONFIG["MONITOR_POLL_SEC"], stop))
+    result = await _measure(seconds)
+    stop.set()
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await feeder
+    return result
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--positions", type=int, nargs="+", default=[50, 200, 500, 1000])
+    parser.add_argument("--active", type=int, default=50, help="positions whose price moves each tick")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    logger.remove()
+
+    print(f"{'positions':>10} | {'step cpu/s':>10} {'evals/tick':>10} {'engine cpu/s':>12} {'wakeups':>8} "
+          f"| {'tasks cpu/s':>12} {'wakeups':>8}")
+    for n in args.positions:
+        s_cpu, evals, e_cpu, e_wake = await bench_engine(n, args.active, args.seconds)
+        t_cpu, t_wake = await bench_tasks(n, args.active, args.seconds)
+        print(f"{n:>10} | {s_cpu * 1000:>8.2f}ms {evals:>10.1f} {e_cpu * 1000:>10.1f}ms {e_wake:>8} "
+              f"| {t_cpu * 1000:>10.1f}ms {t_wake:>8}")
+
+if __name__ == "__main__":
+    with asyncio.Runner(loop_factory=CountingLoop) as runner:
+        runner.run(main())
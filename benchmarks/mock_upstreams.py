@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# /root/ux-solsniper/benchmarks/mock_upstreams.py
+"""Local stand-ins for every upstream the bot talks to.
+
+One aiohttp server answers the paths of Jupiter Ultra (/order, /execute,
+/holdings), the Jupiter token search, price and quote APIs, DexScreener,
+CoinGecko and the Telegram Bot API, so pointing JUPITER_API_URL,
+DEXSCREENER_API_URL, COINGECKO_API_URL and TELEGRAM_API_URL at it runs the
+bot fully offline. Each route has its own latency and error profile; token
+prices follow a random walk so positions eventually hit TP or SL.
+
+    python benchmarks/mock_upstreams.py --port 8787 \
+        --profile '{"order": {"ms": 150, "error_rate": 0.05, "error_status": 500}}'
+"""
+import argparse
+import asyncio
+import base64
+import json
+import math
+import random
+import time
+import uuid
+from aiohttp import web
+
+SOL_MINT = "So11111111111111111111111111111111111111112"
+
+DEFAULT_PROFILE = {
+    # route: mean latency ms, jitter ms, error probability, status returned on error
+    "order":          {"ms": 120, "jitter": 40, "error_rate": 0.0, "error_status": 500},
+    "execute":        {"ms": 400, "jitter": 150, "error_rate": 0.0, "error_status": 500},
+    "holdings":       {"ms": 80, "jitter": 20, "error_rate": 0.0, "error_status": 429},
+    "dexscreener":    {"ms": 150, "jitter": 60, "error_rate": 0.0, "error_status": 429},
+    "jupiter_search": {"ms": 90, "jitter": 30, "error_rate": 0.0, "error_status": 500},
+    "jupiter_price":  {"ms": 60, "jitter": 20, "error_rate": 0.0, "error_status": 500},
+    "jupiter_quote":  {"ms": 70, "jitter": 20, "error_rate": 0.0, "error_status": 500},
+    "coingecko":      {"ms": 200, "jitter": 80, "error_rate": 0.0, "error_status": 429},
+    "telegram":       {"ms": 100, "jitter": 30, "error_rate": 0.0, "error_status": 429},
+}
+
+class MockUpstreams:
+    def __init__(self, profile: dict | None = None, sol_usd: float = 150.0,
+                 start_price: float = 0.0001, volatility: float = 0.08, seed: int | None = None):
+        self.profile = {k: dict(v) for k, v in DEFAULT_PROFILE.items()}
+        for route, overrides in (profile or {}).items():
+            self.profile.setdefault(route, dict(DEFAULT_PROFILE["order"])).update(overrides)
+        self.sol_usd = sol_usd
+        self.start_price = start_price
+        self.volatility = volatility  # log-price stdev per sqrt(second)
+        self.rng = random.Random(seed)
+        self.prices: dict[str, tuple[float, float]] = {}  # mint -> (price, last update)
+        self.holdings: dict[str, int] = {}
+        self.orders: dict[str, dict] = {}
+        self.hits: dict[str, int] = {k: 0 for k in self.profile}
+        self._tx_cache: dict[str, str] = {}
+
+    # === MARKET MODEL ===
+    def price(self, mint: str) -> float:
+        now = time.monotonic()
+        price, last = self.prices.get(mint, (self.start_price, now))
+        dt = now - last
+        if dt > 0:
+            price *= math.exp(self.volatility * math.sqrt(dt) * self.rng.gauss(0, 1))
+        self.prices[mint] = (price, now)
+        return price
+
+    def _unsigned_tx(self, taker: str) -> str:
+        """Base64 v0 transaction with `taker` as fee payer, ready to be signed."""
+        if taker not in self._tx_cache:
+            from solders.hash import Hash
+            from solders.message import MessageV0
+            from solders.pubkey import Pubkey
+            from solders.signature import Signature
+            from solders.transaction import VersionedTransaction
+            msg = MessageV0.try_compile(Pubkey.from_string(taker), [], [], Hash.default())
+            tx = VersionedTransaction.populate(msg, [Signature.default()])
+            self._tx_cache[taker] = base64.b64encode(bytes(tx)).decode()
+        return self._tx_cache[taker]
+
+    # === LATENCY / ERROR PROFILE ===
+    def _route(self, request: web.Request) -> str:
+        return request.match_info.route.name or "unknown"
+
+    @web.middleware
+    async def profile_middleware(self, request: web.Request, handler):
+        route = self._route(request)
+        prof = self.profile.get(route)
+        self.hits[route] = self.hits.get(route, 0) + 1
+        if prof:
+            delay = max(0.0, self.rng.gauss(prof["ms"], prof["jitter"])) / 1000
+            await asyncio.sleep(delay)
+            if self.rng.random() < prof["error_rate"]:
+                return web.json_response({"error": "mock failure"}, status=prof["error_status"])
+        return await handler(request)
+
+    # === ROUTES ===
+    async def order(self, request):
+        q = request.query
+        request_id = uuid.uuid4().hex
+        amount = int(q["amount"])
+        in_mint, out_mint = q["inputMint"], q["outputMint"]
+        if in_mint == SOL_MINT:
+            out_amount = int(amount / 1e9 * self.sol_usd / self.price(out_mint) * 1e6)
+        else:
+            out_amount = int(amount / 1e6 * self.price(in_mint) / self.sol_usd * 1e9)
+        self.orders[request_id] = {"in": in_mint, "out": out_mint, "amount": amount, "out_amount": out_amount}
+        return web.json_response({
+            "transaction": self._unsigned_tx(q["taker"]),
+            "requestId": request_id,
+            "inAmount": str(amount),
+            "outAmount": str(out_amount),
+        })
+
+    async def execute(self, request):
+        body = await request.json()
+        order = self.orders.pop(body.get("requestId", ""), None)
+        if order is None or not body.get("signedTransaction"):
+            return web.json_response({"status": "Failed", "error": "unknown requestId"})
+        if order["out"] != SOL_MINT:
+            self.holdings[order["out"]] = self.holdings.get(order["out"], 0) + order["out_amount"]
+        if order["in"] != SOL_MINT:
+            self.holdings[order["in"]] = max(0, self.holdings.get(order["in"], 0) - order["amount"])
+        signature = base64.b32encode(uuid.uuid4().bytes + uuid.uuid4().bytes).decode().rstrip("=")
+        return web.json_response({"status": "Success", "signature": signature})
+
+    async def holdings_route(self, request):
+        tokens = {
+            mint: [{"account": mint[:8], "amount": str(raw), "uiAmount": raw / 1e6, "decimals": 6}]
+            for mint, raw in self.holdings.items() if raw > 0
+        }
+        return web.json_response({"amount": "1000000000", "uiAmount": 1.0, "tokens": tokens})
+
+    async def dexscreener(self, request):
+        pairs = []
+        for mint in request.match_info["addresses"].split(","):
+            price = self.price(mint)
+            pairs.append({
+                "dexId": "raydium",
+                "baseToken": {"address": mint},
+                "priceUsd": f"{price:.12f}",
+                "marketCap": price * 1e9,
+                "liquidity": {"usd": price * 1e8},
+            })
+        return web.json_response({"pairs": pairs})
+
+    async def jupiter_search(self, request):
+        mint = request.query.get("query", "")
+        price = self.price(mint)
+        return web.json_response([{"id": mint, "usdPrice": price, "mcap": price * 1e9, "liquidity": price * 1e8}])
+
+    async def jupiter_price(self, request):
+        ids = [m for m in request.query.get("ids", "").split(",") if m]
+        return web.json_response({m: {"usdPrice": self.price(m)} for m in ids})
+
+    async def jupiter_quote(self, request):
+        return web.json_response({"outAmount": str(int(self.sol_usd * 1e6))})
+
+    async def coingecko(self, request):
+        return web.json_response({"solana": {"usd": self.sol_usd}})
+
+    async def telegram(self, request):
+        return web.json_response({"ok": True, "result": {"message_id": self.hits["telegram"]}})
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self.profile_middleware])
+        app.router.add_get("/ultra/v1/order", self.order, name="order")
+        app.router.add_post("/ultra/v1/execute", self.execute, name="execute")
+        app.router.add_get("/ultra/v1/holdings/{wallet}", self.holdings_route, name="holdings")
+        app.router.add_get("/latest/dex/tokens/{addresses}", self.dexscreener, name="dexscreener")
+        app.router.add_get("/tokens/v2/search", self.jupiter_search, name="jupiter_search")
+        app.router.add_get("/price/v3", self.jupiter_price, name="jupiter_price")
+        app.router.add_get("/swap/v1/quote", self.jupiter_quote, name="jupiter_quote")
+        app.router.add_get("/api/v3/simple/price", self.coingecko, name="coingecko")
+        app.router.add_post("/bot{token}/sendMessage", self.telegram, name="telegram")
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8787) -> web.AppRunner:
+        runner = web.AppRunner(self.app())
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+async def _serve(args):
+    mock = MockUpstreams(json.loads(args.profile) if args.profile else None, volatility=args.volatility)
+    await mock.start(args.host, args.port)
+    print(f"Mock upstreams on http://{args.host}:{args.port} (Ctrl+C to stop)")
+    await asyncio.Event().wait()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--profile", help="JSON route overrides, e.g. '{\"order\": {\"ms\": 300}}'")
+    parser.add_argument("--volatility", type=float, default=0.08)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
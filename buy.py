@@ -2,82 +2,148 @@
 import aiohttp
 import asyncio                      # ← THIS WAS MISSING IN YOUR FILE
 import base64
+import time
 import traceback
 from loguru import logger
-from utils import compute_amount_from_usd
 from solders.keypair import Keypair
 from solders.transaction import VersionedTransaction
 from solders.message import to_bytes_versioned
 from reports import record_buy
 from jupiter_price import get_sol_price_usd
+from jupiter_price import holdings_cache
+from tracing import tracer
+from endpoints import JUPITER_API
+from upstreams import upstreams
 
-ORDER_URL = "https://lite-api.jup.ag/ultra/v1/order"
-EXEC_URL  = "https://lite-api.jup.ag/ultra/v1/execute"
+ORDER_URL = f"{JUPITER_API}/ultra/v1/order"
+EXEC_URL  = f"{JUPITER_API}/ultra/v1/execute"
+SOL_MINT = "So11111111111111111111111111111111111111112"
+
+class PreparedBuy:
+    """Signed Ultra buy order, ready for /execute."""
+    __slots__ = ("mint", "lamports", "signed_tx", "request_id", "created")
+
+    def __init__(self, mint: str, lamports: int, signed_tx: str, request_id: str):
+        self.mint = mint
+        self.lamports = lamports
+        self.signed_tx = signed_tx
+        self.request_id = request_id
+        self.created = time.monotonic()
+
+    def age(self) -> float:
+        return time.monotonic() - self.created
+
+async def fetch_buy_order(
+    session: aiohttp.ClientSession,
+    output_mint: str,
+    amount: int,
+    wallet: Keypair,
+    config: dict,
+    input_mint: str = SOL_MINT,
+) -> PreparedBuy | None:
+    """GET /order for `amount` lamports and sign it; None when Ultra returns no usable order."""
+    params = {
+        "inputMint": input_mint,
+        "outputMint": output_mint,
+        "amount": str(amount),
+        "taker": str(wallet.pubkey()),
+        "payer": str(wallet.pubkey()),
+        "closeAuthority": str(wallet.pubkey()),
+    }
+    if config.get("REFERRAL_ACCOUNT"):
+        params.update({
+            "referralAccount": config["REFERRAL_ACCOUNT"],
+            "referralFee": config["REFERRAL_FEE_BPS"]
+        })
+    with upstreams.track("ultra_order") as call:
+        async with session.get(ORDER_URL, params=params, timeout=15) as r:
+            if not r.ok:
+                if r.status >= 500 or r.status == 429:
+                    call.fail()  # other 4xx are this order's problem, not the upstream's
+                logger.info(f"❌  /order HTTP {r.status}")
+                return None
+            order = await r.json()
+    tracer.mark("buy", output_mint, "order")
+    if not order.get("transaction"):
+        logger.info(f"❌  Invalid order: {order}")
+        return None
+    tx = VersionedTransaction.from_bytes(base64.b64decode(order["transaction"]))
+    signed_tx_obj = VersionedTransaction.populate(
+        tx.message,
+        [wallet.sign_message(to_bytes_versioned(tx.message))]
+    )
+    signed_tx = base64.b64encode(bytes(signed_tx_obj)).decode()
+    tracer.mark("buy", output_mint, "sign")
+    return PreparedBuy(output_mint, amount, signed_tx, order.get("requestId", ""))
+
+async def _execute_buy(session: aiohttp.ClientSession, prepared: PreparedBuy) -> str | None:
+    payload = {
+        "signedTransaction": prepared.signed_tx,
+        "requestId": prepared.request_id
+    }
+    with upstreams.track("ultra_execute") as call:
+        async with session.post(EXEC_URL, json=payload, timeout=20) as resp:
+            if resp.status >= 500 or resp.status == 429:
+                call.fail()
+            res = await resp.json()
+    tracer.mark("buy", prepared.mint, "execute")
+    if res.get("status", "").lower() == "success":
+        return res.get("signature") or res.get("txid")
+    return None
 
 async def execute_jupiter_buy(
     session: aiohttp.ClientSession,
     *,
-    input_mint: str = "So11111111111111111111111111111111111111112",
+    input_mint: str = SOL_MINT,
     output_mint: str | None = None,
     amount: float | int = 0.0,
+    usd_amount: float | None = None,
     wallet: Keypair,
     config: dict,
     coin_name: str,
     market_cap: float,
+    sol_price: float | None = None,
+    prepared: PreparedBuy | None = None,
 ) -> str | None:
-    """Execute a Jupiter buy transaction via Ultra API."""
+    """Execute a Jupiter buy transaction via Ultra API.
+
+    `amount` is the already sized lamports (utils.compute_buy_size) and
+    `sol_price` the SOL price it was sized with. A `prepared` order fetched
+    while the filters ran is executed first; retries fetch fresh orders.
+    """
     try:
-        # === USE COMPOUNDING LOGIC ===
-        amount = await compute_amount_from_usd(session, config, output_mint)
+        amount = int(amount)
         if amount <= 0:
             logger.info("Buy skipped: amount = 0")
             return None
 
-        usd_value = (amount / 1e9) * await get_sol_price_usd(session)
+        usd_value = (amount / 1e9) * (sol_price or await get_sol_price_usd(session))
         fee_usd = usd_value * (config["BUY_FEE_PERCENT"] / 100)
 
         if config["DRY_RUN"]:
             record_buy(output_mint, coin_name, market_cap, usd_value, usd_value - fee_usd, fee_usd)
             return f"DRY_RUN_BUY_{int(asyncio.get_running_loop().time())}"
 
-        params = {
-            "inputMint": input_mint,
-            "outputMint": output_mint,
-            "amount": str(amount),
-            "taker": str(wallet.pubkey()),
-            "payer": str(wallet.pubkey()),
-            "closeAuthority": str(wallet.pubkey()),
-        }
-        if config.get("REFERRAL_ACCOUNT"):
-            params.update({
-                "referralAccount": config["REFERRAL_ACCOUNT"],
-                "referralFee": config["REFERRAL_FEE_BPS"]
-            })
+        if prepared is not None and (prepared.mint != output_mint or prepared.lamports != amount):
+            prepared = None
+        # Ultra down: fail in one check instead of three timeouts (sells still always try)
+        if prepared is None and not upstreams.allow("ultra_order"):
+            logger.warning("❌  Ultra /order circuit open → BUY SKIPPED")
+            return None
         for attempt in range(1, 4):
             try:
-                async with session.get(ORDER_URL, params=params, timeout=15) as r:
-                    if not r.ok:
-                        logger.info(f"❌  /order HTTP {r.status}")
+                order, prepared = prepared, None
+                if order is None:
+                    order = await fetch_buy_order(session, output_mint, amount, wallet, config, input_mint)
+                    if order is None:
                         continue
-                    order = await r.json()
-                if not order.get("transaction"):
-                    logger.info(f"❌  Invalid order: {order}")
-                    continue
-                tx = VersionedTransaction.from_bytes(base64.b64decode(order["transaction"]))
-                signed_tx_obj = VersionedTransaction.populate(
-                    tx.message,
-                    [wallet.sign_message(to_bytes_versioned(tx.message))]
-                )
-                signed_tx = base64.b64encode(bytes(signed_tx_obj)).decode()
-                payload = {
-                    "signedTransaction": signed_tx,
-                    "requestId": order.get("requestId", "")
-                }
-                async with session.post(EXEC_URL, json=payload, timeout=20) as resp:
-                    res = await resp.json()
-                if res.get("status", "").lower() == "success":
-                    sig = res.get("signature") or res.get("txid")
+                else:
+                    logger.debug(f"BUY using prepared order ({order.age():.2f}s old)")
+                sig = await _execute_buy(session, order)
+                if sig:
+                    holdings_cache.invalidate()
                     record_buy(output_mint, coin_name, market_cap, usd_value, usd_value - fee_usd, fee_usd, sig)
+                    tracer.mark("buy", output_mint, "record_buy")
                     logger.info(f"🚀 BOUGHT {sig[:8]}... | https://solscan.io/tx/{sig}")
                     return sig
             except Exception as e:
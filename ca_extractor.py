@@ -0,0 +1,88 @@
+# /root/ux-solsniper/ca_extractor.py
+import re
+from typing import NamedTuple
+
+B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_B58_DIGITS = bytes.maketrans(B58_ALPHABET.encode(), bytes(range(58)))
+
+# One compiled scan per text: base58 runs of 32-44 chars not embedded in a
+# longer run. Only hits look back (a few dozen chars) for their context, a
+# "CA:" label or a known platform URL; the context is case-insensitive,
+# base58 itself is not.
+_RUN_RE = re.compile(r"(?<![1-9A-HJ-NP-Za-km-z])[1-9A-HJ-NP-Za-km-z]{32,44}(?![1-9A-HJ-NP-Za-km-z])")
+_CONTEXT_RE = re.compile(
+    r"(?:(?P<label>\bCA[\s\u200b-\u200d\ufeff]*[:：=][\s\u200b-\u200d\ufeff]*)"
+    r"|(?P<platform>dexscreener\.com/solana/|pump\.fun/(?:coin/)?|solscan\.io/token/"
+    r"|birdeye\.so/token/|gmgn\.ai/sol/token/|[?&](?:output)?mint=))\Z",
+    re.IGNORECASE
+)
+_CONTEXT_LOOKBACK = 32
+
+# === RANKS (lower wins) ===
+RANK_LABEL = 0     # "CA: <mint>" in the text
+RANK_PLATFORM = 1  # dexscreener / pump.fun / solscan ... link anywhere
+RANK_TEXT = 2      # bare mint in the text
+RANK_ENTITY = 3    # bare mint inside a hidden link
+RANK_BUTTON = 4    # bare mint inside a button URL
+
+class Candidate(NamedTuple):
+    ca: str
+    source: str
+    rank: int
+
+def b58decode(value: str) -> bytes:
+    n = 0
+    for d in value.encode().translate(_B58_DIGITS):
+        n = n * 58 + d
+    pad = len(value) - len(value.lstrip("1"))
+    return b"\0" * pad + (n.to_bytes((n.bit_length() + 7) // 8, "big") if n else b"")
+
+def is_valid_mint(value: str) -> bool:
+    """True when `value` decodes to a 32-byte ed25519 public key."""
+    if not 32 <= len(value) <= 44 or value.strip(B58_ALPHABET):
+        return False
+    return len(b58decode(value)) == 32
+
+def _scan(text: str, source: str, bare_rank: int, seen: dict):
+    for m in _RUN_RE.finditer(text):
+        ca = m.group()
+        start = m.start()
+        ctx = _CONTEXT_RE.search(text, max(0, start - _CONTEXT_LOOKBACK), start) if start else None
+        if ctx is None:
+            rank, where = bare_rank, source
+        elif ctx.group("label") is not None:
+            rank, where = RANK_LABEL, "label"
+        else:
+            rank, where = RANK_PLATFORM, f"{source}_link"
+        best = seen.get(ca)
+        if best is not None and best.rank <= rank:
+            continue
+        if best is None and not is_valid_mint(ca):
+            continue
+        seen[ca] = Candidate(ca, where, rank)
+
+SOURCES = ("text", "entity", "button")
+
+def extract_candidates(message, sources: tuple[str, ...] = SOURCES) -> list[Candidate]:
+    """Every valid mint in the message text, hidden links and buttons (those in `sources`), best first."""
+    seen: dict[str, Candidate] = {}
+    text = getattr(message, "message", None) or getattr(message, "text", "") or ""
+    if text and "text" in sources:
+        _scan(text, "text", RANK_TEXT, seen)
+    entities = getattr(message, "entities", None) if "entity" in sources else None
+    for entity in entities or ():
+        url = getattr(entity, "url", None)
+        if url:
+            _scan(url, "entity", RANK_ENTITY, seen)
+    buttons = getattr(message, "buttons", None) if "button" in sources else None
+    for row in buttons or ():
+        for btn in row:
+            url = getattr(btn, "url", None)
+            if url:
+                _scan(url, "button", RANK_BUTTON, seen)
+    # dicts keep insertion order, so ties stay in reading order
+    return sorted(seen.values(), key=lambda c: c.rank)
+
+def extract_ca(message) -> str | None:
+    candidates = extract_candidates(message)
+    return candidates[0].ca if candidates else None
@@ -0,0 +1,84 @@
+# /root/ux-solsniper/capital.py
+from loguru import logger
+from reports import get_balance
+
+class CapitalLedger:
+    """Capital reservations and the daily buy counter shared by all buy workers.
+
+    Every method runs without awaiting, so check-and-update is atomic on the
+    event loop: two workers can never both pass the MAX_BUYS_PER_DAY check or
+    spend the same dollars of the compounding balance.
+
+    A reservation lives from the moment a worker picks up a CA until the
+    position is sold (release) or the buy fails (cancel). Each one is
+    balance / MAX_OPEN_POSITIONS, independent of how many buy workers run,
+    so up to MAX_OPEN_POSITIONS positions are open at once; a signal that
+    arrives while all of them are taken is skipped, not retried. The default
+    of 1 is the original sizing: the whole balance, one position at a time.
+    """
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.max_open = max(1, int(config.get("MAX_OPEN_POSITIONS", 1)))
+        self.max_buys = int(config["MAX_BUYS_PER_DAY"])
+        self.reserved: dict[str, float] = {}
+        self.confirmed: set[str] = set()  # reserved CAs whose buy landed
+        self.daily_buys = 0
+        self.pending = 0
+
+    # === DAILY LIMIT ===
+    def limit_reached(self) -> bool:
+        return self.daily_buys + self.pending >= self.max_buys
+
+    def reset_day(self):
+        self.daily_buys = 0
+
+    # === RESERVATIONS ===
+    def committed(self) -> float:
+        return sum(self.reserved.values())
+
+    def reserve(self, ca: str) -> float:
+        """Reserve this CA's share of the balance; 0.0 when no buy may start."""
+        if ca in self.reserved:
+            logger.warning(f"CAPITAL already reserved for {ca[:6]}...")
+            return 0.0
+        if self.limit_reached():
+            logger.info(f"CAPITAL | daily limit {self.max_buys} reached ({self.daily_buys} done, {self.pending} pending)")
+            return 0.0
+        if len(self.reserved) >= self.max_open:
+            logger.info(f"CAPITAL | {len(self.reserved)}/{self.max_open} positions open or buying")
+            return 0.0
+        balance = get_balance()
+        if balance <= 0:
+            balance = float(self.config.get("DAILY_CAPITAL_USD", 0.0))
+        available = balance - self.committed()
+        # Every position compounds its own share; MAX_OPEN_POSITIONS=1 spends the whole balance
+        usd = min(balance / self.max_open, available)
+        if usd <= 0.01:
+            logger.info(f"CAPITAL | nothing free (balance ${balance:.2f}, committed ${self.committed():.2f})")
+            return 0.0
+        self.reserved[ca] = usd
+        self.pending += 1
+        logger.info(f"CAPITAL | reserved ${usd:.2f} for {ca[:6]}... | free ${available - usd:.2f}")
+        return usd
+
+    def confirm(self, ca: str):
+        """Buy landed: count it; the reservation stays until the position closes."""
+        if ca in self.reserved and ca not in self.confirmed:
+            self.confirmed.add(ca)
+            self.pending -= 1
+            self.daily_buys += 1
+
+    def cancel(self, ca: str):
+        """Buy did not happen: give the slot and the dollars back."""
+        if ca in self.confirmed:
+            # Bought, then something after confirm() failed: the tokens are held, keep the capital
+            logger.warning(f"CAPITAL | {ca[:6]}... was bought; reservation kept until release")
+            return
+        if self.reserved.pop(ca, None) is not None:
+            self.pending -= 1
+
+    def release(self, ca: str):
+        """Position closed: its capital is back in the balance (with P&L)."""
+        self.reserved.pop(ca, None)
+        self.confirmed.discard(ca)
@@ -0,0 +1,54 @@
+# /root/ux-solsniper/channels.py
+from typing import Callable, NamedTuple
+from ca_extractor import extract_candidates, RANK_PLATFORM, RANK_TEXT, RANK_BUTTON, SOURCES
+
+def _best(message, max_rank: int, sources: tuple[str, ...] = SOURCES) -> str | None:
+    candidates = extract_candidates(message, sources)  # best first
+    if candidates and candidates[0].rank <= max_rank:
+        return candidates[0].ca
+    return None
+
+# Per-channel CA parsers: message → CA or None
+PARSERS: dict[str, Callable] = {
+    "default": lambda message: _best(message, RANK_BUTTON),  # text, hidden links, buttons
+    "text": lambda message: _best(message, RANK_TEXT, ("text",)),  # message text only (label, link or bare)
+    "labeled": lambda message: _best(message, RANK_PLATFORM),  # "CA:" label or platform link only
+}
+
+class ChannelSpec(NamedTuple):
+    chat_id: int | None
+    name: str
+    prefixes: tuple[str, ...]  # the post must start with one of these (empty: any post)
+    parser: str
+    priority: int              # higher is bought first when signals queue up
+
+    def parse(self, message) -> str | None:
+        return PARSERS.get(self.parser, PARSERS["default"])(message)
+
+    def accepts(self, text: str) -> bool:
+        return not self.prefixes or text.startswith(self.prefixes)
+
+DEFAULT_CHANNEL = ChannelSpec(None, "default", ("🔥",), "default", 0)
+
+def parse_channels(spec: str, fallback_id: int = 0) -> list[ChannelSpec]:
+    """'id[:prefixes[:parser[:priority[:name]]]],...' → ChannelSpecs; prefixes are '|'-separated.
+
+    '-1001234:🔥,-1005678:🚀|💎:labeled:1:alpha'. An empty spec means the one
+    legacy TARGET_CHANNEL_ID with the 🔥 rule.
+    """
+    channels = []
+    for item in spec.split(","):
+        fields = [f.strip() for f in item.split(":")]
+        if not fields[0]:
+            continue
+        chat_id = int(fields[0])
+        prefixes = tuple(p for p in fields[1].split("|") if p) if len(fields) > 1 else DEFAULT_CHANNEL.prefixes
+        parser = fields[2] if len(fields) > 2 and fields[2] else "default"
+        if parser not in PARSERS:
+            raise ValueError(f"unknown parser '{parser}' for channel {chat_id} (one of {', '.join(PARSERS)})")
+        priority = int(fields[3]) if len(fields) > 3 and fields[3] else 0
+        name = fields[4] if len(fields) > 4 and fields[4] else str(chat_id)
+        channels.append(ChannelSpec(chat_id, name, prefixes, parser, priority))
+    if not channels and fallback_id:
+        channels.append(DEFAULT_CHANNEL._replace(chat_id=fallback_id, name=str(fallback_id)))
+    return channels
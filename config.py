@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from ratelimit import parse_limits
+from channels import parse_channels
 
 env_path = Path(__file__).resolve().parent / "t.env"
 load_dotenv(dotenv_path=env_path)
@@ -12,6 +14,7 @@ def load_config():
         "TELEGRAM_BOT_TOKEN": os.getenv("TELEGRAM_BOT_TOKEN", ""),
         "TELEGRAM_CHAT_ID": os.getenv("TELEGRAM_CHAT_ID", ""),
         "TARGET_CHANNEL_ID": int(os.getenv("TARGET_CHANNEL_ID", "0")),
+        "CHANNELS": parse_channels(os.getenv("CHANNELS", ""), int(os.getenv("TARGET_CHANNEL_ID", "0"))),
         "RPC_URL": os.getenv("RPC_URL", "https://api.mainnet-beta.solana.com"),
         "PRIVATE_KEY": os.getenv("PRIVATE_KEY", ""),
         "PUBLIC_KEY": os.getenv("PUBLIC_KEY", ""),
@@ -27,4 +30,45 @@ def load_config():
         "REFERRAL_ACCOUNT": os.getenv("REFERRAL_ACCOUNT", "").strip(),
         "REFERRAL_FEE_BPS": int(os.getenv("REFERRAL_FEE_BPS", "50")),
         "TRADE_SLEEP_SEC": float(os.getenv("TRADE_SLEEP_SEC", "5.0")),
+        "MONITOR_POLL_SEC": float(os.getenv("MONITOR_POLL_SEC", "1.0")),
+        "PRICE_BATCH_SIZE": int(os.getenv("PRICE_BATCH_SIZE", "30")),
+        "SOL_PRICE_TTL_SEC": float(os.getenv("SOL_PRICE_TTL_SEC", "20")),
+        "SOL_PRICE_MAX_STALE_SEC": float(os.getenv("SOL_PRICE_MAX_STALE_SEC", "120")),
+        "METADATA_LOOKUP_MODE": os.getenv("METADATA_LOOKUP_MODE", "hedged").strip().lower(),
+        "METADATA_HEDGE_DELAY_MS": float(os.getenv("METADATA_HEDGE_DELAY_MS", "250")),
+        "HOLDINGS_REFRESH_SEC": float(os.getenv("HOLDINGS_REFRESH_SEC", "5")),
+        "DEDUP_FILE": os.getenv("DEDUP_FILE", "processed_cas.bin"),
+        "DEDUP_RECENT_MAX": int(os.getenv("DEDUP_RECENT_MAX", "100000")),
+        "DEDUP_WINDOW_HOURS": float(os.getenv("DEDUP_WINDOW_HOURS", "72")),
+        "SIGNAL_MAX_AGE_SEC": float(os.getenv("SIGNAL_MAX_AGE_SEC", "30")),
+        "SIGNAL_QUEUE_MAX": int(os.getenv("SIGNAL_QUEUE_MAX", "100")),
+        "MONITOR_ADAPTIVE": int(os.getenv("MONITOR_ADAPTIVE", "1")),
+        "MONITOR_MIN_POLL_SEC": float(os.getenv("MONITOR_MIN_POLL_SEC", "0.25")),
+        "MONITOR_MAX_POLL_SEC": float(os.getenv("MONITOR_MAX_POLL_SEC", "10")),
+        "RATE_LIMITS": parse_limits(os.getenv("RATE_LIMITS", "api.dexscreener.com=5,lite-api.jup.ag=1,api.coingecko.com=0.5")),
+        "UPSTREAM_COOLDOWN_SEC": float(os.getenv("UPSTREAM_COOLDOWN_SEC", "15")),
+        "UPSTREAM_MAX_ERROR_RATE": float(os.getenv("UPSTREAM_MAX_ERROR_RATE", "0.5")),
+        "UPSTREAM_REPORT_SEC": float(os.getenv("UPSTREAM_REPORT_SEC", "300")),
+        "PREARM_BAND_PCT": float(os.getenv("PREARM_BAND_PCT", "0")),
+        "PREARM_ORDER_TTL_SEC": float(os.getenv("PREARM_ORDER_TTL_SEC", "20")),
+        "HTTP_TRADE_CONN_PER_HOST": int(os.getenv("HTTP_TRADE_CONN_PER_HOST", "8")),
+        "HTTP_PRICE_CONN_PER_HOST": int(os.getenv("HTTP_PRICE_CONN_PER_HOST", "16")),
+        "HTTP_DNS_TTL_SEC": int(os.getenv("HTTP_DNS_TTL_SEC", "600")),
+        "HTTP_KEEPALIVE_SEC": float(os.getenv("HTTP_KEEPALIVE_SEC", "75")),
+        "HTTP_WARM_INTERVAL_SEC": float(os.getenv("HTTP_WARM_INTERVAL_SEC", "30")),
+        "HTTP_WARM_CONNS": int(os.getenv("HTTP_WARM_CONNS", "2")),
+        "TICK_DIR": os.getenv("TICK_DIR", "").strip(),
+        "FILTER_RULES": [x.strip() for x in os.getenv(
+            "FILTER_RULES", "blocklist,holding,price,min_mcap,min_liquidity,max_mcap_liq"
+        ).split(",") if x.strip()],
+        "FILTER_BLOCKLIST": {x.strip() for x in os.getenv("FILTER_BLOCKLIST", "").split(",") if x.strip()},
+        "FILTER_MIN_MCAP": float(os.getenv("FILTER_MIN_MCAP", "7000")),
+        "FILTER_MAX_MCAP": float(os.getenv("FILTER_MAX_MCAP", "0")),
+        "FILTER_MIN_LIQUIDITY": float(os.getenv("FILTER_MIN_LIQUIDITY", "4000")),
+        "FILTER_MAX_MCAP_LIQ": float(os.getenv("FILTER_MAX_MCAP_LIQ", "10")),
+        "METADATA_CACHE_TTL_SEC": float(os.getenv("METADATA_CACHE_TTL_SEC", "10")),
+        "BUY_PIPELINE": int(os.getenv("BUY_PIPELINE", "1")),
+        "BUY_CONCURRENCY": max(1, int(os.getenv("BUY_CONCURRENCY", "1"))),
+        "MAX_OPEN_POSITIONS": max(1, int(os.getenv("MAX_OPEN_POSITIONS", "1"))),
+        "MEV_DELAY_SEC": (([float(x) for x in os.getenv("MEV_DELAY_SEC", "2.5,4.0").split(",") if x.strip()] or [0.0]) * 2)[:2],
     }
\ No newline at end of file
@@ -0,0 +1,148 @@
+# /root/ux-solsniper/dedup.py
+import asyncio
+import hashlib
+import os
+import struct
+import time
+from collections import OrderedDict
+from loguru import logger
+
+_MAGIC = b"CADX"
+_HEADER = struct.Struct("<4sBIBI")  # magic, version, bloom bits, hashes, recent count
+_ENTRY = struct.Struct("<dB")       # timestamp, CA length
+
+class DedupIndex:
+    """Bounded, persistent set of CAs already processed.
+
+    Recent CAs sit in an exact insertion-ordered tier; anything older than
+    `window` seconds or beyond `recent_max` entries is folded into a fixed
+    size Bloom filter. Lookups and inserts are O(1), memory is bounded by
+    `recent_max` plus `bloom_bits / 8` bytes, and a false positive (about
+    2% at a million folded CAs with the defaults) can only skip a signal,
+    never buy one twice.
+    """
+
+    def __init__(self, path: str | None = None, recent_max: int = 100_000,
+                 window: float = 72 * 3600, bloom_bits: int = 1 << 23, hashes: int = 7):
+        self.path = path
+        self.recent_max = recent_max
+        self.window = window
+        self.bloom_bits = bloom_bits
+        self.hashes = hashes
+        self.bloom = bytearray(bloom_bits // 8)
+        self.recent: OrderedDict[str, float] = OrderedDict()
+        self.folded = 0
+        self.dirty = False
+
+    # === SET API (used by main.handler) ===
+    def __contains__(self, ca: str) -> bool:
+        return ca in self.recent or self._bloom_has(ca)
+
+    def __len__(self) -> int:
+        return len(self.recent) + self.folded
+
+    def add(self, ca: str, now: float | None = None):
+        now = time.time() if now is None else now
+        self.recent[ca] = now
+        self.recent.move_to_end(ca)
+        self.dirty = True
+        self._expire(now)
+
+    def _expire(self, now: float):
+        cutoff = now - self.window
+        recent = self.recent
+        while recent:
+            ca, ts = next(iter(recent.items()))
+            if ts >= cutoff and len(recent) <= self.recent_max:
+                break
+            recent.popitem(last=False)
+            self._bloom_add(ca)
+
+    # === BLOOM TIER ===
+    def _positions(self, ca: str):
+        digest = hashlib.blake2b(ca.encode(), digest_size=4 * self.hashes).digest()
+        for i in range(self.hashes):
+            yield int.from_bytes(digest[4 * i:4 * i + 4], "little") % self.bloom_bits
+
+    def _bloom_add(self, ca: str):
+        for pos in self._positions(ca):
+            self.bloom[pos >> 3] |= 1 << (pos & 7)
+        self.folded += 1
+
+    def _bloom_has(self, ca: str) -> bool:
+        if not self.folded:
+            return False
+        return all(self.bloom[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(ca))
+
+    # === PERSISTENCE ===
+    def _serialize(self) -> bytes:
+        parts = [_HEADER.pack(_MAGIC, 1, self.bloom_bits, self.hashes, len(self.recent)), bytes(self.bloom)]
+        for ca, ts in self.recent.items():
+            raw = ca.encode()
+            parts.append(_ENTRY.pack(ts, len(raw)))
+            parts.append(raw)
+        parts.append(struct.pack("<Q", self.folded))
+        return b"".join(parts)
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)  # atomic: readers see the old or the new file, never half
+
+    def save(self):
+        if not self.path:
+            return
+        self._write(self.path, self._serialize())
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "DedupIndex":
+        index = cls(path, **kwargs)
+        if not os.path.exists(path):
+            return index
+        started = time.perf_counter()
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            magic, version, bits, hashes, count = _HEADER.unpack_from(data, 0)
+            if magic != _MAGIC or version != 1:
+                raise ValueError("unknown dedup file format")
+            off = _HEADER.size
+            if bits == index.bloom_bits and hashes == index.hashes:
+                index.bloom = bytearray(data[off:off + bits // 8])
+            else:
+                logger.warning("DEDUP bloom size changed → older CAs forgotten")
+            off += bits // 8
+            for _ in range(count):
+                ts, length = _ENTRY.unpack_from(data, off)
+                off += _ENTRY.size
+                index.recent[data[off:off + length].decode()] = ts
+                off += length
+            if bits == index.bloom_bits and hashes == index.hashes:
+                index.folded = struct.unpack_from("<Q", data, off)[0]
+            index._expire(time.time())
+        except Exception as e:
+            logger.error(f"DEDUP load failed ({path}): {e} → starting empty")
+            return cls(path, **kwargs)
+        logger.info(
+            f"DEDUP loaded {len(index.recent)} recent + {index.folded} folded CAs "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+        return index
+
+    async def autosave(self, interval: float = 5.0):
+        """Persist in the background whenever something changed."""
+        while True:
+            await asyncio.sleep(interval)
+            if self.dirty and self.path:
+                self.dirty = False
+                data = self._serialize()
+                try:
+                    await asyncio.to_thread(self._write, self.path, data)
+                except Exception as e:
+                    self.dirty = True
+                    logger.warning(f"DEDUP save failed: {e}")
@@ -0,0 +1,10 @@
+# /root/ux-solsniper/endpoints.py
+# Upstream base URLs. Override them in t.env (or the environment) to point the
+# bot at mirrors or at the local mocks in benchmarks/mock_upstreams.py.
+import os
+import config  # noqa: F401  (loads t.env before the lookups below)
+
+JUPITER_API = os.getenv("JUPITER_API_URL", "https://lite-api.jup.ag").rstrip("/")
+DEXSCREENER_API = os.getenv("DEXSCREENER_API_URL", "https://api.dexscreener.com").rstrip("/")
+COINGECKO_API = os.getenv("COINGECKO_API_URL", "https://api.coingecko.com").rstrip("/")
+TELEGRAM_API = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org").rstrip("/")
@@ -1,8 +1,167 @@
-async def passes_filters(info: dict, config: dict) -> bool:
-    price = info.get("priceUsd")
+# /root/ux-solsniper/filters.py
+import time
+from typing import Callable, NamedTuple
+from loguru import logger
+from jupiter_price import get_mcap_and_price
+
+# Rule cost classes: evaluated in this order, cheapest first
+LOCAL, METADATA = 0, 1
+
+class Rule(NamedTuple):
+    name: str
+    cost: int
+    check: Callable  # (engine, ca, info) -> rejection reason or None
+
+def _blocklist(engine, ca, info):
+    return "blocklisted" if ca in engine.blocklist else None
+
+def _holding(engine, ca, info):
+    return "already holding" if engine.is_held(ca) else None
+
+def _price(engine, ca, info):
+    return None if info.get("priceUsd") else "no price"
+
+def _min_mcap(engine, ca, info):
     mcap = info.get("marketCap")
+    return None if mcap and mcap >= engine.min_mcap else f"mcap {mcap} < {engine.min_mcap:g}"
+
+def _max_mcap(engine, ca, info):
+    mcap = info.get("marketCap") or 0
+    return None if mcap <= engine.max_mcap else f"mcap {mcap:.0f} > {engine.max_mcap:g}"
+
+def _min_liquidity(engine, ca, info):
     liq = info.get("liquidity")
-    if not mcap or mcap < 7000: return False
-    if not liq or liq < 4000: return False
-    if mcap / liq > 10: return False
-    return True
\ No newline at end of file
+    return None if liq and liq >= engine.min_liquidity else f"liquidity {liq} < {engine.min_liquidity:g}"
+
+def _max_mcap_liq(engine, ca, info):
+    mcap, liq = info.get("marketCap"), info.get("liquidity")
+    if not mcap or not liq:
+        return "mcap/liquidity unknown"
+    return None if mcap / liq <= engine.max_mcap_liq else f"mcap/liq {mcap / liq:.1f} > {engine.max_mcap_liq:g}"
+
+RULES = {r.name: r for r in (
+    Rule("blocklist", LOCAL, _blocklist),
+    Rule("holding", LOCAL, _holding),
+    Rule("price", METADATA, _price),
+    Rule("min_mcap", METADATA, _min_mcap),
+    Rule("max_mcap", METADATA, _max_mcap),
+    Rule("min_liquidity", METADATA, _min_liquidity),
+    Rule("max_mcap_liq", METADATA, _max_mcap_liq),
+)}
+
+class FilterEngine:
+    """Pre-trade filters from config, cheapest first, stopping at the first rejection.
+
+    LOCAL rules (blocklist, open positions) need no network. METADATA rules
+    run on token info that is looked up once per CA and kept for
+    `cache_ttl` seconds, so repeated signals for a CA cost no extra
+    requests and the buy reuses the same info. Per-rule check/reject counts
+    and evaluation time are kept in `counts` (see stats()).
+    """
+
+    def __init__(self, config: dict, is_held: Callable[[str], bool] = lambda ca: False,
+                 lookup=get_mcap_and_price, clock=time.monotonic):
+        names = config.get("FILTER_RULES", list(RULES))
+        unknown = [n for n in names if n not in RULES]
+        if unknown:
+            logger.warning(f"FILTERS unknown rules ignored: {', '.join(unknown)}")
+        # Stable sort: declaration order is kept within a cost class
+        self.rules = sorted((RULES[n] for n in names if n in RULES), key=lambda r: r.cost)
+        self.blocklist = set(config.get("FILTER_BLOCKLIST", ()))
+        self.min_mcap = float(config.get("FILTER_MIN_MCAP", 7000))
+        self.max_mcap = float(config.get("FILTER_MAX_MCAP", 0)) or float("inf")
+        self.min_liquidity = float(config.get("FILTER_MIN_LIQUIDITY", 4000))
+        self.max_mcap_liq = float(config.get("FILTER_MAX_MCAP_LIQ", 10))
+        self.cache_ttl = float(config.get("METADATA_CACHE_TTL_SEC", 10))
+        self.is_held = is_held
+        self.lookup = lookup
+        self.clock = clock
+        self.cache: dict[str, tuple[float, dict]] = {}
+        self.counts = {r.name: {"checked": 0, "rejected": 0, "sec": 0.0} for r in self.rules}
+        self.lookups = 0
+        self.cache_hits = 0
+        self.lookup_sec = 0.0
+
+    # === METADATA CACHE ===
+    def cached(self, ca: str) -> dict | None:
+        entry = self.cache.get(ca)
+        if entry is None:
+            return None
+        if self.clock() - entry[0] > self.cache_ttl:
+            del self.cache[ca]
+            return None
+        return entry[1]
+
+    async def metadata(self, ca: str, session) -> dict:
+        info = self.cached(ca)
+        if info is not None:
+            self.cache_hits += 1
+            return info
+        started = time.perf_counter()
+        info = await self.lookup(session, ca)
+        self.lookup_sec += time.perf_counter() - started
+        self.lookups += 1
+        now = self.clock()
+        if info.get("priceUsd") is not None:  # a failed lookup is retried next time
+            if len(self.cache) > 1000:
+                self.cache = {k: v for k, v in self.cache.items() if now - v[0] <= self.cache_ttl}
+            self.cache[ca] = (now, info)
+        return info
+
+    # === EVALUATION ===
+    def _run(self, rule: Rule, ca: str, info: dict | None) -> str | None:
+        counts = self.counts[rule.name]
+        started = time.perf_counter()
+        reason = rule.check(self, ca, info)
+        counts["sec"] += time.perf_counter() - started
+        counts["checked"] += 1
+        if reason is not None:
+            counts["rejected"] += 1
+        return reason
+
+    def check(self, ca: str, info: dict | None, cost: int) -> tuple[str, str] | None:
+        """(rule, reason) of the first rule of cost class `cost` that rejects, else None."""
+        for rule in self.rules:
+            if rule.cost == cost:
+                reason = self._run(rule, ca, info)
+                if reason is not None:
+                    return rule.name, reason
+        return None
+
+    def evaluate_local(self, ca: str) -> str | None:
+        """Name of the rejecting LOCAL rule, or None."""
+        return self._rejected(ca, self.check(ca, None, LOCAL))
+
+    async def evaluate_metadata(self, ca: str, session) -> tuple[str | None, dict | None]:
+        """(name of the rejecting METADATA rule or None, token info if any rule needed it)."""
+        if not any(r.cost == METADATA for r in self.rules):
+            return None, None
+        info = await self.metadata(ca, session)
+        return self._rejected(ca, self.check(ca, info, METADATA)), info
+
+    async def evaluate(self, ca: str, session) -> tuple[str | None, dict | None]:
+        """(name of the rejecting rule or None, token info if it was needed)."""
+        rejected = self.evaluate_local(ca)
+        if rejected is not None:
+            return rejected, None
+        return await self.evaluate_metadata(ca, session)
+
+    @staticmethod
+    def _rejected(ca: str, rejected: tuple[str, str] | None) -> str | None:
+        if rejected is None:
+            return None
+        logger.info(f"FILTERED {ca[:6]}... | {rejected[0]}: {rejected[1]}")
+        return rejected[0]
+
+    def stats(self) -> dict:
+        out = {
+            name: {"checked": c["checked"], "rejected": c["rejected"], "ms": round(c["sec"] * 1000, 2)}
+            for name, c in self.counts.items()
+        }
+        out["metadata"] = {"lookups": self.lookups, "cache_hits": self.cache_hits,
+                           "ms": round(self.lookup_sec * 1000, 1)}
+        return out
+
+async def passes_filters(info: dict, config: dict) -> bool:
+    """Metadata rules only, on info the caller already has (replay.py)."""
+    return FilterEngine(config).check("", info, METADATA) is None
@@ -0,0 +1,94 @@
+# /root/ux-solsniper/http_pool.py
+import asyncio
+import time
+import aiohttp
+from loguru import logger
+from endpoints import JUPITER_API, DEXSCREENER_API, COINGECKO_API
+from tracing import tracer
+
+TRADE_HOSTS = (JUPITER_API,)                              # /order, /execute, /holdings
+PRICE_HOSTS = (DEXSCREENER_API, JUPITER_API, COINGECKO_API)  # metadata, price feed, SOL price
+
+class HttpPool:
+    """Two long-lived, pre-warmed sessions: one for trading, one for prices.
+
+    Order/execute traffic never queues behind a burst of price polls because
+    each side has its own connector. Both cache DNS, keep connections alive
+    longer than the default 15s, and are warmed at startup (DNS + TCP + TLS
+    for `warm_conns` sockets per host) and kept warm by a cheap HEAD per
+    socket every `keepalive_interval` seconds, so the first trade of the day
+    reuses an open connection.
+    """
+
+    def __init__(self, trade_per_host: int = 8, price_per_host: int = 16, dns_ttl: int = 600,
+                 keepalive_timeout: float = 75.0, keepalive_interval: float = 30.0, warm_conns: int = 2):
+        self.trade_per_host = trade_per_host
+        self.price_per_host = price_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.keepalive_interval = keepalive_interval
+        self.warm_conns = warm_conns
+        self.trade: aiohttp.ClientSession | None = None
+        self.price: aiohttp.ClientSession | None = None
+        self._task: asyncio.Task | None = None
+
+    def _session(self, per_host: int) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=per_host * 4,
+            limit_per_host=per_host,
+            ttl_dns_cache=self.dns_ttl,
+            keepalive_timeout=self.keepalive_timeout,
+            enable_cleanup_closed=True,
+        )
+        return aiohttp.ClientSession(connector=connector, trace_configs=[tracer.http_trace_config()])
+
+    async def __aenter__(self) -> "HttpPool":
+        self.trade = self._session(self.trade_per_host)
+        self.price = self._session(self.price_per_host)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    # === WARMING ===
+    async def _ping(self, session: aiohttp.ClientSession, base: str) -> bool:
+        try:
+            async with session.head(f"{base}/", timeout=aiohttp.ClientTimeout(total=5), allow_redirects=False):
+                return True  # any status: the connection is up
+        except Exception as e:
+            logger.debug(f"HTTP warm {base} failed: {e}")
+            return False
+
+    def _pings(self) -> list:
+        return [
+            self._ping(session, base)
+            for session, hosts in ((self.trade, TRADE_HOSTS), (self.price, PRICE_HOSTS))
+            for base in hosts
+            for _ in range(self.warm_conns)
+        ]
+
+    async def warm(self) -> float:
+        """Open `warm_conns` connections per host in parallel; returns seconds spent."""
+        started = time.perf_counter()
+        pings = self._pings()
+        ok = sum(await asyncio.gather(*pings))
+        elapsed = time.perf_counter() - started
+        logger.info(f"HTTP pool warmed | {ok}/{len(pings)} connections in {elapsed * 1000:.0f}ms")
+        return elapsed
+
+    async def _keep_warm(self):
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            await asyncio.gather(*self._pings())
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._keep_warm())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for session in (self.trade, self.price):
+            if session is not None and not session.closed:
+                await session.close()
@@ -0,0 +1,52 @@
+# /root/ux-solsniper/ingest.py
+import time
+from collections import Counter
+from loguru import logger
+from tracing import tracer
+from channels import ChannelSpec, DEFAULT_CHANNEL
+
+# Per-channel counters: posts seen, signals queued (first to post the CA), duplicates
+channel_stats: dict[str, Counter] = {}
+
+async def handle_message(bot, message, received: float | None = None,
+                         channel: ChannelSpec | None = None) -> str | None:
+    """Channel message → queued CA. Returns the CA when it was enqueued.
+
+    Every subscribed chat goes through here with its own ChannelSpec
+    (prefix rules and parser, looked up by chat id in bot.channels). All
+    channels share one dedup index and one queue: the first channel to
+    post a CA wins and later duplicates stop at one index lookup.
+    """
+    received = time.time() if received is None else received
+    if channel is None:
+        channel = bot.channels.get(getattr(message, "chat_id", None), DEFAULT_CHANNEL)
+    stats = channel_stats.setdefault(channel.name, Counter())
+    stats["posts"] += 1
+    text = (message.message or "").strip()
+    logger.info(f"CHANNEL MSG [{channel.name}]: '{text}' | ID: {message.id}")
+
+    # === PREFIX RULE OF THE CHANNEL (startswith: empty text simply doesn't match) ===
+    if not channel.accepts(text):
+        logger.info(f"Skipped because it does not start with {'/'.join(channel.prefixes)}")
+        return None
+
+    # === EXTRACT CA ===
+    ca = channel.parse(message)
+    if not ca:
+        logger.info("NO CA FOUND")
+        return None  # CRITICAL: DO NOT CONTINUE
+    if ca in bot.processed_cas:
+        stats["duplicates"] += 1
+        logger.info(f"DUPLICATE CA: {ca} [{channel.name}]")
+        return None
+
+    bot.processed_cas.add(ca)
+    stats["signals"] += 1
+    msg_time = message.date.timestamp()
+    tracer.start("buy", ca, origin=msg_time)
+    tracer.mark("buy", ca, "handler", received)
+    if not await bot.queue.put(ca, msg_time=msg_time, channel=channel.name, priority=channel.priority):
+        return None  # already too old (the queue finished its trace)
+    tracer.mark("buy", ca, "enqueue")
+    logger.info(f"ENQUEUED CA: {ca} [{channel.name}]")
+    return ca
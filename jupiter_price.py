@@ -1,165 +1,521 @@
 import asyncio
 import logging
+import time
 import aiohttp
 from loguru import logger
+from endpoints import JUPITER_API, DEXSCREENER_API, COINGECKO_API
+from ratelimit import rate_budget
+from upstreams import upstreams
 
-async def get_sol_price_usd(session):
-    """Fetch SOL price in USD using CoinGecko only."""
-    url = "https://api.coingecko.com/api/v3/simple/price?ids=solana&vs_currencies=usd"
-    for attempt in range(1, 2):
-        try:
+def _bad_status(status: int) -> bool:
+    """Statuses that count against a source's health (not 404s for unknown mints)."""
+    return status == 429 or status >= 500
+
+SOL_MINT = "So11111111111111111111111111111111111111112"
+USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+async def _fetch_sol_price_coingecko(session) -> float | None:
+    url = f"{COINGECKO_API}/api/v3/simple/price?ids=solana&vs_currencies=usd"
+    try:
+        await rate_budget.acquire(url)
+        with upstreams.track("coingecko") as call:
             async with session.get(url, timeout=10) as resp:
-                if resp.status == 429 or resp.status != 200:
-                    await asyncio.sleep(attempt)
-                    continue
+                if resp.status == 429:
+                    call.fail()
+                    logger.warning("CoinGecko 429 → rate limited")
+                    return None
+                if resp.status != 200:
+                    call.fail()
+                    logger.warning(f"CoinGecko error {resp.status}")
+                    return None
                 data = await resp.json()
-                price = data.get("solana", {}).get("usd")
-                if price:
-                    logger.info(f"SOL PRICE: ${price:.2f} (via CoinGecko)")
-                    return float(price)
-        except Exception:
-            await asyncio.sleep(attempt)
-
-    logger.error("Failed to fetch SOL price from CoinGecko after 3 attempts")
-    return 0.0
+        price = data.get("solana", {}).get("usd")
+        if price:
+            logger.info(f"SOL PRICE: ${price:.2f} (via CoinGecko)")
+            return float(price)
+    except Exception as e:
+        logger.warning(f"CoinGecko SOL price failed: {e}")
+    return None
+
+async def _fetch_sol_price_jupiter(session) -> float | None:
+    """SOL/USDC quote for 1 SOL on Jupiter, used when CoinGecko rate-limits."""
+    url = f"{JUPITER_API}/swap/v1/quote"
+    params = {"inputMint": SOL_MINT, "outputMint": USDC_MINT, "amount": "1000000000", "slippageBps": "50"}
+    try:
+        await rate_budget.acquire(url)
+        with upstreams.track("jupiter_quote") as call:
+            async with session.get(url, params=params, timeout=8) as resp:
+                if resp.status != 200:
+                    call.fail()
+                    logger.warning(f"Jupiter SOL quote error {resp.status}")
+                    return None
+                data = await resp.json()
+        out_amount = data.get("outAmount")
+        if out_amount:
+            price = int(out_amount) / 1e6
+            logger.info(f"SOL PRICE: ${price:.2f} (via Jupiter quote)")
+            return price
+    except Exception as e:
+        logger.warning(f"Jupiter SOL quote failed: {e}")
+    return None
+
+class SolPriceCache:
+    """SOL/USD price kept fresh in the background.
+
+    Reads inside `ttl` return the cached value; reads inside `max_stale`
+    return it too and trigger a refresh without waiting. Only an empty or
+    too-stale cache makes the caller wait, and concurrent callers then share
+    the same in-flight fetch.
+    """
+
+    def __init__(self, ttl: float = 20.0, max_stale: float = 120.0):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.price = 0.0
+        self.source = None
+        self.updated = 0.0
+        self._inflight: asyncio.Task | None = None
+        self._refresher: asyncio.Task | None = None
+
+    def configure(self, ttl: float | None = None, max_stale: float | None = None):
+        if ttl is not None:
+            self.ttl = ttl
+        if max_stale is not None:
+            self.max_stale = max(max_stale, self.ttl)
+
+    def age(self) -> float:
+        return time.monotonic() - self.updated if self.price else float("inf")
+
+    async def get(self, session) -> float:
+        age = self.age()
+        if age <= self.ttl:
+            return self.price
+        if age <= self.max_stale:
+            self._spawn_refresh(session)
+            return self.price
+        return await self.refresh(session)
+
+    def _spawn_refresh(self, session) -> asyncio.Task:
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._fetch(session))
+        return self._inflight
+
+    async def refresh(self, session) -> float:
+        # shield: a cancelled caller must not cancel the fetch other callers share
+        return await asyncio.shield(self._spawn_refresh(session))
+
+    async def _fetch(self, session) -> float:
+        fetchers = {"coingecko": _fetch_sol_price_coingecko, "jupiter_quote": _fetch_sol_price_jupiter}
+        # Healthiest first; a source with an open breaker is skipped outright
+        for source in upstreams.rank(fetchers):
+            price = await fetchers[source](session)
+            if price and price > 0:
+                self.price, self.source, self.updated = price, source, time.monotonic()
+                return price
+        if self.age() <= self.max_stale:
+            logger.warning(f"SOL price refresh failed → keeping ${self.price:.2f} ({self.age():.0f}s old)")
+            return self.price
+        logger.error("Failed to fetch SOL price from CoinGecko and Jupiter")
+        return 0.0
+
+    def start(self, session):
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._refresh_loop(session))
+
+    async def stop(self):
+        if self._refresher and not self._refresher.done():
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+        self._refresher = None
+
+    async def _refresh_loop(self, session):
+        while True:
+            try:
+                await self.refresh(session)
+            except Exception as e:
+                logger.warning(f"SOL price refresher error: {e}")
+            # Refresh before the TTL runs out so readers never hit a cold cache
+            await asyncio.sleep(max(1.0, self.ttl * 0.8))
+
+sol_price_cache = SolPriceCache()
+
+async def get_sol_price_usd(session):
+    """SOL price in USD from the shared cache (CoinGecko or Jupiter quote, healthiest first)."""
+    return await sol_price_cache.get(session)
+
+METADATA_FIELDS = ("priceUsd", "marketCap", "liquidity")
+
+class MetadataLookup:
+    """How get_mcap_and_price queries DexScreener and Jupiter.
+
+    mode "sequential": Jupiter only after DexScreener finished with gaps.
+    mode "parallel":   both at once.
+    mode "hedged":     Jupiter starts once DexScreener is slower than its
+                       recent p90 (or `hedge_delay` until enough samples).
+
+    A source whose circuit breaker is open is not queried in any mode.
+    """
+
+    def __init__(self, mode: str = "hedged", hedge_delay: float = 0.25,
+                 min_delay: float = 0.05, max_delay: float = 2.0, min_samples: int = 5):
+        self.mode = mode
+        self.hedge_delay = hedge_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+
+    def configure(self, mode: str | None = None, hedge_delay: float | None = None):
+        if mode is not None:
+            if mode not in ("sequential", "parallel", "hedged"):
+                raise ValueError(f"Unknown metadata lookup mode: {mode}")
+            self.mode = mode
+        if hedge_delay is not None:
+            self.hedge_delay = hedge_delay
+
+    def delay(self) -> float:
+        if self.mode == "parallel":
+            return 0.0
+        samples = upstreams.get("dexscreener").latencies
+        if len(samples) < self.min_samples:
+            return self.hedge_delay
+        return min(self.max_delay, max(self.min_delay, upstreams.percentile("dexscreener", 90)))
+
+metadata_lookup = MetadataLookup()
+
+async def _dexscreener_info(session: aiohttp.ClientSession, ca: str) -> dict:
+    info = dict.fromkeys(METADATA_FIELDS)
+    ds_url = f"{DEXSCREENER_API}/latest/dex/tokens/{ca}"
+    rate_budget.take(ds_url)  # buy path: never waits, only debits the budget
+    try:
+        with upstreams.track("dexscreener") as call:
+            async with session.get(ds_url, timeout=10) as resp:
+                if resp.status != 200:
+                    if _bad_status(resp.status):
+                        call.fail()
+                    return info
+                data = await resp.json()
+        pairs = data.get("pairs") or []
+        if pairs:
+            # Prefer Raydium or PumpSwap
+            pair = next((p for p in pairs if p.get("dexId") in ["raydium", "pumpswap"]), pairs[0])
+            price_usd = pair.get("priceUsd")
+            if price_usd:
+                info["priceUsd"] = float(price_usd)
+            mcap = pair.get("marketCap")
+            if mcap:
+                info["marketCap"] = float(mcap)
+            liq_usd = (pair.get("liquidity") or {}).get("usd")
+            if liq_usd:
+                info["liquidity"] = float(liq_usd)
+    except Exception as e:
+        logger.debug(f"Dexscreener fetch error: {e}")
+    return info
+
+async def _jupiter_info(session: aiohttp.ClientSession, ca: str) -> dict:
+    info = dict.fromkeys(METADATA_FIELDS)
+    jup_url = f"{JUPITER_API}/tokens/v2/search?query={ca}"
+    rate_budget.take(jup_url)
+    try:
+        with upstreams.track("jupiter") as call:
+            async with session.get(jup_url, timeout=8) as r:
+                if not r.ok:
+                    if _bad_status(r.status):
+                        call.fail()
+                    return info
+                data = await r.json()
+        if data and len(data) > 0:
+            t = data[0]
+            price = t.get("usdPrice") or t.get("priceUsd")
+            if price:
+                info["priceUsd"] = float(price)
+            mcap = t.get("mcap")
+            if mcap:
+                info["marketCap"] = float(mcap)
+            liq = t.get("liquidity")
+            if liq:
+                info["liquidity"] = float(liq)
+    except Exception as e:
+        logger.warning(f"Jupiter fallback failed: {e}")
+    return info
 
-async def get_mcap_and_price(session: aiohttp.ClientSession, ca: str) -> dict:
+def _merge_info(result: dict, info: dict, source: str):
+    filled = False
+    for key in METADATA_FIELDS:
+        if result[key] is None and info.get(key) is not None:
+            result[key] = info[key]
+            filled = True
+    if filled:
+        result["source"] = source if result["source"] == "failed" else f"{result['source']}+{source}"
+
+async def get_mcap_and_price(session: aiohttp.ClientSession, ca: str, mode: str | None = None) -> dict:
     result = {
         "priceUsd": None,
         "marketCap": None,
         "liquidity": None,
         "source": "failed"
     }
+    mode = mode or metadata_lookup.mode
+
+    def complete() -> bool:
+        return None not in (result["priceUsd"], result["marketCap"], result["liquidity"])
+
+    # === BREAKER OPEN ON DEXSCREENER: STRAIGHT TO JUPITER, NO TIMEOUT PAID ===
+    if not upstreams.allow("dexscreener"):
+        if upstreams.allow("jupiter"):
+            logger.info("Dexscreener circuit open → JUPITER ONLY")
+            _merge_info(result, await _jupiter_info(session, ca), "jupiter_fallback")
+        return result
 
-    # === DEXSCREENER PRIMARY ===
-    ds_url = f"https://api.dexscreener.com/latest/dex/tokens/{ca}"
+    # === SEQUENTIAL: DEXSCREENER, THEN JUPITER FOR MISSING FIELDS ONLY ===
+    if mode == "sequential":
+        _merge_info(result, await _dexscreener_info(session, ca), "dexscreener")
+        if not complete() and upstreams.allow("jupiter"):
+            logger.info("Dexscreener missing fields → JUPITER FALLBACK")
+            _merge_info(result, await _jupiter_info(session, ca), "jupiter_fallback")
+        return result
+
+    # === HEDGED / PARALLEL: FIRST COMPLETE ANSWER WINS, GAPS MERGED FROM THE OTHER ===
+    tasks = {asyncio.create_task(_dexscreener_info(session, ca)): "dexscreener"}
+    pending = set(tasks)
     try:
-        async with session.get(ds_url, timeout=10) as resp:
-            if resp.status == 200:
-                data = await resp.json()
-                pairs = data.get("pairs", [])
-                if pairs:
-                    # Prefer Raydium or PumpSwap
-                    pair = next((p for p in pairs if p.get("dexId") in ["raydium", "pumpswap"]), pairs[0])
-                    
-                    price_usd = pair.get("priceUsd")
-                    if price_usd:
-                        result["priceUsd"] = float(price_usd)
-                    
-                    mcap = pair.get("marketCap")
-                    if mcap:
-                        result["marketCap"] = float(mcap)
-                    
-                    liq_usd = pair.get("liquidity", {}).get("usd")
-                    if liq_usd:
-                        result["liquidity"] = float(liq_usd)
-                    
-                    if result["priceUsd"] or result["marketCap"] or result["liquidity"]:
-                        result["source"] = "dexscreener"
-                        logger.debug(f"DEXSCREENER → PRICE ${result['priceUsd']:.10f} | MCAP ${result['marketCap']:,} | LIQ ${result['liquidity']:,}")
-    except Exception as e:
-        logger.debug(f"Dexscreener fetch error: {e}")
+        done, pending = await asyncio.wait(pending, timeout=metadata_lookup.delay())
+        for task in done:
+            _merge_info(result, task.result(), tasks[task])
+        if complete():
+            return result
 
-    # === JUPITER FALLBACK FOR MISSING FIELDS ONLY ===
-    if None in (result["priceUsd"], result["marketCap"], result["liquidity"]):
-        logger.info("Dexscreener missing fields → JUPITER FALLBACK")
-        jup_url = f"https://lite-api.jup.ag/tokens/v2/search?query={ca}"
-        try:
-            async with session.get(jup_url, timeout=8) as r:
-                if r.ok:
-                    data = await r.json()
-                    if data and len(data) > 0:
-                        t = data[0]
-                        if result["priceUsd"] is None:
-                            price = t.get("usdPrice") or t.get("priceUsd")
-                            if price:
-                                result["priceUsd"] = float(price)
-                        if result["marketCap"] is None:
-                            mcap = t.get("mcap")
-                            if mcap:
-                                result["marketCap"] = float(mcap)
-                        if result["liquidity"] is None:
-                            liq = t.get("liquidity")
-                            if liq:
-                                result["liquidity"] = float(liq)
-                        result["source"] = result["source"].replace("failed", "jupiter_fallback")
-        except Exception as e:
-            logger.warning(f"Jupiter fallback failed: {e}")
-
-    # Final fallback
-    if result["priceUsd"] is None and result["marketCap"] is None and result["liquidity"] is None:
-        result["source"] = "failed"
+        if upstreams.allow("jupiter"):
+            logger.info("Dexscreener slow or incomplete → JUPITER HEDGE")
+            hedge = asyncio.create_task(_jupiter_info(session, ca))
+            tasks[hedge] = "jupiter_fallback"
+            pending.add(hedge)
+        while pending and not complete():
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                _merge_info(result, task.result(), tasks[task])
+    finally:
+        for task in pending:
+            task.cancel()
 
+    if result["priceUsd"] is not None:
+        logger.debug(f"METADATA ({result['source']}) → PRICE ${result['priceUsd']:.10f} | MCAP {result['marketCap']} | LIQ {result['liquidity']}")
     return result
 
 async def get_token_price(mint: str, session: aiohttp.ClientSession) -> float:
-    # === DEXSCREENER PRIMARY ===
-    ds_url = f"https://api.dexscreener.com/latest/dex/tokens/{mint}"
+    price = (await get_token_prices([mint], session)).get(mint)
+    if price:
+        return price
+    logger.warning("ALL PRICE SOURCES FAILED → 0.0")
+    return 0.0
+
+DEXSCREENER_BATCH = 30   # max addresses per /tokens/{a,b,c} call
+JUPITER_BATCH = 50       # max ids per /price/v3 call
+
+async def _dexscreener_prices(chunk: list[str], session: aiohttp.ClientSession) -> dict[str, float]:
+    prices: dict[str, float] = {}
+    ds_url = f"{DEXSCREENER_API}/latest/dex/tokens/{','.join(chunk)}"
     try:
-        async with session.get(ds_url, timeout=8) as resp:
-            if resp.status == 200:
+        await rate_budget.acquire(ds_url)
+        with upstreams.track("dexscreener") as call:
+            async with session.get(ds_url, timeout=8) as resp:
+                if resp.status != 200:
+                    if _bad_status(resp.status):
+                        call.fail()
+                    logger.debug(f"Dexscreener batch HTTP {resp.status}")
+                    return prices
                 data = await resp.json()
-                pairs = data.get("pairs", [])
-                if pairs:
-                    # Prefer Raydium or PumpSwap
-                    for pair in pairs:
-                        if pair.get("dexId") in ["raydium", "pumpswap"]:
-                            price_usd = pair.get("priceUsd")
-                            if price_usd:
-                                logger.debug(f"DEXSCREENER PRICE → ${float(price_usd):.10f} | MCAP ${pair.get('fdv', 0):,}")
-                                return float(price_usd)
-                    # Fallback to first pair
-                    price_usd = pairs[0].get("priceUsd")
-                    if price_usd:
-                        logger.debug(f"DEXSCREENER PRICE (fallback) → ${float(price_usd):.10f}")
-                        return float(price_usd)
     except Exception as e:
-        logger.debug(f"Dexscreener error: {e}")
+        logger.debug(f"Dexscreener batch error: {e}")
+        return prices
 
-    # === JUPITER FALLBACK ===
-    logger.info("Dexscreener failed → JUPITER FALLBACK")
-    jup_url = f"https://lite-api.jup.ag/tokens/v2/search?query={mint}"
+    wanted = set(chunk)
+    fallback: dict[str, float] = {}
+    for pair in data.get("pairs") or []:
+        mint = (pair.get("baseToken") or {}).get("address")
+        price_usd = pair.get("priceUsd")
+        if mint not in wanted or not price_usd:
+            continue
+        # Prefer Raydium or PumpSwap, else first pair seen
+        if pair.get("dexId") in ["raydium", "pumpswap"]:
+            prices.setdefault(mint, float(price_usd))
+        else:
+            fallback.setdefault(mint, float(price_usd))
+    for mint, price in fallback.items():
+        prices.setdefault(mint, price)
+    return prices
+
+async def _jupiter_prices(chunk: list[str], session: aiohttp.ClientSession) -> dict[str, float]:
+    prices: dict[str, float] = {}
+    jup_url = f"{JUPITER_API}/price/v3?ids={','.join(chunk)}"
     try:
-        async with session.get(jup_url, timeout=8) as r:
-            if r.ok:
+        await rate_budget.acquire(jup_url)
+        with upstreams.track("jupiter") as call:
+            async with session.get(jup_url, timeout=8) as r:
+                if not r.ok:
+                    if _bad_status(r.status):
+                        call.fail()
+                    return prices
                 data = await r.json()
-                if data and len(data) > 0:
-                    price = data[0].get("usdPrice") or data[0].get("priceUsd")
-                    if price:
-                        logger.debug(f"JUPITER PRICE → ${float(price):.10f}")
-                        return float(price)
+        for mint in chunk:
+            price = (data.get(mint) or {}).get("usdPrice")
+            if price:
+                prices[mint] = float(price)
     except Exception as e:
-        logger.debug(f"Jupiter fallback error: {e}")
+        logger.debug(f"Jupiter batch error: {e}")
+    return prices
 
-    logger.warning("ALL PRICE SOURCES FAILED → 0.0")
-    return 0.0
+PRICE_SOURCES = {
+    "dexscreener": (_dexscreener_prices, DEXSCREENER_BATCH),
+    "jupiter": (_jupiter_prices, JUPITER_BATCH),
+}
 
-async def get_token_balance(wallet, mint, session):
-    wallet_address = str(wallet.pubkey())
-    for attempt in range(1, 4):
-        try:
-            url = f"https://lite-api.jup.ag/ultra/v1/holdings/{wallet_address}"
-            async with session.get(url, timeout=10) as resp:
-                if resp.status == 429:
-                    logger.warning(f"Jupiter 429 → retry {attempt}/3")
+async def get_token_prices(mints: list[str], session: aiohttp.ClientSession,
+                           sources: dict[str, str] | None = None) -> dict[str, float]:
+    """Batched prices from the healthiest source; the next one only fills the misses.
+
+    Sources with an open circuit breaker are skipped, so an outage costs one
+    timeout per breaker cooldown instead of one per poll. If `sources` is
+    given it is filled with the source name that priced each mint.
+    """
+    prices: dict[str, float] = {}
+    if not mints:
+        return prices
+
+    for rank, source in enumerate(upstreams.rank(PRICE_SOURCES)):
+        missing = [m for m in mints if m not in prices]
+        if not missing:
+            break
+        if rank:
+            logger.info(f"{len(missing)} mints without price → {source.upper()} FALLBACK")
+        fetch, batch = PRICE_SOURCES[source]
+        for i in range(0, len(missing), batch):
+            found = await fetch(missing[i:i + batch], session)
+            prices.update(found)
+            if sources is not None:
+                sources.update(dict.fromkeys(found, source))
+
+    return prices
+
+class HoldingsCache:
+    """One /ultra/v1/holdings snapshot of the wallet shared by every reader.
+
+    The snapshot is refetched at most once per `interval` (concurrent readers
+    share the request) and immediately after `invalidate()`, which buys and
+    sells call once their transaction lands. Snapshots are tagged with the
+    invalidate() generation they started in, so a fetch already in flight
+    when a trade lands is neither reused nor allowed to overwrite a newer
+    snapshot. A mint missing from the snapshot gets one more fetch started
+    after the miss before it counts as not held. Decimals are remembered per
+    mint for the life of the process.
+    """
+
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self.tokens: dict[str, dict] = {}
+        self.decimals: dict[str, int] = {}
+        self.updated = 0.0
+        self.wallet_address = None
+        self.generation = 0      # bumped by invalidate()
+        self.snapshot_gen = -1   # generation the current snapshot started in
+        self.snapshot_started = 0.0
+        self._inflight: asyncio.Task | None = None
+        self._inflight_gen = -1
+        self._inflight_started = 0.0
+
+    def configure(self, interval: float | None = None):
+        if interval is not None:
+            self.interval = interval
+
+    def invalidate(self):
+        """A trade landed: every snapshot started before now is stale."""
+        self.generation += 1
+        self.updated = 0.0
+
+    def fresh(self, wallet_address: str) -> bool:
+        return (self.wallet_address == wallet_address and self.snapshot_gen == self.generation
+                and time.monotonic() - self.updated <= self.interval)
+
+    async def refresh(self, session, wallet_address: str, since: float | None = None) -> bool:
+        """Share the in-flight fetch unless it started before the last invalidate() (or before `since`)."""
+        inflight = self._inflight
+        if (inflight is None or inflight.done() or self._inflight_gen < self.generation
+                or (since is not None and self._inflight_started < since)):
+            self._inflight_gen = self.generation
+            self._inflight_started = time.monotonic()
+            inflight = self._inflight = asyncio.create_task(
+                self._fetch(session, wallet_address, self.generation, self._inflight_started)
+            )
+        return await asyncio.shield(inflight)
+
+    async def _fetch(self, session, wallet_address: str, generation: int, started: float) -> bool:
+        url = f"{JUPITER_API}/ultra/v1/holdings/{wallet_address}"
+        for attempt in range(1, 4):
+            try:
+                rate_budget.take(url)  # sells wait on this snapshot
+                with upstreams.track("ultra_holdings") as call:
+                    async with session.get(url, timeout=10) as resp:
+                        if _bad_status(resp.status):
+                            call.fail()
+                        if resp.status == 429:
+                            logger.warning(f"Jupiter 429 → retry {attempt}/3")
+                            await asyncio.sleep(attempt)
+                            continue
+                        if resp.status != 200:
+                            logger.warning(f"Jupiter error {resp.status}")
+                            continue
+                        data = await resp.json()
+                tokens = {}
+                for mint, accounts in (data.get("tokens") or {}).items():
+                    token = next(iter(accounts or []), None)
+                    if token:
+                        tokens[mint] = token
+                        if token.get("decimals") is not None:
+                            self.decimals[mint] = int(token["decimals"])
+                if started < self.snapshot_started:
+                    return True  # a fetch started after ours already landed
+                self.tokens = tokens
+                self.wallet_address = wallet_address
+                self.snapshot_gen = generation
+                self.snapshot_started = started
+                self.updated = time.monotonic()
+                logger.debug(f"HOLDINGS refreshed | {len(tokens)} tokens")
+                return True
+            except Exception as e:
+                logger.warning(f"Jupiter attempt {attempt}/3 failed: {e}")
+                if attempt < 3:
                     await asyncio.sleep(attempt)
-                    continue
-                if resp.status != 200:
-                    logger.warning(f"Jupiter error {resp.status}")
-                    continue
-                data = await resp.json()
+        return False
+
+    async def get(self, wallet, mint: str, session) -> tuple[float, int, int]:
+        """(uiAmount, decimals, raw amount) of `mint`; zeros when not held."""
+        wallet_address = str(wallet.pubkey())
+        if not self.fresh(wallet_address):
+            await self.refresh(session, wallet_address)
+        token = self.tokens.get(mint)
+        if not token:
+            # e.g. bought a moment ago: one snapshot started after this miss decides
+            await self.refresh(session, wallet_address, since=time.monotonic())
+            token = self.tokens.get(mint)
+        decimals = self.decimals.get(mint, 6)
+        if not token:
+            return 0.0, decimals, 0
+        ui_amount = float(token.get("uiAmount") or 0.0)
+        raw = token.get("amount")
+        raw_amount = int(raw) if raw else int(round(ui_amount * 10 ** decimals))
+        return ui_amount, decimals, raw_amount
 
-            token = next((t for t in data.get("tokens", {}).get(mint, [])), None)
-            if token:
-                ui_amount = token.get("uiAmount", 0.0)
-                decimals = token.get("decimals", 6)
-                if ui_amount > 0:
-                    logger.debug(f"JUPITER UI: {ui_amount:,.2f} tokens")
-                    return ui_amount, decimals  # ← RETURN uiAmount AS-IS
-        except Exception as e:
-            logger.warning(f"Jupiter attempt {attempt}/3 failed: {e}")
-            if attempt < 3:
-                await asyncio.sleep(attempt)
+holdings_cache = HoldingsCache()
 
+async def get_token_holding(wallet, mint, session) -> tuple[float, int, int]:
+    return await holdings_cache.get(wallet, mint, session)
+
+async def get_token_balance(wallet, mint, session):
+    ui_amount, decimals, _ = await holdings_cache.get(wallet, mint, session)
+    if ui_amount > 0:
+        logger.debug(f"JUPITER UI: {ui_amount:,.2f} tokens")
+        return ui_amount, decimals  # ← RETURN uiAmount AS-IS
     logger.warning("Jupiter failed → balance = 0.0")
-    return 0.0, 6
+    return 0.0, decimals
@@ -1,72 +1,84 @@
 #!/usr/bin/env python3
 import asyncio
+import importlib
 import sys
-import os
+import time
+from startup import startup
 from loguru import logger
-from telethon import events
-from telethon import TelegramClient
-from telethon.sessions import StringSession
 from config import load_config
-from sniper import SniperBot
+from tg_client import build_client
 
 # === LOGGING ===
 logger.remove()
 logger.add("/root/ux-solsniper/sniper.log", level="INFO")
 logger.add(sys.stdout, level="INFO", colorize=True)
 
+def _import_bot():
+    """The trade path (solders, aiohttp, sniper and friends): imported off the loop while Telegram connects."""
+    return [importlib.import_module(m) for m in ("sniper", "ingest", "notifier", "tracing")]
+
 async def main():
     logger.info("UX-SolSniper Bot STARTED")
-    config = load_config()
+    with startup.stage("config"):
+        config = load_config()
 
-    # === SESSION STRING ===
-    session_file = "/root/ux-solsniper/session_string.txt"
-    if not os.path.exists(session_file):
-        logger.error("NO session_string.txt")
+    # === CLIENT (built once) ===
+    try:
+        with startup.stage("client"):
+            client = build_client(config)
+    except FileNotFoundError as e:
+        logger.error(f"NO session: {e}")
         sys.exit(1)
-    with open(session_file, "r") as f:
-        session_str = f.read().strip()
 
-    # === BOT + CLIENT ===
-    bot = SniperBot(config)
-    bot.client = TelegramClient(
-        StringSession(session_str),
-        int(config["TELEGRAM_API_ID"]),
-        config["TELEGRAM_API_HASH"]
-    )
+    # === EVENT HANDLER: registered before login, waits for the bot if a post beats the warm-up ===
+    from telethon import events
+    loaded = asyncio.get_running_loop().create_future()
 
-    # === EVENT HANDLER: fire ONLY + DEBUG + CA LOGIC ===
-    @bot.client.on(events.NewMessage(chats=int(config["TARGET_CHANNEL_ID"])))
-    async def handler(event):
-        text = (event.message.message or "").strip()
-        logger.info(f"CHANNEL MSG: '{text}' | ID: {event.message.id}")
-
-        # === MUST START WITH fire EMOJI (after spaces) ===
-        if text[0] != "🔥":
-            logger.info("Skipped because it does not start with 🔥")
-            return
+    # One handler for every channel; ingest picks the ChannelSpec by chat id
+    chats = [spec.chat_id for spec in config["CHANNELS"]]
+    if not chats:
+        logger.error("NO channels: set CHANNELS or TARGET_CHANNEL_ID")
+        sys.exit(1)
+    logger.info("CHANNELS | " + ", ".join(
+        f"{s.name} ({'/'.join(s.prefixes) or 'any'}, {s.parser}, prio {s.priority})" for s in config["CHANNELS"]
+    ))
 
-        # === EXTRACT CA ===
-        ca = bot.extract_ca(event.message)
-        if ca:
-            if ca in bot.processed_cas:
-                logger.info(f"DUPLICATE CA: {ca}")
-            else:
-                bot.processed_cas.add(ca)
-                await bot.queue.put(ca)
-                logger.info(f"ENQUEUED CA: {ca}")
-        else:
-            logger.info("NO CA FOUND")
-            return  # 鈫� CRITICAL: DO NOT CONTINUE
+    @client.on(events.NewMessage(chats=chats))
+    async def handler(event):
+        received = time.time()
+        bot, handle_message = await loaded
+        await handle_message(bot, event.message, received)
 
-    # === START WORKER FIRST ===
-    asyncio.create_task(bot.worker())
+    async def load_bot():
+        sniper, ingest, notifier, tracing = await startup.timed("imports", asyncio.to_thread(_import_bot))
+        with startup.stage("bot"):
+            bot = sniper.SniperBot(config, client=client)
+        loaded.set_result((bot, ingest.handle_message))
+        # === START WORKER FIRST ===
+        worker = await startup.timed("worker", bot.start_worker())
+        return bot, worker, notifier, tracing
 
-    # === LOGIN ===
-    await bot.client.start()
+    # === LOGIN, IMPORTS, HTTP WARM-UP, SOL PRICE AND STATE CONCURRENTLY ===
+    try:
+        _, (bot, worker, notifier, tracing) = await asyncio.gather(
+            startup.timed("telegram", client.start()), load_bot()
+        )
+    except Exception as e:
+        logger.exception(f"STARTUP FAILED: {e}")
+        sys.exit(1)
     logger.info("Connected to Telegram🛜")
+    startup.report()
 
-    # === KEEP ALIVE ===
-    await asyncio.Event().wait()
+    # === KEEP ALIVE (until the worker dies) ===
+    try:
+        await worker
+    finally:
+        bot.processed_cas.save()
+        # Deliver alerts still queued (last sells) before the loop goes away
+        await notifier.get_notifier().close()
+        if bot.price_feed is not None:
+            await bot.price_feed.stop()  # also flushes and closes the tick recorder
+        tracing.tracer.close()
 
 if __name__ == "__main__":
     try:
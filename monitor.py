@@ -0,0 +1,270 @@
+# /root/ux-solsniper/monitor.py
+import asyncio
+import heapq
+import itertools
+import math
+import time
+import aiohttp
+from loguru import logger
+from solders.keypair import Keypair
+from sell import execute_ultra_sell
+from sell import prepare_ultra_sell
+from tracing import tracer
+
+SIGMA_Z = 3.0     # next check before a 3-sigma move could reach TP/SL
+VOL_ALPHA = 0.3   # EWMA weight of the newest volatility sample
+
+class Position:
+    __slots__ = (
+        "ca", "token_name", "entry_price", "tp_price", "sl_price",
+        "price", "checked_price", "next_check", "selling",
+        "prepared", "arming", "vol", "price_ts",
+    )
+
+    def __init__(self, ca: str, token_name: str, entry_price: float, tp_pct: float, sl_pct: float):
+        self.ca = ca
+        self.token_name = token_name
+        self.entry_price = entry_price
+        self.tp_price = entry_price * (1 + tp_pct / 100)
+        self.sl_price = entry_price * (1 - sl_pct / 100)
+        self.price = None          # latest price pushed by the feed
+        self.checked_price = None  # price at the last TP/SL evaluation
+        self.next_check = 0.0
+        self.selling = False
+        self.prepared = None       # signed sell order kept ready near TP/SL
+        self.arming = None         # in-flight prepare task
+        self.vol = None            # EWMA of |log return| per sqrt(second)
+        self.price_ts = 0.0
+
+class MonitorEngine:
+    """One scheduler for every open position.
+
+    Positions sit in a heap keyed by their next check time, and only while
+    there is something to do: a new price from the feed schedules its
+    position immediately, and a position near TP/SL with pre-arming stays
+    scheduled to keep its order fresh. A position whose price does not move
+    is not in the heap at all, so a tick costs work only for positions whose
+    price changed, no matter how many are open.
+
+    With MONITOR_ADAPTIVE, each position's interval follows its volatility
+    and distance to TP/SL: the next check is timed so a 3-sigma move cannot
+    cross a threshold unseen, clamped to [MONITOR_MIN_POLL_SEC,
+    MONITOR_MAX_POLL_SEC]. The feed is told the same interval, so quiet
+    positions far from both thresholds cost almost no upstream requests.
+
+    With PREARM_BAND_PCT > 0, a position whose price comes within that band
+    of TP or SL gets its balance fetched and an Ultra order signed ahead of
+    time (refreshed before PREARM_ORDER_TTL_SEC), so a trigger only has to
+    call /execute.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        wallet: Keypair,
+        config: dict,
+        feed,
+        sell_fn=execute_ultra_sell,
+        clock=None,
+        on_close=None,
+        prepare_fn=prepare_ultra_sell,
+    ):
+        self.session = session
+        self.wallet = wallet
+        self.config = config
+        self.feed = feed
+        self.sell_fn = sell_fn
+        self.on_close = on_close
+        self.prepare_fn = prepare_fn
+        self.prearm_band = float(config.get("PREARM_BAND_PCT", 0.0)) / 100
+        self.prearm_refresh = float(config.get("PREARM_ORDER_TTL_SEC", 20.0)) * 0.75
+        self.interval = float(config.get("MONITOR_POLL_SEC", 1.0))
+        self.adaptive = bool(config.get("MONITOR_ADAPTIVE", 0))
+        self.min_interval = float(config.get("MONITOR_MIN_POLL_SEC", self.interval))
+        self.max_interval = float(config.get("MONITOR_MAX_POLL_SEC", self.interval))
+        self.clock = clock or (lambda: asyncio.get_running_loop().time())
+        self.positions: dict[str, Position] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
+        self._sells: set[asyncio.Task] = set()
+        self._arms: set[asyncio.Task] = set()
+        self._task: asyncio.Task | None = None
+        self.ticks = 0
+        self.evaluations = 0
+        self.arms = 0
+        self.prearmed_exits = 0
+
+    # === POSITIONS ===
+    def add(self, ca: str, entry_price: float, token_name: str, tp_pct: float | None = None, sl_pct: float | None = None):
+        if ca in self.positions:
+            logger.warning(f"MONITOR already tracking {ca[:6]}...")
+            return
+        tp_pct = self.config["TAKE_PROFIT"] if tp_pct is None else tp_pct
+        sl_pct = abs(float(self.config["STOP_LOSS"])) if sl_pct is None else sl_pct
+        pos = Position(ca, token_name, entry_price, tp_pct, sl_pct)
+        self.positions[ca] = pos
+        self.feed.subscribe(ca, self._on_price)
+        self._schedule(pos, self.clock())
+        logger.info(f"MONITOR STARTED | {ca[:6]}... | Entry ${entry_price:.8f} | TP ${pos.tp_price:.8f} | SL ${pos.sl_price:.8f}")
+
+    def remove(self, ca: str):
+        # Heap entries of removed positions are skipped lazily when popped
+        if self.positions.pop(ca, None) is not None:
+            self.feed.unsubscribe(ca, self._on_price)
+            if self.on_close is not None:
+                self.on_close(ca)
+
+    def _on_price(self, mint: str, price: float):
+        pos = self.positions.get(mint)
+        if pos is None:
+            return
+        now = self.clock()
+        if pos.price and now > pos.price_ts:
+            sample = abs(math.log(price / pos.price)) / math.sqrt(now - pos.price_ts)
+            pos.vol = sample if pos.vol is None else VOL_ALPHA * sample + (1 - VOL_ALPHA) * pos.vol
+        pos.price_ts = now
+        changed = price != pos.price
+        pos.price = price
+        if changed and not pos.selling:
+            self._schedule(pos, now)  # evaluate on arrival, not at the next tick
+
+    def _interval(self, pos: Position, price: float | None) -> float:
+        if not self.adaptive or not price or pos.vol is None:
+            return self.interval
+        dist = min(math.log(pos.tp_price / price), math.log(price / pos.sl_price))
+        if dist <= 0:
+            return self.min_interval
+        if pos.vol <= 0:
+            return self.max_interval
+        return min(self.max_interval, max(self.min_interval, (dist / (SIGMA_Z * pos.vol)) ** 2))
+
+    def _schedule(self, pos: Position, when: float):
+        pos.next_check = when
+        heapq.heappush(self._heap, (when, next(self._seq), pos.ca))
+        if self._heap[0][2] == pos.ca:
+            self._wake.set()
+
+    # === SCHEDULER ===
+    def step(self, now: float | None = None) -> int:
+        """Evaluate every due position; returns the number of exits started."""
+        now = self.clock() if now is None else now
+        self.ticks += 1
+        exits = 0
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            when, _, ca = heapq.heappop(heap)
+            pos = self.positions.get(ca)
+            if pos is None or pos.selling or pos.next_check != when:
+                continue
+            price = pos.price
+            fresh = bool(price) and price != pos.checked_price
+            if fresh:
+                pos.checked_price = price
+                self.evaluations += 1
+                logger.debug(f"POLLER | {ca[:6]}... | ${price:.8f}")
+                if price >= pos.tp_price:
+                    logger.info(f"TP HIT @ ${price:.8f} | {ca[:6]}...")
+                    self._exit(pos, price, is_tp=True)
+                    exits += 1
+                    continue
+                if price <= pos.sl_price:
+                    logger.info(f"SL HIT @ ${price:.8f} | {ca[:6]}...")
+                    self._exit(pos, price, is_tp=False)
+                    exits += 1
+                    continue
+            interval = self._interval(pos, price)
+            if self.prearm_band and price and self._prearm(pos, price):
+                self._schedule(pos, now + interval)  # re-check to keep the pre-armed order fresh
+            if fresh:
+                # Only a new price sets the next poll; re-checks without one must not delay it
+                self.feed.schedule(ca, interval)
+        return exits
+
+    # === PRE-ARM ===
+    def _prearm(self, pos: Position, price: float) -> bool:
+        """Arm or refresh the order of a position near TP/SL; True while it is near."""
+        near = (price >= pos.tp_price * (1 - self.prearm_band)
+                or price <= pos.sl_price * (1 + self.prearm_band))
+        if not near:
+            pos.prepared = None  # far from both thresholds: let the order lapse
+            return False
+        if pos.arming is not None:
+            return True
+        if pos.prepared is None or pos.prepared.age() >= self.prearm_refresh:
+            pos.arming = asyncio.create_task(self._arm(pos))
+            self._arms.add(pos.arming)
+            pos.arming.add_done_callback(self._arms.discard)
+        return True
+
+    async def _arm(self, pos: Position):
+        try:
+            prepared = await self.prepare_fn(self.session, pos.ca, self.wallet, self.config)
+            if prepared is not None:
+                pos.prepared = prepared
+                self.arms += 1
+                logger.debug(f"PRE-ARMED | {pos.ca[:6]}... | {prepared.lamports:,} lamports")
+        finally:
+            pos.arming = None
+
+    def _exit(self, pos: Position, price: float, is_tp: bool):
+        pos.selling = True
+        tracer.start("sell", pos.ca, origin=time.time())
+        task = asyncio.create_task(self._sell(pos, price, is_tp))
+        self._sells.add(task)
+        task.add_done_callback(self._sells.discard)
+
+    async def _sell(self, pos: Position, price: float, is_tp: bool):
+        sig = None
+        try:
+            if pos.arming is not None:
+                await pos.arming  # already doing balance + order + sign
+            extra = {}
+            if pos.prepared is not None:
+                extra["prepared"] = pos.prepared
+                self.prearmed_exits += 1
+            sig = await self.sell_fn(
+                self.session, pos.ca, self.wallet, self.config,
+                current_price=price,
+                token_name=pos.token_name,
+                entry_price=pos.entry_price,
+                is_tp=is_tp,
+                **extra
+            )
+        except Exception as e:
+            logger.error(f"SELL CRASH | {pos.ca[:6]}... | {e}")
+        finally:
+            tracer.finish("sell", pos.ca, "ok" if sig else "failed")
+            self.remove(pos.ca)
+            logger.info(f"MONITOR ENDED | {pos.ca[:6]}... | {'SOLD' if sig else 'NO BALANCE'}")
+        return sig
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def run(self):
+        logger.info(f"MONITOR ENGINE STARTED | interval {self.interval}s")
+        while True:
+            self._wake.clear()
+            self.step()
+            timeout = (self._heap[0][0] - self.clock()) if self._heap else None
+            if timeout is not None and timeout <= 0:
+                await asyncio.sleep(0)
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stop(self):
+        for task in list(self._arms):
+            task.cancel()
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._sells:
+            await asyncio.gather(*self._sells, return_exceptions=True)
@@ -0,0 +1,124 @@
+# /root/ux-solsniper/notifier.py
+import asyncio
+import os
+import aiohttp
+from loguru import logger
+from endpoints import TELEGRAM_API
+
+MAX_MESSAGE_LEN = 4096  # Bot API limit per message
+
+class TelegramNotifier:
+    """Queued Telegram alerts on their own persistent session.
+
+    notify() never blocks and never opens a socket: messages wait in a bounded
+    queue and one background task sends them over a single keep-alive
+    connection, at most one message per `min_interval` per chat. Whatever has
+    piled up while waiting is joined into one message.
+    """
+
+    def __init__(self, bot_token: str, chat_id: str, maxsize: int = 200, min_interval: float = 1.0):
+        self.bot_token = bot_token
+        self.chat_id = chat_id
+        self.min_interval = min_interval
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self._session: aiohttp.ClientSession | None = None
+        self._task: asyncio.Task | None = None
+        self._last_sent = 0.0
+
+    def notify(self, text: str) -> bool:
+        if not self.bot_token or not self.chat_id:
+            logger.warning("TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID missing!")
+            return False
+        try:
+            self.queue.put_nowait(text)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"Telegram queue full → dropped alert ({self.dropped} total)")
+            return False
+        self._start()
+        return True
+
+    def _start(self):
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        except RuntimeError:
+            pass  # no loop yet: messages wait until the next notify() inside one
+
+    def _batch(self, first: str) -> str:
+        """Coalesce everything already queued into one message within the size limit."""
+        parts, size = [first], len(first)
+        while not self.queue.empty():
+            nxt = self.queue._queue[0]
+            if size + 2 + len(nxt) > MAX_MESSAGE_LEN:
+                break
+            parts.append(self.queue.get_nowait())
+            size += 2 + len(nxt)
+        return "\n\n".join(parts)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while not self.queue.empty():
+            # Per-chat rate limit; waiting here is what lets bursts coalesce
+            wait = self._last_sent + self.min_interval - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            text = self._batch(self.queue.get_nowait())
+            await self._send(text)
+            self._last_sent = loop.time()
+
+    async def _send(self, text: str):
+        if self._session is None or self._session.closed:
+            # Small dedicated pool: alerts never take sockets from trading
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=1, keepalive_timeout=60))
+        url = f"{TELEGRAM_API}/bot{self.bot_token}/sendMessage"
+        payload = {
+            "chat_id": self.chat_id,
+            "text": text,
+            "parse_mode": "MarkdownV2",
+            "disable_web_page_preview": True
+        }
+        for attempt in range(1, 3):
+            try:
+                async with self._session.post(url, data=payload, timeout=10) as resp:
+                    if resp.status == 200:
+                        logger.info(f"Telegram sent → {self.chat_id}")
+                        return
+                    if resp.status == 429:
+                        data = await resp.json()
+                        retry = float(data.get("parameters", {}).get("retry_after", 1))
+                        logger.warning(f"Telegram 429 → retry in {retry}s")
+                        await asyncio.sleep(retry)
+                        continue
+                    txt = await resp.text()
+                    logger.error(f"Telegram failed [{resp.status}]: {txt}")
+                    return
+            except Exception as e:
+                logger.error(f"Telegram crash: {e}")
+                return
+
+    async def close(self):
+        """Flush queued alerts, then close the session."""
+        if self._task is not None and not self._task.done():
+            await self._task
+        elif not self.queue.empty():
+            await self._run()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+_notifier: TelegramNotifier | None = None
+
+def get_notifier() -> TelegramNotifier:
+    global _notifier
+    if _notifier is None:
+        _notifier = TelegramNotifier(
+            os.getenv("TELEGRAM_BOT_TOKEN", "").strip(),
+            os.getenv("TELEGRAM_CHAT_ID", "").strip(),
+            min_interval=float(os.getenv("TELEGRAM_MIN_INTERVAL_SEC", "1.0")),
+        )
+    return _notifier
+
+def notify(text: str) -> bool:
+    return get_notifier().notify(text)
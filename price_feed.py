@@ -0,0 +1,164 @@
+# /root/ux-solsniper/price_feed.py
+import asyncio
+import aiohttp
+from loguru import logger
+from jupiter_price import get_token_prices, DEXSCREENER_BATCH
+
+class PriceFeed:
+    """Shared poller for every monitored mint.
+
+    Mints are fetched together in multi-address batches and each price is
+    fanned out to the callbacks subscribed to that mint, so upstream calls
+    scale with the number of batches instead of the number of positions.
+
+    Each mint has its own next-poll time (see schedule()); a round fetches
+    only the due mints and fills the spare room of the last batch with the
+    ones due soonest, since they ride on the same request. Requests go
+    through the per-host rate budget in jupiter_price. Every fetched price
+    is also handed to the optional tick `recorder`.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, interval: float = 1.0, batch_size: int = DEXSCREENER_BATCH,
+                 recorder=None):
+        self.session = session
+        self.recorder = recorder
+        self.interval = interval
+        self.batch_size = max(1, min(batch_size, DEXSCREENER_BATCH))
+        self.subscribers: dict[str, set] = {}
+        self.prices: dict[str, float] = {}
+        self.next_poll: dict[str, float] = {}
+        self._fallback: set[str] = set()  # next_poll set by the poll loop, not by schedule()
+        self._wake = asyncio.Event()
+        self._sleep_until = 0.0
+        self._task: asyncio.Task | None = None
+        self.rounds = 0
+        self.requests = 0
+
+    # === SUBSCRIPTIONS ===
+    def subscribe(self, mint: str, callback):
+        """callback(mint, price) is called on the event loop after every successful fetch."""
+        self.subscribers.setdefault(mint, set()).add(callback)
+        self.next_poll.setdefault(mint, 0.0)  # due now
+        self._wake.set()
+        self.start()
+
+    def unsubscribe(self, mint: str, callback):
+        subs = self.subscribers.get(mint)
+        if not subs:
+            return
+        subs.discard(callback)
+        if not subs:
+            del self.subscribers[mint]
+            self.prices.pop(mint, None)
+            self.next_poll.pop(mint, None)
+            self._fallback.discard(mint)
+
+    def latest(self, mint: str) -> float | None:
+        return self.prices.get(mint)
+
+    def schedule(self, mint: str, delay: float):
+        """Poll `mint` again within `delay` seconds (the monitor's adaptive interval).
+
+        A deadline only ever moves earlier, so repeated calls can never push
+        a due poll back. The one exception is the fallback deadline the poll
+        loop sets after fetching a mint: the first schedule() after a poll
+        replaces it, which is how a quiet position gets a longer interval.
+        """
+        if mint not in self.subscribers:
+            return
+        when = asyncio.get_running_loop().time() + delay
+        if mint in self._fallback:
+            self._fallback.discard(mint)
+        else:
+            when = min(self.next_poll.get(mint, when), when)
+        self.next_poll[mint] = when
+        if when < self._sleep_until:
+            self._wake.set()  # the poll loop is sleeping until a later time
+
+    def _due(self, now: float) -> list[str]:
+        due = [m for m, t in self.next_poll.items() if t <= now]
+        room = -len(due) % self.batch_size
+        if due and room:
+            soon = sorted((t, m) for m, t in self.next_poll.items() if t > now)
+            due.extend(m for _, m in soon[:room])
+        return due
+
+    # === POLLING ===
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        if self.recorder is not None:
+            self.recorder.close()
+
+    async def poll_once(self, mints: list[str] | None = None) -> dict[str, float]:
+        mints = list(self.subscribers) if mints is None else mints
+        if not mints:
+            return {}
+        batches = [mints[i:i + self.batch_size] for i in range(0, len(mints), self.batch_size)]
+        self.rounds += 1
+        self.requests += len(batches)
+        sources: dict[str, str] = {}
+        results = await asyncio.gather(
+            *(get_token_prices(batch, self.session, sources) for batch in batches),
+            return_exceptions=True
+        )
+        prices: dict[str, float] = {}
+        for res in results:
+            if isinstance(res, Exception):
+                logger.warning(f"PriceFeed batch failed: {res}")
+                continue
+            prices.update(res)
+        for mint, price in prices.items():
+            if self.recorder is not None and price and price > 0:
+                self.recorder.record(mint, price, sources.get(mint, "unknown"))
+            self._publish(mint, price)
+        if len(prices) < len(mints):
+            logger.debug(f"PriceFeed: {len(mints) - len(prices)}/{len(mints)} mints without price")
+        return prices
+
+    def _publish(self, mint: str, price: float):
+        if not price or price <= 0:
+            return
+        self.prices[mint] = price
+        for cb in list(self.subscribers.get(mint, ())):
+            try:
+                cb(mint, price)
+            except Exception as e:
+                logger.warning(f"PriceFeed subscriber error | {mint[:6]}... | {e}")
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        logger.info(f"PRICE FEED STARTED | interval {self.interval}s | batch {self.batch_size}")
+        while self.subscribers:
+            now = loop.time()
+            due = self._due(now)
+            if due:
+                for mint in due:
+                    # Fallback cadence until the monitor reschedules the mint
+                    self.next_poll[mint] = now + self.interval
+                    self._fallback.add(mint)
+                try:
+                    await self.poll_once(due)
+                except Exception as e:
+                    logger.warning(f"PriceFeed poll error: {e}")
+                continue
+            self._wake.clear()
+            self._sleep_until = min(self.next_poll.values(), default=now + self.interval)
+            timeout = self._sleep_until - now
+            try:
+                await asyncio.wait_for(self._wake.wait(), max(0.0, timeout))
+            except asyncio.TimeoutError:
+                pass
+            self._sleep_until = 0.0
+        if self.recorder is not None:
+            self.recorder.flush()
+        logger.info("PRICE FEED IDLE (no subscribers)")
@@ -0,0 +1,93 @@
+# /root/ux-solsniper/ratelimit.py
+import asyncio
+import time
+from urllib.parse import urlsplit
+from loguru import logger
+
+class TokenBucket:
+    """`rate` requests per second with bursts of up to `burst`.
+
+    acquire() waits for a token (background polling); take() debits one
+    immediately even into debt (buy/sell path), so latency-critical calls
+    never wait but still push the pollers back under the limit.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None, clock=time.monotonic):
+        self.rate = rate
+        self.burst = max(1.0, burst if burst is not None else rate)
+        self.clock = clock
+        self.tokens = self.burst
+        self.updated = clock()
+        self.waited = 0.0
+        self.taken = 0
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, n: float = 1.0) -> float:
+        """Seconds until `n` tokens are available."""
+        self._refill()
+        return 0.0 if self.tokens >= n else (n - self.tokens) / self.rate
+
+    def take(self, n: float = 1.0):
+        self._refill()
+        self.tokens = max(-self.burst, self.tokens - n)
+        self.taken += 1
+
+    async def acquire(self, n: float = 1.0):
+        while True:
+            wait = self.delay(n)
+            if wait <= 0:
+                self.tokens -= n
+                self.taken += 1
+                return
+            self.waited += wait
+            await asyncio.sleep(wait)
+
+class RateBudget:
+    """Per-host token buckets shared by every caller in the process."""
+
+    def __init__(self):
+        self.buckets: dict[str, TokenBucket] = {}
+
+    def configure(self, limits: dict[str, float], burst_sec: float = 1.0):
+        self.buckets = {
+            host: TokenBucket(rate, burst=rate * burst_sec)
+            for host, rate in limits.items() if rate > 0
+        }
+        if self.buckets:
+            logger.info("RATE BUDGET | " + ", ".join(f"{h} {b.rate:g}/s" for h, b in self.buckets.items()))
+
+    def bucket(self, url: str) -> TokenBucket | None:
+        if not self.buckets:
+            return None
+        return self.buckets.get(urlsplit(url).hostname or "")
+
+    async def acquire(self, url: str):
+        bucket = self.bucket(url)
+        if bucket is not None:
+            await bucket.acquire()
+
+    def take(self, url: str):
+        bucket = self.bucket(url)
+        if bucket is not None:
+            bucket.take()
+
+    def stats(self) -> dict:
+        return {
+            host: {"rate": b.rate, "taken": b.taken, "waited_sec": round(b.waited, 2), "tokens": round(b.tokens, 2)}
+            for host, b in self.buckets.items()
+        }
+
+rate_budget = RateBudget()
+
+def parse_limits(spec: str) -> dict[str, float]:
+    """'api.dexscreener.com=5,lite-api.jup.ag=1' → {host: requests per second}."""
+    limits = {}
+    for item in spec.split(","):
+        host, _, rate = item.partition("=")
+        if host.strip() and rate.strip():
+            limits[host.strip().lower()] = float(rate)
+    return limits
@@ -0,0 +1,327 @@
+# /root/ux-solsniper/replay.py
+"""Replay recorded channel messages and price ticks through the bot offline.
+
+Messages go through the real ingest handler (🔥 check, CA extraction,
+dedup, signal queue), filters.passes_filters, the capital ledger, the real
+SniperBot._process_ca sizing path and MonitorEngine TP/SL logic, all on a
+simulated clock with no network. Buys and sells are filled at the recorded
+price and written through reports.py into a fresh trade store, so the run
+ends with the same trades_history.json and daily_stats.json a live run
+writes (in --out).
+
+Inputs:
+    messages  JSONL: {"date": ISO-8601 or "ts": epoch, "message": "...",
+              "entity_urls": [...], "button_urls": [[...]]}
+    prices    CSV or JSONL with ts, mint, price and optionally mcap,
+              liquidity (ts as epoch seconds or ISO-8601)
+
+    python replay.py --messages signals.jsonl --prices ticks.csv \
+        --set TAKE_PROFIT=60 --set STOP_LOSS=-15 --out replay_out
+"""
+import argparse
+import asyncio
+import bisect
+import csv
+import heapq
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+# === INPUTS ===
+def _ts(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        return (dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)).timestamp()
+
+def load_messages(path: str) -> list:
+    messages = []
+    with open(path, "r", encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            ts = _ts(rec.get("ts", rec.get("date")))
+            text = rec.get("message", "")
+            messages.append(SimpleNamespace(
+                id=rec.get("id", i),
+                message=text,
+                text=text,
+                date=datetime.fromtimestamp(ts, timezone.utc),
+                chat_id=rec.get("chat_id"),
+                entities=[SimpleNamespace(url=u) for u in rec.get("entity_urls", [])],
+                buttons=[[SimpleNamespace(url=u) for u in row] for row in rec.get("button_urls", [])],
+            ))
+    messages.sort(key=lambda m: m.date)
+    return messages
+
+def _float(value):
+    return float(value) if value not in (None, "") else None
+
+def load_prices(path: str) -> dict[str, list[tuple]]:
+    """mint → time-sorted [(ts, price, mcap, liquidity)]."""
+    series: dict[str, list[tuple]] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for row in rows:
+            price = _float(row.get("price"))
+            if not price:
+                continue
+            series.setdefault(row["mint"], []).append(
+                (_ts(row["ts"]), price, _float(row.get("mcap")), _float(row.get("liquidity")))
+            )
+    for ticks in series.values():
+        ticks.sort(key=lambda t: t[0])
+    return series
+
+# === SIMULATED MARKET ===
+class SimClock:
+    def __init__(self, start: float):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def utcnow(self) -> datetime:
+        return datetime.utcfromtimestamp(self.now)
+
+class ReplayFeed:
+    """PriceFeed stand-in: recorded ticks are pushed by the replay loop."""
+
+    def __init__(self):
+        self.subscribers: dict[str, set] = {}
+        self.active_from: dict[str, float] = {}
+
+    def subscribe(self, mint, callback):
+        self.subscribers.setdefault(mint, set()).add(callback)
+
+    def unsubscribe(self, mint, callback):
+        subs = self.subscribers.get(mint)
+        if subs:
+            subs.discard(callback)
+            if not subs:
+                del self.subscribers[mint]
+
+    def schedule(self, mint, delay):
+        pass  # ticks arrive when they were recorded
+
+    def publish(self, mint: str, price: float, now: float):
+        if now < self.active_from.get(mint, 0.0):
+            return  # still inside the MEV delay: the live monitor is not running yet
+        for cb in list(self.subscribers.get(mint, ())):
+            cb(mint, price)
+
+class Replay:
+    def __init__(self, config: dict, series: dict, clock: SimClock, latency: float,
+                 slippage_pct: float, sol_price: float, use_filters: bool):
+        self.config = config
+        self.series = series
+        self.clock = clock
+        self.latency = latency
+        self.slippage = slippage_pct / 100
+        self.sol_price = sol_price
+        self.use_filters = use_filters
+        self.tokens: dict[str, float] = {}
+        self.counts = {"messages": 0, "signals": 0, "filtered": 0, "no_price": 0, "skipped": 0, "bought": 0, "sold": 0}
+
+    def tick_at(self, mint: str, ts: float) -> tuple | None:
+        ticks = self.series.get(mint)
+        if not ticks:
+            return None
+        i = bisect.bisect_right(ticks, (ts, float("inf"))) - 1
+        return ticks[i] if i >= 0 else None
+
+    # === PATCHED UPSTREAMS ===
+    async def metadata(self, session, ca, mode=None) -> dict:
+        tick = self.tick_at(ca, self.clock.now)
+        if tick is None:
+            return {"priceUsd": None, "marketCap": None, "liquidity": None, "source": "failed"}
+        return {"priceUsd": tick[1], "marketCap": tick[2], "liquidity": tick[3], "source": "replay"}
+
+    async def buy(self, session, *, output_mint, amount, config, coin_name, market_cap, **kwargs) -> str | None:
+        from reports import record_buy
+        tick = self.tick_at(output_mint, self.clock.now)
+        if tick is None:
+            return None
+        usd_value = amount / 1e9 * self.sol_price
+        fee_usd = usd_value * (config["BUY_FEE_PERCENT"] / 100)
+        self.tokens[output_mint] = usd_value / (tick[1] * (1 + self.slippage))
+        sig = f"REPLAY_BUY_{output_mint[:8]}_{int(self.clock.now)}"
+        record_buy(output_mint, coin_name, market_cap, usd_value, usd_value - fee_usd, fee_usd, sig)
+        return sig
+
+    async def sell(self, session, token_mint, wallet, config, current_price, entry_price, token_name, is_tp, **kwargs):
+        from reports import record_sell
+        fill = current_price * (1 - self.slippage)
+        token_amount = self.tokens.pop(token_mint, 0.0)
+        profit_usd = (fill - entry_price) * token_amount
+        profit_pct = (fill / entry_price - 1) * 100
+        sig = f"REPLAY_SELL_{token_mint[:8]}_{int(self.clock.now)}"
+        record_sell(ca=token_mint, signature=sig, profit_usd=profit_usd, is_tp=is_tp,
+                    name=token_name, profit_pct=profit_pct)
+        self.counts["sold"] += 1
+        return sig
+
+async def run(args) -> dict:
+    out = Path(args.out).resolve()
+    out.mkdir(parents=True, exist_ok=True)
+    for name in ("trades.db", "trades.db-wal", "trades.db-shm", "trades_history.json",
+                 "daily_stats.json", "position_state.json"):
+        (out / name).unlink(missing_ok=True)  # fresh run: reports.py would import old JSON
+
+    # Everything below reads env at import time
+    from solders.keypair import Keypair
+    os.environ.update({
+        "TRADE_DB_FILE": str(out / "trades.db"),
+        "TRACE_FILE": "",
+        "DEDUP_FILE": "",
+        "TELEGRAM_BOT_TOKEN": "",
+        "TELEGRAM_CHAT_ID": "",
+        "PRIVATE_KEY": str(Keypair()),
+        "MEV_DELAY_SEC": "0,0",     # modelled by the replay feed instead of sleeping
+        "PREARM_BAND_PCT": "0",
+    })
+    for item in args.set:
+        key, _, value = item.partition("=")
+        os.environ[key.strip()] = value.strip()
+    os.chdir(out)
+
+    from loguru import logger
+    logger.remove()
+    logger.add(sys.stderr, level="DEBUG" if args.verbose else "WARNING")
+
+    import reports
+    import sniper
+    from config import load_config
+    from filters import passes_filters
+    from ingest import handle_message
+    from jupiter_price import sol_price_cache
+    from monitor import MonitorEngine
+    from signal_queue import SignalQueue
+    from sniper import SniperBot
+    from trade_store import get_store
+
+    config = load_config()
+    messages = load_messages(args.messages)
+    series = load_prices(args.prices)
+    if not messages:
+        raise SystemExit("no messages to replay")
+    clock = SimClock(messages[0].date.timestamp())
+    reports.set_clock(clock.utcnow)
+    reports.init_balance(config["DAILY_CAPITAL_USD"])
+
+    # SOL/USD is fixed for the run; the cache never expires on simulated time
+    sol_price_cache.configure(ttl=float("inf"), max_stale=float("inf"))
+    sol_price_cache.price, sol_price_cache.source, sol_price_cache.updated = args.sol_price, "replay", time.monotonic()
+
+    sim = Replay(config, series, clock, args.latency, args.slippage, args.sol_price, not args.no_filters)
+    sniper.get_mcap_and_price = sim.metadata
+    sniper.execute_jupiter_buy = sim.buy
+
+    bot = SniperBot(config, client=object())
+    bot.queue = SignalQueue(max_age=config["SIGNAL_MAX_AGE_SEC"], clock=clock)
+    feed = ReplayFeed()
+    bot.monitor = MonitorEngine(None, bot.wallet, config, feed, sell_fn=sim.sell, clock=clock,
+                                on_close=bot.capital.release, prepare_fn=None)
+    http = SimpleNamespace(trade=None, price=None)
+    mev = sum(args.mev_delay) / 2
+
+    # === EVENT LOOP ON SIMULATED TIME ===
+    events: list[tuple] = []
+    for i, msg in enumerate(messages):
+        events.append((msg.date.timestamp(), 0, i, "msg", msg))
+    for mint, ticks in series.items():
+        for j, tick in enumerate(ticks):
+            events.append((tick[0], 1, j, "tick", (mint, tick[1])))
+    heapq.heapify(events)
+    day = clock.utcnow().date()
+    started = time.perf_counter()
+    first_ts = events[0][0] if events else 0.0
+
+    while events:
+        ts, _, _, kind, payload = heapq.heappop(events)
+        clock.now = ts
+        if clock.utcnow().date() != day:
+            day = clock.utcnow().date()
+            bot.capital.reset_day()
+
+        if kind == "tick":
+            mint, price = payload
+            if mint in bot.monitor.positions:
+                feed.publish(mint, price, ts)
+                bot.monitor.step(now=ts)
+                await asyncio.sleep(0)  # let the started sell tasks run
+            continue
+
+        sim.counts["messages"] += 1
+        ca = await handle_message(bot, payload, received=ts)
+        if not ca:
+            continue
+        sim.counts["signals"] += 1
+        signal = bot.queue.get_nowait()
+        clock.now = ts + sim.latency  # metadata + order + execute
+        info = await sim.metadata(None, ca)
+        if info["priceUsd"] is None:
+            sim.counts["no_price"] += 1
+            continue
+        if sim.use_filters and not await passes_filters(info, config):
+            sim.counts["filtered"] += 1
+            continue
+        usd = bot.capital.reserve(signal.ca)
+        if usd <= 0:
+            sim.counts["skipped"] += 1
+            continue
+        if await bot._process_ca(signal.ca, usd, http):
+            sim.counts["bought"] += 1
+            feed.active_from[signal.ca] = clock.now + mev
+        else:
+            bot.capital.cancel(signal.ca)
+
+    await asyncio.sleep(0)
+    reports.export_json()
+    get_store().close()
+    elapsed = time.perf_counter() - started
+    span = clock.now - first_ts
+    summary = dict(sim.counts)
+    summary.update({
+        "open_positions": len(bot.monitor.positions),
+        "final_balance": reports.get_balance(),
+        "simulated_hours": round(span / 3600, 2),
+        "wall_seconds": round(elapsed, 3),
+        "speedup": round(span / elapsed, 1) if elapsed > 0 else None,
+        "out": str(out),
+    })
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline replay/backtest of recorded signals and prices")
+    parser.add_argument("--messages", required=True, help="JSONL of recorded channel messages")
+    parser.add_argument("--prices", required=True, help="CSV/JSONL of recorded price ticks")
+    parser.add_argument("--out", default="replay_out", help="directory for trades.db and the JSON exports")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="config override, e.g. --set TAKE_PROFIT=60 (repeatable)")
+    parser.add_argument("--sol-price", type=float, default=150.0, help="fixed SOL/USD for sizing")
+    parser.add_argument("--latency", type=float, default=1.5, help="seconds from post to filled buy")
+    parser.add_argument("--mev-delay", type=float, nargs=2, default=[2.5, 4.0],
+                        help="seconds before the monitor starts (midpoint is used)")
+    parser.add_argument("--slippage", type=float, default=0.0, help="percent, applied to both fills")
+    parser.add_argument("--no-filters", action="store_true", help="skip filters.passes_filters")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    args.messages = str(Path(args.messages).resolve())
+    args.prices = str(Path(args.prices).resolve())
+    summary = asyncio.run(run(args))
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 import json
 import os
-import asyncio
 from loguru import logger
-from datetime import datetime
-from utils import send_telegram_message, escape_md
+from datetime import datetime, timedelta
+from utils import escape_md
+from notifier import notify
+from trade_store import get_store
+from stats import RunningStats
 
 # === CONFIG ===
 BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "").strip()
@@ -25,82 +27,78 @@ def _save(file, data):
     with open(file, "w") as f:
         json.dump(data, f, indent=2)
 
+_migrated = False
+_utcnow = datetime.utcnow
+
+def set_clock(utcnow):
+    """Replace the wall clock behind trade and stats dates (replay.py runs on simulated time)."""
+    global _utcnow
+    _utcnow = utcnow
+
+def _store():
+    global _migrated
+    store = get_store()
+    # First open after the JSON era: carry trades and balance over
+    if not _migrated:
+        store.import_json(TRADE_FILE, STATE_FILE)
+        _migrated = True
+    return store
+
+def export_json():
+    """Write trades_history.json and daily_stats.json from the store (reports, backups)."""
+    store = _store()
+    _save(TRADE_FILE, store.export_trades())
+    _save(STATS_FILE, _load_stats())
+
 # === DAILY STATS ===
 def _load_stats():
-    return _load(STATS_FILE)
-
-def _save_stats(stats):
-    _save(STATS_FILE, stats)
-
-def _update_daily_stats(is_tp: bool, profit_usd: float):
-    stats = _load_stats()
-    today = datetime.utcnow().strftime("%Y-%m-%d")
-
-    if stats.get("date") != today:
-        stats = {
-            "date": today,
-            "buys": 0,
-            "tp_count": 0,
-            "sl_count": 0,
-            "total_profit": 0.0,
-            "wins": [],
-            "losses": []
-        }
-
-    stats["buys"] += 1
-    stats["total_profit"] = round(stats["total_profit"] + profit_usd, 2)
-
-    if is_tp:
-        stats["tp_count"] += 1
-        stats["wins"].append(profit_usd)
-    else:
-        stats["sl_count"] += 1
-        stats["losses"].append(profit_usd)
-
-    _save_stats(stats)
-    return stats
+    return _store().daily_stats(_utcnow().strftime("%Y-%m-%d")) or {}
+
+def get_period_stats(days: int = 7) -> dict[str, RunningStats]:
+    """TP ("tp") and SL ("sl") P&L stats of the last `days` days including today."""
+    today = _utcnow().date()
+    start = (today - timedelta(days=days - 1)).isoformat()
+    return _store().pnl_rollup(start, today.isoformat())
+
+def _format_report(title: str, period: str, wins: RunningStats, losses: RunningStats, buys: int | None = None) -> str:
+    closed = wins.count + losses.count
+    win_rate = (wins.count / closed * 100) if closed else 0
+    total = RunningStats().merge(wins).merge(losses)
+    lines = [f"📊**{title}** | {period}"]
+    if buys is not None:
+        lines.append(f"✅Buys: `{buys}` / {MAX_BUYS_PER_DAY}")
+    lines += [
+        f"🎖️Win Rate: **{win_rate:.1f}%** ({wins.count}W/{losses.count}L)",
+        f"💰Total P&L: **${total.total:+.2f}** (σ ${total.stdev:.2f} per trade)",
+        f"🔥Avg Win: **${wins.mean:+.2f}**",
+        f"📉Avg Loss: **${losses.mean:+.2f}**",
+        f"🎉Best Win: **{_usd(wins.max)}**",
+        f"📛Worst Loss: **{_usd(losses.min)}**",
+    ]
+    return "\n".join(lines)
+
+def _usd(value: float | None) -> str:
+    return "n/a" if value is None else f"${value:+.2f}"
 
 def _send_daily_report():
-    stats = _load_stats()
-    if not stats or stats.get("date") != datetime.utcnow().strftime("%Y-%m-%d"):
+    date = _utcnow().strftime("%Y-%m-%d")
+    store = _store()
+    stats = store.daily_stats(date)
+    if not stats:
         return
-
-    wins = len(stats["wins"])
-    total = stats["buys"]
-    win_rate = (wins / total * 100) if total > 0 else 0
-    avg_win = sum(stats["wins"]) / wins if wins > 0 else 0
-    avg_loss = sum(stats["losses"]) / len(stats["losses"]) if stats["losses"] else 0
-
-    msg = (
-        f"📊**DAILY REPORT** | {stats['date']}\n"
-        f"✅Buys: `{stats['buys']}` / {MAX_BUYS_PER_DAY}\n"
-        f"🎖️Win Rate: **{win_rate:.1f}%** ({wins}W/{stats['sl_count']}L)\n"
-        f"💰Total P&L: **${stats['total_profit']:+.2f}**\n"
-        f"🔥Avg Win: **${avg_win:+.2f}**\n"
-        f"📉Avg Loss: **${avg_loss:+.2f}**\n"
-        f"🎉Best Win: **${max(stats['wins']):+.2f}**\n"
-        f"📛Worst Loss: **${min(stats['losses']):+.2f}**"
+    msg = _format_report(
+        "DAILY REPORT", date, store.pnl_stats(date, "tp"), store.pnl_stats(date, "sl"), stats["buys"]
     )
+    notify(escape_md(msg))
 
-    asyncio.create_task(
-        send_telegram_message(escape_md(msg), BOT_TOKEN, CHAT_ID)
-    )
+def _send_weekly_report():
+    stats = get_period_stats(7)
+    msg = _format_report("WEEKLY REPORT", f"7d to {_utcnow().strftime('%Y-%m-%d')}", stats["tp"], stats["sl"])
+    notify(escape_md(msg))
 
 # === RECORD BUY ===
 def record_buy(ca, name, mcap, gross, net, fee, tx_sig=None):
-    trades = _load(TRADE_FILE)
-    trades[ca] = {
-        "buy": {
-            "name": name,
-            "mcap": mcap,
-            "gross": gross,
-            "net": net,
-            "fee": fee,
-            "time": datetime.utcnow().isoformat(),
-            "tx_sig": tx_sig
-        }
-    }
-    _save(TRADE_FILE, trades)
+    _store().insert_buy(ca, name, mcap, gross, net, fee, _utcnow().isoformat(), tx_sig)
 
     msg = (
         f"✅BUY {escape_md(name)}\n"
@@ -112,25 +110,22 @@ def record_buy(ca, name, mcap, gross, net, fee, tx_sig=None):
         short = tx_sig[:8]
         msg += f"🖋️\nTX: [{short}...](https://solscan.io/tx/{tx_sig})"
 
-    asyncio.create_task(
-        send_telegram_message(escape_md(msg), BOT_TOKEN, CHAT_ID)
-    )
+    notify(escape_md(msg))
 
 # === RECORD SELL ===
 def record_sell(ca: str, signature: str, profit_usd: float, is_tp: bool, profit_pct: float, name: str):
-    state = _load(STATE_FILE)
-    old_balance = state.get("balance", 0.0)
-    
+    store = _store()
+    old_balance = store.state.get("balance", 0.0)
+
     # UPDATE BALANCE WITH P&L
-    new_balance = round(old_balance + profit_usd, 2)
-    state["balance"] = max(new_balance, 0.0)  # never go negative
-    state["cycle"] = state.get("cycle", 0) + 1
+    new_balance = max(round(old_balance + profit_usd, 2), 0.0)  # never go negative
+    store.set_state("balance", new_balance)
+    store.set_state("cycle", store.state.get("cycle", 0) + 1)
+    store.update_sell(ca, signature, profit_usd, profit_pct, is_tp, _utcnow().isoformat())
+    store.bump_daily(_utcnow().strftime("%Y-%m-%d"), is_tp, profit_usd)
 
     order = "TAKE PROFIT" if is_tp else "STOP LOSS"
-    logger.info(f"NEW BALANCE AFTER {profit_pct:+.1f}%: ${old_balance:.2f} to ${state['balance']:.2f}")
-    
-    state.pop(ca, None)
-    _save(STATE_FILE, state)
+    logger.info(f"NEW BALANCE AFTER {profit_pct:+.1f}%: ${old_balance:.2f} to ${new_balance:.2f}")
 
     # === TELEGRAM ALERT ===
     msg = (
@@ -141,17 +136,25 @@ def record_sell(ca: str, signature: str, profit_usd: float, is_tp: bool, profit_
         f"🖋️TX: [{signature[:8]}...](https://solscan.io/tx/{signature})"
     )
 
-    asyncio.create_task(
-        send_telegram_message(escape_md(msg), BOT_TOKEN, CHAT_ID)
-    )
+    notify(escape_md(msg))
 
 # === TRACKERS ===
 def get_balance() -> float:
-    balance = _load(STATE_FILE).get("balance", 0.0)
+    balance = _store().state.get("balance", 0.0)
     logger.info(f"COMPOUND BALANCE: ${balance:.2f}")  # ← LOG EVERY CALL
     return balance
+
+def load_state() -> float:
+    """Open the store (and migrate legacy JSON) ahead of the first trade; returns the balance."""
+    return _store().state.get("balance", 0.0)
+
+def init_balance(balance: float):
+    store = _store()
+    store.set_state("balance", balance)
+    store.set_state("cycle", store.state.get("cycle", 0))
+
 def get_cycle() -> int:
-    return _load(STATE_FILE).get("cycle", 0)
+    return _store().state.get("cycle", 0)
 
 def get_daily_stats():
     return _load_stats()
@@ -3,6 +3,7 @@ import asyncio
 import aiohttp
 import base64
 import logging
+import time
 from loguru import logger
 from solders.transaction import VersionedTransaction
 from solders.keypair import Keypair
@@ -10,10 +11,14 @@ from solders.message import to_bytes_versioned
 from reports import record_sell
 from utils import sleep_with_logging
 from jupiter_price import get_token_price
-from jupiter_price import get_token_balance
+from jupiter_price import get_token_holding
+from jupiter_price import holdings_cache
+from tracing import tracer
+from endpoints import JUPITER_API
+from upstreams import upstreams
 
-ORDER_URL = "https://lite-api.jup.ag/ultra/v1/order"
-EXEC_URL = "https://lite-api.jup.ag/ultra/v1/execute"
+ORDER_URL = f"{JUPITER_API}/ultra/v1/order"
+EXEC_URL = f"{JUPITER_API}/ultra/v1/execute"
 
 async def monitor_and_sell(
     ca: str,
@@ -23,17 +28,41 @@ async def monitor_and_sell(
     wallet: Keypair,
     config: dict,
     token_name,
-    session: aiohttp.ClientSession
+    session: aiohttp.ClientSession,
+    feed=None
 ):
     tp_price = entry_price * (1 + tp_pct / 100)
     sl_price = entry_price * (1 - sl_pct / 100)
-    sold = False
-    log_counter = 0
 
     logger.info(f"MONITOR STARTED | {ca[:6]}... | Entry ${entry_price:.8f} | TP ${tp_price:.8f} | SL ${sl_price:.8f}")
 
+    # === SHARED FEED: wait for the batched poller instead of polling per position ===
+    updates = None
+    if feed is not None:
+        updates = asyncio.Queue(maxsize=1)
+
+        def _on_price(_mint, p):
+            if updates.full():
+                updates.get_nowait()  # keep only the newest price
+            updates.put_nowait(p)
+
+        feed.subscribe(ca, _on_price)
+
+    try:
+        await _monitor_loop(ca, entry_price, tp_price, sl_price, wallet, config, token_name, session, updates)
+    finally:
+        if feed is not None:
+            feed.unsubscribe(ca, _on_price)
+
+async def _monitor_loop(ca, entry_price, tp_price, sl_price, wallet, config, token_name, session, updates):
+    sold = False
+    log_counter = 0
+
     while not sold:
-        price = await get_token_price(ca, session)
+        if updates is not None:
+            price = await updates.get()
+        else:
+            price = await get_token_price(ca, session)
         if not price or price <= 0:
             logger.debug(f"Price invalid ({price}) → retry")
             await asyncio.sleep(1)
@@ -41,7 +70,7 @@ async def monitor_and_sell(
         # === POLLING LOG (NO token_amount) ===
         log_counter += 1
         if log_counter >= 1:
-            logger.info(f"POLLER | {ca[:6]}... | ${price:.8f}")
+            logger.debug(f"POLLER | {ca[:6]}... | ${price:.8f}")
             log_counter = 0
 
         # === TP HIT ===
@@ -71,34 +100,41 @@ async def monitor_and_sell(
             if sig:
                 sold = True
             break
-        await asyncio.sleep(1)
+        if updates is None:
+            await asyncio.sleep(1)
     logger.info(f"MONITOR ENDED | {ca[:6]}... | {'SOLD' if sold else 'NO BALANCE'}")
 
-async def execute_ultra_sell(
-    session: aiohttp.ClientSession,
-    token_mint: str,
-    wallet: Keypair,
-    config: dict,
-    current_price: float,
-    entry_price: float,
-    token_name: str,
-    is_tp: bool
-) -> str | None:
-    # === GET BALANCE ONCE ===
+class PreparedSell:
+    """Signed Ultra sell order for the full balance, ready for /execute."""
+    __slots__ = ("mint", "token_amount", "lamports", "signed_tx", "request_id", "created")
+
+    def __init__(self, mint: str, token_amount: float, lamports: int, signed_tx: str, request_id: str):
+        self.mint = mint
+        self.token_amount = token_amount
+        self.lamports = lamports
+        self.signed_tx = signed_tx
+        self.request_id = request_id
+        self.created = time.monotonic()
+
+    def age(self) -> float:
+        return time.monotonic() - self.created
+
+async def _sell_amount(session, token_mint: str, wallet: Keypair) -> tuple[float, int] | None:
+    """(uiAmount, raw amount) to sell, or None when there is nothing worth selling."""
     logger.debug(f"DEBUG | Fetching balance for {token_mint}")
-    token_amount, _ = await get_token_balance(wallet, token_mint, session)
+    token_amount, decimals, lamports = await get_token_holding(wallet, token_mint, session)
+    tracer.mark("sell", token_mint, "balance")
     if token_amount <= 0:
         logger.warning(f"NO BALANCE TO SELL | {token_mint[:6]}...")
         return None
 
-    lamports = int(token_amount * 1_000_000)  # assuming 6 decimals
-    if lamports < 100_000:
+    if lamports < 10 ** max(decimals - 1, 0):  # under 0.1 token
         logger.warning(f"TOO SMALL: {lamports:,} lamports → SKIP")
         return None
+    return token_amount, lamports
 
-    logger.info(f"SELL STARTED | {token_mint[:6]}... | {token_amount:,.2f} tokens ({lamports:,} lamports)")
-
-    # === BUILD ORDER ===
+async def _order_and_sign(session, token_mint: str, wallet: Keypair, config: dict,
+                          token_amount: float, lamports: int) -> PreparedSell | None:
     params = {
         "inputMint": token_mint,
         "outputMint": "So11111111111111111111111111111111111111112",
@@ -114,72 +150,137 @@ async def execute_ultra_sell(
             "referralFee": config["REFERRAL_FEE_BPS"]
         })
 
-    logger.debug(f"DEBUG | Order params: {params}")
+    logger.debug(f"DEBUG | GET {ORDER_URL} | params: {params}")
+    with upstreams.track("ultra_order") as call:
+        async with session.get(ORDER_URL, params=params, timeout=15) as r:
+            logger.debug(f"DEBUG | Order response status: {r.status}")
+            if not r.ok:
+                if r.status >= 500 or r.status == 429:
+                    call.fail()  # other 4xx are this order's problem, not the upstream's
+                text = await r.text()
+                logger.warning(f"Order failed | HTTP {r.status} | {text[:200]}")
+                return None
 
-    for attempt in range(1, 4):
+            order = await r.json()
+    tracer.mark("sell", token_mint, "order")
+    logger.debug(f"DEBUG | Order response: {order}")
+
+    if not order.get("transaction"):
+        logger.warning("No transaction in order")
+        return None
+
+    logger.debug("DEBUG | Deserializing transaction...")
+    tx = VersionedTransaction.from_bytes(base64.b64decode(order["transaction"]))
+    signed_tx_obj = VersionedTransaction.populate(
+        tx.message,
+        [wallet.sign_message(to_bytes_versioned(tx.message))]
+    )
+    signed_tx = base64.b64encode(bytes(signed_tx_obj)).decode()
+    tracer.mark("sell", token_mint, "sign")
+    logger.debug(f"DEBUG | Signed tx length: {len(signed_tx)}")
+    return PreparedSell(token_mint, token_amount, lamports, signed_tx, order.get("requestId", ""))
+
+async def _submit_sell(session, prepared: PreparedSell, current_price: float, entry_price: float,
+                       token_name: str, is_tp: bool) -> str | None:
+    token_mint = prepared.mint
+    payload = {
+        "signedTransaction": prepared.signed_tx,
+        "requestId": prepared.request_id
+    }
+    logger.debug(f"DEBUG | POST → {EXEC_URL} | requestId={payload['requestId']}")
+    with upstreams.track("ultra_execute") as call:
+        async with session.post(EXEC_URL, json=payload, timeout=20) as resp:
+            logger.debug(f"DEBUG | Execute response status: {resp.status}")
+            if not resp.ok:
+                if resp.status >= 500 or resp.status == 429:
+                    call.fail()  # other 4xx are this transaction's problem, not the upstream's
+                text = await resp.text()
+                logger.warning(f"Exec failed | HTTP {resp.status} | {text[:200]}")
+                return None
+
+            res = await resp.json()
+    tracer.mark("sell", token_mint, "execute")
+    logger.debug(f"DEBUG | Execute response: {res}")
+
+    if res.get("status", "").lower() != "success":
+        logger.warning(f"Execute failed | status: {res.get('status')} | msg: {res.get('error')}")
+        return None
+    sig = res.get("signature") or res.get("txid")
+    if not sig:
+        logger.warning("No signature in success response")
+        return None
+
+    holdings_cache.invalidate()
+    token_amount = prepared.token_amount
+    profit_usd = (current_price - entry_price) * token_amount
+    profit_pct = (current_price / entry_price - 1) * 100
+    logger.debug(f"DEBUG | Profit calc: ${profit_usd:,.2f} | {profit_pct:+.2f}%")
+    record_sell(
+        ca=token_mint,
+        signature=sig,
+        profit_usd=profit_usd,
+        is_tp=is_tp,
+        name=token_name,
+        profit_pct=profit_pct
+    )
+    tracer.mark("sell", token_mint, "record_sell")
+    logger.info(f"SELL SUCCESS | {token_mint[:6]}... | Sig: {sig[:8]}... | Profit: ${profit_usd:,.2f}")
+    return sig
+
+async def prepare_ultra_sell(
+    session: aiohttp.ClientSession,
+    token_mint: str,
+    wallet: Keypair,
+    config: dict
+) -> PreparedSell | None:
+    """Balance + /order + signature ahead of a trigger; None on any failure."""
+    try:
+        holding = await _sell_amount(session, token_mint, wallet)
+        if holding is None:
+            return None
+        return await _order_and_sign(session, token_mint, wallet, config, *holding)
+    except Exception as e:
+        logger.warning(f"PRE-ARM failed | {token_mint[:6]}... | {type(e).__name__}: {e}")
+        return None
+
+async def execute_ultra_sell(
+    session: aiohttp.ClientSession,
+    token_mint: str,
+    wallet: Keypair,
+    config: dict,
+    current_price: float,
+    entry_price: float,
+    token_name: str,
+    is_tp: bool,
+    prepared: PreparedSell | None = None
+) -> str | None:
+    # === PRE-ARMED: only /execute left on the critical path ===
+    if prepared is not None and prepared.age() < config.get("PREARM_ORDER_TTL_SEC", 20.0):
+        logger.info(f"SELL PRE-ARMED | {token_mint[:6]}... | order age {prepared.age():.1f}s")
         try:
-            logger.debug(f"DEBUG | Attempt {attempt}/3 → GET {ORDER_URL}")
-            async with session.get(ORDER_URL, params=params, timeout=15) as r:
-                logger.debug(f"DEBUG | Order response status: {r.status}")
-                if not r.ok:
-                    text = await r.text()
-                    logger.warning(f"Order failed | HTTP {r.status} | {text[:200]}")
-                    continue
-
-                order = await r.json()
-                logger.debug(f"DEBUG | Order response: {order}")
-
-                if not order.get("transaction"):
-                    logger.warning("No transaction in order")
-                    continue
-
-            logger.debug("DEBUG | Deserializing transaction...")
-            tx = VersionedTransaction.from_bytes(base64.b64decode(order["transaction"]))
-            signed_tx_obj = VersionedTransaction.populate(
-                tx.message,
-                [wallet.sign_message(to_bytes_versioned(tx.message))]
-            )
-            signed_tx = base64.b64encode(bytes(signed_tx_obj)).decode()
-            logger.debug(f"DEBUG | Signed tx length: {len(signed_tx)}")
-
-            payload = {
-                "signedTransaction": signed_tx,
-                "requestId": order.get("requestId", "")
-            }
-            logger.debug(f"DEBUG | Execute payload: requestId={payload['requestId']}")
-
-            logger.debug(f"DEBUG | POST → {EXEC_URL}")
-            async with session.post(EXEC_URL, json=payload, timeout=20) as resp:
-                logger.debug(f"DEBUG | Execute response status: {resp.status}")
-                if not resp.ok:
-                    text = await resp.text()
-                    logger.warning(f"Exec failed | HTTP {resp.status} | {text[:200]}")
-                    continue
-
-                res = await resp.json()
-                logger.debug(f"DEBUG | Execute response: {res}")
-
-            if res.get("status", "").lower() == "success":
-                sig = res.get("signature") or res.get("txid")
-                if sig:
-                    profit_usd = (current_price - entry_price) * token_amount
-                    profit_pct = (current_price / entry_price - 1) * 100
-                    logger.debug(f"DEBUG | Profit calc: ${profit_usd:,.2f} | {profit_pct:+.2f}%")
-                    record_sell(
-                        ca=token_mint,
-                        signature=sig,
-                        profit_usd=profit_usd,
-                        is_tp=is_tp,
-                        name=token_name,
-                        profit_pct=profit_pct
-                    )
-                    logger.info(f"SELL SUCCESS | {token_mint[:6]}... | Sig: {sig[:8]}... | Profit: ${profit_usd:,.2f}")
-                    return sig
-                else:
-                    logger.warning("No signature in success response")
-            else:
-                logger.warning(f"Execute failed | status: {res.get('status')} | msg: {res.get('error')}")
+            sig = await _submit_sell(session, prepared, current_price, entry_price, token_name, is_tp)
+            if sig:
+                return sig
+        except Exception as e:
+            logger.warning(f"Pre-armed execute failed: {type(e).__name__}: {e}")
+        logger.warning("Pre-armed order rejected → fresh order")
+
+    # === GET BALANCE ONCE (shared holdings snapshot) ===
+    holding = await _sell_amount(session, token_mint, wallet)
+    if holding is None:
+        return None
+    token_amount, lamports = holding
+    logger.info(f"SELL STARTED | {token_mint[:6]}... | {token_amount:,.2f} tokens ({lamports:,} lamports)")
 
+    for attempt in range(1, 4):
+        try:
+            logger.debug(f"DEBUG | Attempt {attempt}/3")
+            fresh = await _order_and_sign(session, token_mint, wallet, config, token_amount, lamports)
+            if fresh is None:
+                continue
+            sig = await _submit_sell(session, fresh, current_price, entry_price, token_name, is_tp)
+            if sig:
+                return sig
         except Exception as e:
             logger.warning(f"Sell attempt {attempt}/3 failed: {type(e).__name__}: {e}")
             await asyncio.sleep(attempt * 0.5)
@@ -0,0 +1,124 @@
+# /root/ux-solsniper/signal_queue.py
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Callable, NamedTuple
+from loguru import logger
+
+class Signal(NamedTuple):
+    ca: str
+    msg_time: float       # channel post time (epoch seconds)
+    channel: int | str | None
+    priority: int         # higher is served first
+    enqueued: float
+
+class SignalQueue:
+    """Buy queue that serves the best signal first and never a stale one.
+
+    Entries are ordered by priority, then by message time (newest first:
+    the freshest call still has the best entry price). Anything older than
+    `max_age` seconds at dequeue time is expired instead of bought; when
+    `maxsize` is reached the worst entry is dropped to make room. Counters
+    are kept for monitoring, see stats().
+    """
+
+    def __init__(self, max_age: float = 30.0, maxsize: int = 0,
+                 on_drop: Callable[[Signal, str], None] | None = None, clock=time.time):
+        self.max_age = max_age
+        self.maxsize = maxsize
+        self.on_drop = on_drop
+        self.clock = clock
+        self._heap: list[tuple[int, float, int, Signal]] = []
+        self._seq = itertools.count()
+        self._ready = asyncio.Event()
+        self.enqueued = 0
+        self.served = 0
+        self.expired = 0
+        self.dropped = 0
+
+    def qsize(self) -> int:
+        return len(self._heap)
+
+    def empty(self) -> bool:
+        return not self._heap
+
+    # === PUT ===
+    def put_nowait(self, ca: str, msg_time: float | None = None, channel=None, priority: int = 0) -> bool:
+        now = self.clock()
+        signal = Signal(ca, now if msg_time is None else msg_time, channel, priority, now)
+        if now - signal.msg_time > self.max_age:
+            self._discard(signal, "expired")
+            return False
+        if self.maxsize and len(self._heap) >= self.maxsize:
+            worst = max(self._heap)
+            if (-priority, -signal.msg_time) >= worst[:2]:
+                self._discard(signal, "dropped")
+                return False
+            self._heap.remove(worst)
+            heapq.heapify(self._heap)
+            self._discard(worst[3], "dropped")
+        heapq.heappush(self._heap, (-priority, -signal.msg_time, next(self._seq), signal))
+        self.enqueued += 1
+        self._ready.set()
+        return True
+
+    async def put(self, ca: str, msg_time: float | None = None, channel=None, priority: int = 0) -> bool:
+        return self.put_nowait(ca, msg_time, channel, priority)
+
+    # === GET ===
+    def get_nowait(self) -> Signal:
+        """Best fresh signal; expired ones are discarded on the way."""
+        now = self.clock()
+        while self._heap:
+            signal = heapq.heappop(self._heap)[3]
+            if now - signal.msg_time > self.max_age:
+                self._discard(signal, "expired")
+                continue
+            self.served += 1
+            if not self._heap:
+                self._ready.clear()
+            return signal
+        self._ready.clear()
+        raise asyncio.QueueEmpty
+
+    async def get(self) -> Signal:
+        while True:
+            await self._ready.wait()
+            try:
+                return self.get_nowait()
+            except asyncio.QueueEmpty:
+                continue
+
+    def purge(self) -> int:
+        """Expire stale entries now instead of at the next get()."""
+        now = self.clock()
+        stale = [e for e in self._heap if now - e[3].msg_time > self.max_age]
+        if stale:
+            self._heap = [e for e in self._heap if now - e[3].msg_time <= self.max_age]
+            heapq.heapify(self._heap)
+            for entry in stale:
+                self._discard(entry[3], "expired")
+            if not self._heap:
+                self._ready.clear()
+        return len(stale)
+
+    def _discard(self, signal: Signal, reason: str):
+        if reason == "expired":
+            self.expired += 1
+        else:
+            self.dropped += 1
+        logger.info(f"SIGNAL {reason.upper()}: {signal.ca} | age {self.clock() - signal.msg_time:.1f}s")
+        if self.on_drop is not None:
+            self.on_drop(signal, reason)
+
+    def stats(self) -> dict:
+        oldest = min((e[3].msg_time for e in self._heap), default=None)
+        return {
+            "depth": len(self._heap),
+            "oldest_age": None if oldest is None else round(self.clock() - oldest, 1),
+            "enqueued": self.enqueued,
+            "served": self.served,
+            "expired": self.expired,
+            "dropped": self.dropped,
+        }
@@ -1,88 +1,89 @@
 # /root/ux-solsniper/sniper.py
-import logging
 import asyncio
-import aiohttp
 import random
-import os
-import re
 from loguru import logger
-from telethon import TelegramClient
-from telethon.sessions import StringSession
-from config import load_config
+from ca_extractor import extract_ca, is_valid_mint
 from buy import execute_jupiter_buy
-from sell import monitor_and_sell
+from buy import fetch_buy_order
+from price_feed import PriceFeed
+from monitor import MonitorEngine
+from capital import CapitalLedger
+from dedup import DedupIndex
+from http_pool import HttpPool
+from ratelimit import rate_budget
+from upstreams import upstreams
+from signal_queue import SignalQueue
+from filters import FilterEngine
+from tracing import tracer
+from ingest import channel_stats
+from tick_recorder import TickRecorder
+from tg_client import build_client
+from startup import startup
 from jupiter_price import get_mcap_and_price
-from jupiter_price import get_sol_price_usd
-from jupiter_price import get_token_balance
-from reports import get_balance
+from jupiter_price import sol_price_cache
+from jupiter_price import metadata_lookup
+from jupiter_price import holdings_cache
 from reports import record_buy
-from utils import sleep_with_logging
-from utils import compute_amount_from_usd
+from reports import load_state
+from utils import compute_buy_size
 from solders.keypair import Keypair
 from datetime import datetime, time, timedelta
 
-logger = logging.getLogger(__name__)
-
 class SniperBot:
-    def __init__(self, config):
+    def __init__(self, config, client=None):
         self.config = config
         self.wallet = Keypair.from_base58_string(config["PRIVATE_KEY"])
-        self.queue = asyncio.Queue()
-        self.daily_buys = 0
+        self.queue = SignalQueue(
+            max_age=config["SIGNAL_MAX_AGE_SEC"],
+            maxsize=config["SIGNAL_QUEUE_MAX"],
+            on_drop=lambda signal, reason: tracer.finish("buy", signal.ca, reason)
+        )
+        self.capital = CapitalLedger(config)
         self.cycle = 0
-        self.processed_cas = set()
+        self.processed_cas = DedupIndex.load(
+            config["DEDUP_FILE"],
+            recent_max=config["DEDUP_RECENT_MAX"],
+            window=config["DEDUP_WINDOW_HOURS"] * 3600
+        )
         self.next_reset = None
-
-        session_file = "/root/ux-solsniper/session_string.txt"
-        if not os.path.exists(session_file):
-            raise FileNotFoundError("session_string.txt not found!")
-        with open(session_file, "r") as f:
-            session_str = f.read().strip()
-
-        self.client = TelegramClient(
-            StringSession(session_str),
-            int(config["TELEGRAM_API_ID"]),
-            config["TELEGRAM_API_HASH"]
+        self.price_feed = None
+        self.filters = FilterEngine(
+            config,
+            is_held=lambda ca: self.monitor is not None and ca in self.monitor.positions,
+            lookup=lambda session, ca: get_mcap_and_price(session, ca)
         )
+        self.monitor = None
+        self.channels = {spec.chat_id: spec for spec in config["CHANNELS"]}
+        self.ready = asyncio.Event()  # set once the worker is warmed up and buying
+        self.client = client if client is not None else build_client(config)
 
     def _is_valid_solana_ca(self, ca: str) -> bool:
-        return len(ca) == 44 and bool(re.match(r'^[1-9A-HJ-NP-Za-km-z]{44}$', ca))
+        return is_valid_mint(ca)
 
     def extract_ca(self, message) -> str | None:
-        text = getattr(message, "text", "") or message.message or ""
-        full_text = text
-        if message.entities:
-            for entity in message.entities:
-                if hasattr(entity, "url"):
-                    full_text += " " + (entity.url or "")
-
-        full_text = re.sub(r'[\u200B-\u200D\uFEFF\r\n\t]', ' ', full_text)
-        full_text = re.sub(r'\s+', ' ', full_text).strip()
-
-        if "CA:" in full_text.upper():
-            match = re.search(r'CA:\s*([1-9A-HJ-NP-Za-km-z]{44})\b', full_text, re.IGNORECASE)
-            if match and self._is_valid_solana_ca(match.group(1)):
-                return match.group(1)
-
-        if full_text.lower().startswith("fire"):
-            rest = full_text[5:].strip()
-            match = re.match(r'^([1-9A-HJ-NP-Za-km-z]{44})\b', rest)
-            if match and self._is_valid_solana_ca(match.group(1)):
-                return match.group(1)
-
-        for ca in re.findall(r'\b([1-9A-HJ-NP-Za-km-z]{44})\b', full_text):
-            if self._is_valid_solana_ca(ca):
-                return ca
-        return None
+        return extract_ca(message)
 
     async def start(self):
         logger.info("UX-SolSniper Bot STARTED")
         await self.client.start()
         logger.info("Connected to Telegram")
         self._schedule_next_reset()
-        asyncio.create_task(self.worker())
+        await self.start_worker()
         await self.client.run_until_disconnected()
 
+    async def start_worker(self) -> asyncio.Task:
+        """Start worker() and wait until it is buying; its exception if it dies before that."""
+        task = asyncio.create_task(self.worker())
+        ready = asyncio.create_task(self.ready.wait())
+        try:
+            await asyncio.wait({task, ready}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            ready.cancel()
+        if task.done():
+            task.result()  # raises the worker's exception
+            raise RuntimeError("worker exited before it was ready")
+        return task
+
     def _schedule_next_reset(self):
         now = datetime.now()
         midnight = datetime.combine(now.date() + timedelta(days=1), time(0, 0))
@@ -90,83 +91,245 @@ class SniperBot:
         logger.info(f"Daily reset at {midnight.strftime('%Y-%m-%d 00:00')}")
 
     async def worker(self):
-        async with aiohttp.ClientSession() as session:
-            while True:
-                # DAILY LIMIT LOGIC
-                if self.daily_buys >= self.config["MAX_BUYS_PER_DAY"]:
-                    now = datetime.now()
-                    if now >= self.next_reset:
-                        self.daily_buys = 0
-                        self._schedule_next_reset()
-                        logger.info("Daily limit RESET")
-                    else:
-                        wait = (self.next_reset - now).total_seconds()
-                        logger.info(f"Daily limit hit. Sleeping {wait/3600:.1f}h")
-                        await asyncio.sleep(wait)
-                        continue
-
-                ca = await self.queue.get()
-                logger.info(f"Processing CA: {ca}")
-
-                info = await get_mcap_and_price(session, ca)
-                if not info:
-                    logger.warning(f"No price/mcap for {ca}")
-                    continue
-
-                amount = await compute_amount_from_usd(session, self.config, ca)
-                if amount <= 0:
-                    continue
-
-                # EXECUTE BUY
-                sig = await execute_jupiter_buy(
-                    session=session,
-                    input_mint="So11111111111111111111111111111111111111112",
-                    output_mint=ca,
-                    amount=amount,
-                    wallet=self.wallet,
-                    config=self.config,
-                    coin_name=f"TKN_{ca[-6:]}",
-                    market_cap=info["marketCap"]
-                )
+        async with HttpPool(
+            trade_per_host=self.config["HTTP_TRADE_CONN_PER_HOST"],
+            price_per_host=self.config["HTTP_PRICE_CONN_PER_HOST"],
+            dns_ttl=self.config["HTTP_DNS_TTL_SEC"],
+            keepalive_timeout=self.config["HTTP_KEEPALIVE_SEC"],
+            keepalive_interval=self.config["HTTP_WARM_INTERVAL_SEC"],
+            warm_conns=self.config["HTTP_WARM_CONNS"]
+        ) as http:
+            sol_price_cache.configure(
+                ttl=self.config["SOL_PRICE_TTL_SEC"],
+                max_stale=self.config["SOL_PRICE_MAX_STALE_SEC"]
+            )
+            sol_price_cache.start(http.price)
+            # DNS + TLS to every upstream, the first SOL price and the trade store, all at once
+            results = await asyncio.gather(
+                startup.timed("http_warm", http.warm()),
+                startup.timed("sol_price", sol_price_cache.refresh(http.price)),
+                startup.timed("state", asyncio.to_thread(load_state)),
+                return_exceptions=True
+            )
+            for res in results:
+                if isinstance(res, Exception):
+                    logger.warning(f"Startup step failed: {res}")
+            http.start()
+            metadata_lookup.configure(
+                mode=self.config["METADATA_LOOKUP_MODE"],
+                hedge_delay=self.config["METADATA_HEDGE_DELAY_MS"] / 1000
+            )
+            holdings_cache.configure(interval=self.config["HOLDINGS_REFRESH_SEC"])
+            rate_budget.configure(self.config["RATE_LIMITS"])
+            upstreams.configure(
+                cooldown=self.config["UPSTREAM_COOLDOWN_SEC"],
+                max_error_rate=self.config["UPSTREAM_MAX_ERROR_RATE"]
+            )
+            asyncio.create_task(self._report_upstreams())
+            asyncio.create_task(self.processed_cas.autosave())
+            self.price_feed = PriceFeed(
+                http.price,
+                interval=self.config["MONITOR_POLL_SEC"],
+                batch_size=self.config["PRICE_BATCH_SIZE"],
+                recorder=TickRecorder(self.config["TICK_DIR"]) if self.config["TICK_DIR"] else None
+            )
+            self.monitor = MonitorEngine(
+                http.trade, self.wallet, self.config, self.price_feed,
+                on_close=self.capital.release
+            )
+            self.monitor.start()
+            self.ready.set()
 
-                if not sig:
-                    logger.error(f"BUY FAILED: {ca}")
-                    continue
+            # === BUY WORKER POOL ===
+            workers = [
+                asyncio.create_task(self._buy_worker(slot, http))
+                for slot in range(self.config["BUY_CONCURRENCY"])
+            ]
+            logger.info(f"BUY WORKERS STARTED | concurrency {len(workers)}")
+            await asyncio.gather(*workers)
 
-                logger.info(f"BOUGHT {sig[:8]}... → STARTING MONITOR")
+    async def _report_upstreams(self):
+        """Periodic breaker/latency snapshot; state changes are logged as they happen."""
+        while True:
+            await asyncio.sleep(self.config["UPSTREAM_REPORT_SEC"])
+            parts = [
+                f"{name} {h['state']} err {h['error_rate']:.0%} p50 {h['p50_ms']}ms"
+                for name, h in upstreams.snapshot().items()
+            ]
+            if parts:
+                logger.info("UPSTREAMS | " + " | ".join(parts))
+            stats = self.filters.stats()
+            meta = stats.pop("metadata")
+            rejects = [f"{name} {c['rejected']}/{c['checked']}" for name, c in stats.items() if c["checked"]]
+            logger.info(
+                f"FILTERS | {' | '.join(rejects) or 'no checks yet'} | "
+                f"lookups {meta['lookups']} (cache hits {meta['cache_hits']})"
+            )
+            if channel_stats:
+                logger.info("CHANNELS | " + " | ".join(
+                    f"{name} {c['signals']} first / {c['duplicates']} dup / {c['posts']} posts"
+                    for name, c in channel_stats.items()
+                ))
 
-                # MEV DELAY
-                await asyncio.sleep(random.uniform(2.5, 4.0))
+    async def _wait_for_daily_reset(self) -> bool:
+        """True when the daily limit blocks new buys (after sleeping until reset)."""
+        if self.next_reset is None:
+            self._schedule_next_reset()
+        now = datetime.now()
+        if now >= self.next_reset:
+            self.capital.reset_day()
+            self._schedule_next_reset()
+            logger.info("Daily limit RESET")
+            return False
+        if not self.capital.limit_reached():
+            return False
+        if self.capital.daily_buys < self.capital.max_buys:
+            # Only in-flight buys fill the limit; one of them may still fail
+            await asyncio.sleep(0.5)
+            return True
+        wait = (self.next_reset - now).total_seconds()
+        logger.info(f"Daily limit hit. Sleeping {wait/3600:.1f}h")
+        await asyncio.sleep(wait)
+        return True
 
-                entry_price = info["priceUsd"]
-                sol_spent = amount / 1e9
+    async def _buy_worker(self, slot: int, http: HttpPool):
+        while True:
+            # DAILY LIMIT LOGIC
+            if await self._wait_for_daily_reset():
+                continue
 
-                # RECORD BUY
-                record_buy(
-                    ca=ca,
-                    name=f"TKN_{ca[-6:]}",
-                    mcap=info["marketCap"],
-                    gross=sol_spent,
-                    net=sol_spent * (1 - self.config["BUY_FEE_PERCENT"] / 100),
-                    fee=sol_spent * (self.config["BUY_FEE_PERCENT"] / 100),
-                    tx_sig=sig
-                )
+            signal = await self.queue.get()
+            ca = signal.ca
+            tracer.mark("buy", ca, "dequeue")
+            stats = self.queue.stats()
+            logger.info(
+                f"Processing CA: {ca} | worker {slot} | age {datetime.now().timestamp() - signal.msg_time:.1f}s | "
+                f"queue {stats['depth']} (expired {stats['expired']}, dropped {stats['dropped']})"
+            )
+
+            # Pipelined: only the local rules here, metadata rules overlap the /order request
+            pipelined = self.config["BUY_PIPELINE"]
+            try:
+                if pipelined:
+                    rejected, info = self.filters.evaluate_local(ca), None
+                else:
+                    rejected, info = await self.filters.evaluate(ca, http.price)
+            except Exception as e:
+                logger.error(f"WORKER {slot} filter error on {ca}: {e}")
+                rejected, info = "error", None
+            if rejected:
+                tracer.finish("buy", ca, "filtered")
+                continue
+            if info is not None:
+                tracer.mark("buy", ca, "metadata")
+
+            usd = self.capital.reserve(ca)
+            if usd <= 0:
+                logger.info(f"SKIPPED (no capital/limit): {ca}")
+                tracer.finish("buy", ca, "skipped")
+                continue
+            try:
+                bought = await self._process_ca(ca, usd, http, info, check=pipelined)
+            except Exception as e:
+                logger.error(f"WORKER {slot} CRASH on {ca}: {e}")
+                bought = False
+            if not bought:
+                self.capital.cancel(ca)
+            tracer.finish("buy", ca, "ok" if bought else "failed")  # no-op once finished as "filtered"
+
+    async def _process_ca(self, ca: str, usd: float, http: HttpPool, info: dict | None = None,
+                          check: bool = False) -> bool:
+        """Size and buy one CA.
 
-                # START TP/SL MONITOR (INSTANT)
-                asyncio.create_task(
-                    monitor_and_sell(
-                        ca=ca,
-                        entry_price=entry_price,
-                        tp_pct=self.config["TAKE_PROFIT"],
-                        sl_pct=abs(float(self.config["STOP_LOSS"])),
-                        wallet=self.wallet,
-                        token_name=f"TKN_{ca[-6:]}",
-                        config=self.config,
-                        session=session
-                    )
+        check=True runs the metadata filters here while the Ultra /order for
+        the sized amount is already in flight; a rejection discards the
+        order, a pass executes it as is. Otherwise `info` is the metadata the
+        caller already has, or it is looked up first.
+        """
+        amount, sol_price = await compute_buy_size(http.price, self.config, usd_amount=usd)
+        tracer.mark("buy", ca, "sizing")
+        if amount <= 0:
+            return False
+
+        prepared = None
+        if check or info is None:
+            order_task = None
+            if check and not self.config["DRY_RUN"] and upstreams.allow("ultra_order"):
+                order_task = asyncio.create_task(
+                    fetch_buy_order(http.trade, ca, amount, self.wallet, self.config)
                 )
+            try:
+                rejected = None
+                if check:
+                    rejected, info = await self.filters.evaluate_metadata(ca, http.price)
+                if info is None:
+                    info = await get_mcap_and_price(http.price, ca)
+                tracer.mark("buy", ca, "metadata")
+                if rejected:
+                    tracer.finish("buy", ca, "filtered")
+                    return False
+                if order_task is not None and info.get("priceUsd"):
+                    try:
+                        prepared = await order_task
+                    except Exception as e:
+                        logger.info(f"Pipelined /order failed ({e}) → fresh order")
+            finally:
+                if order_task is not None and not order_task.done():
+                    order_task.cancel()  # filtered out: the order is never executed
+
+        if not info or not info.get("priceUsd"):
+            logger.warning(f"No price/mcap for {ca}")
+            return False
+
+        # EXECUTE BUY
+        sig = await execute_jupiter_buy(
+            session=http.trade,
+            input_mint="So11111111111111111111111111111111111111112",
+            output_mint=ca,
+            amount=amount,
+            usd_amount=usd,
+            wallet=self.wallet,
+            config=self.config,
+            coin_name=f"TKN_{ca[-6:]}",
+            market_cap=info["marketCap"],
+            sol_price=sol_price,
+            prepared=prepared
+        )
+
+        if not sig:
+            logger.error(f"BUY FAILED: {ca}")
+            return False
+
+        # COUNT SUCCESS (before the delay so the daily limit sees it immediately)
+        self.capital.confirm(ca)
+        self.cycle += 1
+        logger.info(f"BOUGHT {sig[:8]}... → STARTING MONITOR")
+
+        # MEV DELAY
+        await asyncio.sleep(random.uniform(*self.config["MEV_DELAY_SEC"]))
+
+        entry_price = info["priceUsd"]
+        sol_spent = amount / 1e9
+
+        # RECORD BUY
+        record_buy(
+            ca=ca,
+            name=f"TKN_{ca[-6:]}",
+            mcap=info["marketCap"],
+            gross=sol_spent,
+            net=sol_spent * (1 - self.config["BUY_FEE_PERCENT"] / 100),
+            fee=sol_spent * (self.config["BUY_FEE_PERCENT"] / 100),
+            tx_sig=sig
+        )
+
+        # START TP/SL MONITOR (INSTANT)
+        self.monitor.add(
+            ca=ca,
+            entry_price=entry_price,
+            token_name=f"TKN_{ca[-6:]}",
+            tp_pct=self.config["TAKE_PROFIT"],
+            sl_pct=abs(float(self.config["STOP_LOSS"]))
+        )
 
-                # COUNT SUCCESS
-                self.daily_buys += 1
-                self.cycle += 1
-                logger.info(f"SUCCESS | CA: {ca} | Buys today: {self.daily_buys} | Cycle: {self.cycle}")
+        logger.info(f"SUCCESS | CA: {ca} | Buys today: {self.capital.daily_buys} | Cycle: {self.cycle}")
+        return True
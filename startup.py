@@ -0,0 +1,36 @@
+# /root/ux-solsniper/startup.py
+import time
+from contextlib import contextmanager
+from loguru import logger
+
+class StartupTimer:
+    """Durations of the startup stages, reported once the bot is back in the channel.
+
+    Stages may overlap (login, imports and warm-up run concurrently), so the
+    total is wall time since process start, not the sum of the stages.
+    """
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.stages: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = time.perf_counter() - started
+
+    async def timed(self, name: str, awaitable):
+        with self.stage(name):
+            return await awaitable
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.t0
+
+    def report(self, label: str = "READY"):
+        parts = " | ".join(f"{name} {sec * 1000:.0f}ms" for name, sec in self.stages.items())
+        logger.info(f"STARTUP {label} in {self.elapsed():.2f}s | {parts}")
+
+startup = StartupTimer()
@@ -0,0 +1,92 @@
+# /root/ux-solsniper/stats.py
+import math
+from bisect import bisect_left
+
+# Upper edges (USD) of the P&L histogram buckets; the last bucket is open-ended
+PNL_EDGES = (-50.0, -20.0, -10.0, -5.0, -2.0, -1.0, 0.0, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0)
+
+class RunningStats:
+    """Constant-size streaming statistics of a series of P&L values.
+
+    count/sum/min/max, Welford mean and variance, and a fixed-bucket
+    histogram (bucket i counts values <= PNL_EDGES[i], the last one the
+    rest). Two instances merge exactly (Chan et al.), which is how daily
+    stats roll up into weeks without re-reading trades.
+    """
+    __slots__ = ("count", "total", "min", "max", "mean", "m2", "hist")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.hist = [0] * (len(PNL_EDGES) + 1)
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.hist[_bucket(value)] += 1
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Fold `other` into self and return self."""
+        if not other.count:
+            return self
+        if not self.count:
+            self.count, self.total, self.min, self.max = other.count, other.total, other.min, other.max
+            self.mean, self.m2, self.hist = other.mean, other.m2, list(other.hist)
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.hist = [a + b for a, b in zip(self.hist, other.hist)]
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 below two values)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    # === PERSISTENCE ===
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count, "sum": round(self.total, 6), "min": self.min, "max": self.max,
+            "mean": self.mean, "m2": self.m2, "hist": self.hist,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunningStats":
+        stats = cls()
+        stats.count = int(data.get("count", 0))
+        stats.total = float(data.get("sum", 0.0))
+        stats.min = data.get("min")
+        stats.max = data.get("max")
+        stats.mean = float(data.get("mean", 0.0))
+        stats.m2 = float(data.get("m2", 0.0))
+        hist = data.get("hist") or []
+        if len(hist) == len(stats.hist):
+            stats.hist = [int(n) for n in hist]
+        return stats
+
+def _bucket(value: float) -> int:
+    return bisect_left(PNL_EDGES, value)
+
+def histogram_labels() -> list[str]:
+    labels = [f"≤{PNL_EDGES[0]:+g}"]
+    labels += [f"{lo:+g}..{hi:+g}" for lo, hi in zip(PNL_EDGES, PNL_EDGES[1:])]
+    return labels + [f">{PNL_EDGES[-1]:+g}"]
@@ -0,0 +1,203 @@
+# /root/ux-solsniper/sweep.py
+"""Vectorised TP/SL/fee/slippage sweep over recorded price paths.
+
+Each path is one position: its tick times and prices from entry onwards (the
+first tick is the entry). For every path the first TP and first SL crossing
+are found for all grid levels at once (running max/min + searchsorted), then
+every grid point's balance is advanced with the live bookkeeping (`ledger`,
+the default):
+
+  * entries in time order; exits that happened by an entry are booked first
+  * stake = min(balance / max_open, balance - stakes still open), as
+    CapitalLedger.reserve; no free slot or a stake <= $0.01 skips the path
+  * tokens = stake * (1 - fee) / (entry * (1 + slippage))
+  * profit = (exit - entry) * tokens - fee * exit * tokens, and on exit
+    balance = max(round(balance + profit, 2), 0), as reports.record_sell
+
+with fee the per-fill fee (BUY_FEE_PERCENT / SELL_FEE_PERCENT) and slippage
+paid on the buy fill. Paths that never cross either level keep their slot
+and stake to the end, like a live position that is still being monitored.
+Exits landing between the same two entries are booked in slot order, which
+only moves rounding by cents. A balance that hits 0 stays there (the live
+ledger would fall back to DAILY_CAPITAL_USD).
+
+`--model compound` is the older, simpler model: the whole balance on one
+position at a time in entry order, growth (1 - fee) * r * (1 - slippage) /
+(1 + slippage) - 1 at exit ratio r, fee being round-trip. It ignores
+overlapping positions, so it does not rank parameters on P&L the bot can make.
+
+    python sweep.py --ticks ticks/ --tp 5:200:100 --sl 5:60:100 \
+        --fee 1 --slippage 0,1,2 --max-open 1 --top 15 --csv grid.csv
+"""
+import argparse
+import time
+import numpy as np
+
+# === INPUTS ===
+def load_paths(path: str) -> list[tuple[np.ndarray, np.ndarray]]:
+    """(tick times, prices) per mint from a replay-style CSV/JSONL tick file, in entry order."""
+    from replay import load_prices
+    paths = [
+        (np.fromiter((t[0] for t in ticks), dtype=np.float64, count=len(ticks)),
+         np.fromiter((t[1] for t in ticks), dtype=np.float64, count=len(ticks)))
+        for ticks in load_prices(path).values() if ticks
+    ]
+    paths.sort(key=lambda p: p[0][0])
+    return paths
+
+def parse_levels(spec: str) -> np.ndarray:
+    """'5:200:100' → linspace(5, 200, 100); '1,2,5' → list; values in percent."""
+    if ":" in spec:
+        start, stop, num = spec.split(":")
+        return np.linspace(float(start), float(stop), int(num))
+    return np.array([float(x) for x in spec.split(",") if x.strip()])
+
+# === SWEEP ===
+def first_crossings(ratios: np.ndarray, tp: np.ndarray, sl: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Index of the first tick at/above each TP level and at/below each SL level (len(ratios) if never)."""
+    running_max = np.maximum.accumulate(ratios)
+    running_min = np.minimum.accumulate(ratios)
+    tp_idx = np.searchsorted(running_max, 1 + tp / 100, side="left")
+    # -running_min is non-decreasing: first index where min <= 1 - sl
+    sl_idx = np.searchsorted(-running_min, -(1 - sl / 100), side="left")
+    return tp_idx, sl_idx
+
+def exits(ratios: np.ndarray, tp: np.ndarray, sl: np.ndarray):
+    """(TP first, SL first, exit index, exit ratio) over the TP×SL plane for one path."""
+    n = len(ratios)
+    tp_idx, sl_idx = first_crossings(ratios, tp, sl)
+    tp_first = (tp_idx[:, None] <= sl_idx[None, :]) & (tp_idx[:, None] < n)
+    sl_first = (sl_idx[None, :] < tp_idx[:, None]) & (sl_idx[None, :] < n)
+    idx = np.where(tp_first, tp_idx[:, None], np.where(sl_first, sl_idx[None, :], n - 1))
+    return tp_first, sl_first, idx, ratios[idx]
+
+def sweep(paths, tp: np.ndarray, sl: np.ndarray, fee: np.ndarray, slippage: np.ndarray,
+          start_balance: float, max_open: int = 1) -> dict[str, np.ndarray]:
+    """Final balance and TP/SL/open/skipped counts for every (tp, sl, fee, slippage) grid point (ledger model)."""
+    shape = (len(tp), len(sl), len(fee), len(slippage))
+    keep = (1 - fee / 100)[None, None, :, None]
+    # Tokens bought per USD staked, relative to 1 / entry price
+    per_usd = (keep / (1 + slippage / 100)[None, None, None, :])
+    balance = np.full(shape, float(start_balance))
+    counts = {k: np.zeros(shape, dtype=np.int32) for k in ("tp_hits", "sl_hits", "skipped")}
+    # One slot per position the ledger allows open at once
+    busy = np.zeros((max_open,) + shape, dtype=bool)
+    exit_at = np.full((max_open,) + shape, np.inf)
+    stake = np.zeros((max_open,) + shape)
+    profit = np.zeros((max_open,) + shape)
+    is_tp = np.zeros((max_open,) + shape, dtype=bool)
+
+    def book(until: float):
+        nonlocal balance
+        for s in range(max_open):
+            due = busy[s] & (exit_at[s] <= until)
+            if due.any():
+                balance = np.where(due, np.maximum(np.round(balance + profit[s], 2), 0.0), balance)
+                counts["tp_hits"] += due & is_tp[s]
+                counts["sl_hits"] += due & ~is_tp[s]
+                busy[s] &= ~due
+
+    for times, prices in paths:
+        book(times[0])
+        tp_first, sl_first, idx, ratio = exits(prices / prices[0], tp, sl)
+        closed = (tp_first | sl_first)[:, :, None, None]
+        when = np.where(closed, times[idx][:, :, None, None], np.inf)
+        # profit = (exit - entry) * tokens - fee * exit * tokens
+        gain = per_usd * (ratio[:, :, None, None] * keep - 1)
+        amount = np.minimum(balance / max_open, balance - (stake * busy).sum(axis=0))
+        free = ~busy
+        slot = free.argmax(axis=0)
+        take = free.any(axis=0) & (amount > 0.01)
+        counts["skipped"] += ~take
+        for s in range(max_open):
+            sel = take & (slot == s)
+            busy[s] |= sel
+            exit_at[s] = np.where(sel, when, exit_at[s])
+            stake[s] = np.where(sel, amount, stake[s])
+            profit[s] = np.where(sel, amount * gain, profit[s])
+            is_tp[s] = np.where(sel, tp_first[:, :, None, None], is_tp[s])
+    book(np.finfo(np.float64).max)  # every exit that happened; never-crossing paths stay open
+
+    counts["open"] = busy.sum(axis=0, dtype=np.int32)
+    return {"balance": balance, **counts}
+
+def sweep_compound(paths, tp: np.ndarray, sl: np.ndarray, fee: np.ndarray, slippage: np.ndarray,
+                   start_balance: float) -> dict[str, np.ndarray]:
+    """Same result layout as sweep(), with the whole-balance compound model (see module docstring)."""
+    shape = (len(tp), len(sl), len(fee), len(slippage))
+    # Fill multiplier per (fee, slippage), broadcast over the TP×SL plane
+    mult = ((1 - fee / 100)[:, None] * (1 - slippage / 100)[None, :] / (1 + slippage / 100)[None, :])[None, None]
+    balance = np.full(shape, float(start_balance))
+    tp_hits = np.zeros(shape[:2], dtype=np.int32)
+    sl_hits = np.zeros(shape[:2], dtype=np.int32)
+
+    for _, prices in paths:
+        tp_first, sl_first, _, exit_ratio = exits(prices / prices[0], tp, sl)
+        if not (tp_first.any() or sl_first.any()):
+            continue
+        closed = (tp_first | sl_first)[:, :, None, None]
+        growth = mult * exit_ratio[:, :, None, None] - 1
+        new_balance = np.maximum(np.round(balance + balance * growth, 2), 0.0)
+        balance = np.where(closed, new_balance, balance)
+        tp_hits += tp_first
+        sl_hits += sl_first
+
+    full = lambda a: np.broadcast_to(a[:, :, None, None], shape)
+    return {"balance": balance, "tp_hits": full(tp_hits), "sl_hits": full(sl_hits),
+            "open": full(len(paths) - tp_hits - sl_hits), "skipped": np.zeros(shape, dtype=np.int32)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorised TP/SL parameter sweep")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--prices", help="CSV/JSONL ticks (ts, mint, price), one path per mint")
+    source.add_argument("--ticks", help="tick_recorder directory (TICK_DIR), one path per mint")
+    parser.add_argument("--days", help="comma-separated YYYYMMDD days to read from --ticks (default: all)")
+    parser.add_argument("--tp", default="5:200:100", help="TP %% levels, start:stop:num or a,b,c")
+    parser.add_argument("--sl", default="5:60:100", help="SL %% levels (positive), start:stop:num or a,b,c")
+    parser.add_argument("--fee", default="1", help="fee %% levels, per fill (ledger) or round-trip (compound)")
+    parser.add_argument("--slippage", default="0", help="slippage %% levels, on the buy fill (ledger) or both")
+    parser.add_argument("--balance", type=float, default=10.8, help="starting balance (DAILY_CAPITAL_USD)")
+    parser.add_argument("--max-open", type=int, default=1, help="MAX_OPEN_POSITIONS (ledger model)")
+    parser.add_argument("--model", choices=("ledger", "compound"), default="ledger")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--csv", help="write every grid point to this CSV")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.ticks:
+        from tick_recorder import load_paths as load_recorded
+        paths = load_recorded(args.ticks, args.days.split(",") if args.days else None)
+    else:
+        paths = load_paths(args.prices)
+    loaded = time.perf_counter() - started
+    tp, sl, fee, slip = (parse_levels(s) for s in (args.tp, args.sl, args.fee, args.slippage))
+
+    started = time.perf_counter()
+    if args.model == "ledger":
+        result = sweep(paths, tp, sl, fee, slip, args.balance, max(1, args.max_open))
+    else:
+        result = sweep_compound(paths, tp, sl, fee, slip, args.balance)
+    elapsed = time.perf_counter() - started
+    balance = result["balance"]
+    ticks = sum(len(p) for _, p in paths)
+    print(f"{len(paths)} paths, {ticks} ticks (loaded in {loaded:.2f}s) | "
+          f"{balance.size} grid points swept in {elapsed:.2f}s")
+
+    order = np.argsort(balance, axis=None)[::-1][:args.top]
+    print(f"{'TP%':>7} {'SL%':>7} {'fee%':>5} {'slip%':>5} {'balance':>12} {'TP':>6} {'SL':>6} {'open':>5} {'skip':>5}")
+    for flat in order:
+        g = np.unravel_index(flat, balance.shape)
+        i, j, k, m = g
+        print(f"{tp[i]:>7.1f} {sl[j]:>7.1f} {fee[k]:>5.2f} {slip[m]:>5.2f} {balance[g]:>12.2f} "
+              f"{result['tp_hits'][g]:>6} {result['sl_hits'][g]:>6} {result['open'][g]:>5} {result['skipped'][g]:>5}")
+
+    if args.csv:
+        i, j, k, m = (a.ravel() for a in np.indices(balance.shape))
+        table = np.column_stack([tp[i], sl[j], fee[k], slip[m], balance.ravel()]
+                                + [result[c].ravel() for c in ("tp_hits", "sl_hits", "open", "skipped")])
+        np.savetxt(args.csv, table, delimiter=",", fmt="%.6g",
+                   header="tp_pct,sl_pct,fee_pct,slippage_pct,balance,tp_hits,sl_hits,open,skipped", comments="")
+        print(f"Grid written to {args.csv}")
+
+if __name__ == "__main__":
+    main()
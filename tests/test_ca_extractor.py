@@ -0,0 +1,44 @@
+# /root/ux-solsniper/tests/test_ca_extractor.py
+"""Base58 mint validation and CA extraction ranking."""
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ca_extractor import (RANK_BUTTON, RANK_LABEL, RANK_PLATFORM, RANK_TEXT, b58decode,
+                          extract_ca, extract_candidates, is_valid_mint)
+
+WSOL = "So11111111111111111111111111111111111111112"
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+def _message(text="", buttons=()):
+    return SimpleNamespace(message=text, text=text, entities=None,
+                           buttons=[[SimpleNamespace(url=u) for u in buttons]] if buttons else None)
+
+def test_b58decode():
+    assert b58decode("1") == b"\0"
+    assert b58decode("2") == b"\x01"
+    assert b58decode("11z") == b"\0\0\x39"
+    assert len(b58decode(WSOL)) == 32
+
+def test_is_valid_mint():
+    assert is_valid_mint(WSOL) and is_valid_mint(USDC)
+    assert not is_valid_mint(WSOL[:-1] + "0")  # 0 is not base58
+    assert not is_valid_mint("1" * 31)  # too short
+    assert not is_valid_mint("z" * 44)  # decodes to more than 32 bytes
+
+def test_label_beats_platform_beats_bare():
+    text = f"bare {USDC} chart dexscreener.com/solana/{WSOL} CA: {USDC}"
+    candidates = extract_candidates(_message(text))
+    assert [(c.ca, c.rank) for c in candidates] == [(USDC, RANK_LABEL), (WSOL, RANK_PLATFORM)]
+
+def test_bare_text_beats_button():
+    msg = _message(f"🔥 {USDC}", buttons=[f"https://t.me/bot?start={WSOL}"])
+    candidates = extract_candidates(msg)
+    assert [(c.ca, c.rank) for c in candidates] == [(USDC, RANK_TEXT), (WSOL, RANK_BUTTON)]
+    assert extract_ca(msg) == USDC
+
+def test_runs_inside_longer_base58_are_ignored():
+    assert extract_ca(_message(f"x{WSOL}abc")) is None
+    assert extract_ca(_message("nothing to see")) is None
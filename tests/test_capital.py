@@ -0,0 +1,79 @@
+# /root/ux-solsniper/tests/test_capital.py
+"""CapitalLedger: reservations, their lifecycle and the daily buy limit."""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import capital
+from capital import CapitalLedger
+
+@pytest.fixture
+def balance(monkeypatch):
+    value = {"usd": 100.0}
+    monkeypatch.setattr(capital, "get_balance", lambda: value["usd"])
+    return value
+
+def _ledger(**config) -> CapitalLedger:
+    return CapitalLedger({"MAX_BUYS_PER_DAY": 10, "DAILY_CAPITAL_USD": 50.0, **config})
+
+def test_default_stakes_whole_balance_one_at_a_time(balance):
+    ledger = _ledger()
+    assert ledger.reserve("A") == 100.0
+    assert ledger.reserve("B") == 0.0
+
+def test_max_open_positions_splits_the_balance(balance):
+    ledger = _ledger(MAX_OPEN_POSITIONS=4)
+    assert [ledger.reserve(ca) for ca in "ABCDE"] == [25.0, 25.0, 25.0, 25.0, 0.0]
+    assert ledger.committed() == 100.0
+
+def test_same_ca_is_not_reserved_twice(balance):
+    ledger = _ledger(MAX_OPEN_POSITIONS=2)
+    ledger.reserve("A")
+    assert ledger.reserve("A") == 0.0
+
+def test_empty_balance_falls_back_to_daily_capital(balance):
+    balance["usd"] = 0.0
+    assert _ledger().reserve("A") == 50.0
+
+def test_cancel_frees_slot_and_pending(balance):
+    ledger = _ledger()
+    ledger.reserve("A")
+    ledger.cancel("A")
+    assert (ledger.pending, ledger.committed()) == (0, 0.0)
+    assert ledger.reserve("B") == 100.0
+
+def test_confirm_counts_once_and_keeps_capital_until_release(balance):
+    ledger = _ledger()
+    ledger.reserve("A")
+    ledger.confirm("A")
+    ledger.confirm("A")
+    assert (ledger.pending, ledger.daily_buys) == (0, 1)
+    assert ledger.reserve("B") == 0.0
+    ledger.release("A")
+    assert ledger.reserve("B") == 100.0
+
+def test_cancel_after_confirm_is_a_no_op(balance):
+    ledger = _ledger()
+    ledger.reserve("A")
+    ledger.confirm("A")
+    ledger.cancel("A")  # record_buy / monitor.add failed after the buy landed
+    assert (ledger.pending, ledger.daily_buys, ledger.committed()) == (0, 1, 100.0)
+
+def test_daily_limit_counts_pending_and_confirmed(balance):
+    ledger = _ledger(MAX_BUYS_PER_DAY=2, MAX_OPEN_POSITIONS=5)
+    ledger.reserve("A")
+    ledger.confirm("A")
+    ledger.release("A")
+    ledger.reserve("B")  # in flight
+    assert ledger.limit_reached()
+    assert ledger.reserve("C") == 0.0
+    ledger.cancel("B")
+    assert not ledger.limit_reached()
+    ledger.reserve("C")
+    ledger.confirm("C")
+    assert ledger.limit_reached()
+    ledger.reset_day()
+    assert not ledger.limit_reached()
@@ -0,0 +1,47 @@
+# /root/ux-solsniper/tests/test_channels.py
+"""Per-channel parsers and the CHANNELS spec."""
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from channels import PARSERS, parse_channels
+
+MINT_A = "So11111111111111111111111111111111111111112"
+MINT_B = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+def _message(text="", entity_urls=(), button_urls=()):
+    return SimpleNamespace(
+        message=text, text=text,
+        entities=[SimpleNamespace(url=u) for u in entity_urls],
+        buttons=[[SimpleNamespace(url=u) for u in button_urls]] if button_urls else None,
+    )
+
+def test_text_parser_ignores_links_outside_the_text():
+    msg = _message("🔥 new pair", entity_urls=[f"https://dexscreener.com/solana/{MINT_A}"])
+    assert PARSERS["text"](msg) is None
+    assert PARSERS["default"](msg) == MINT_A
+    assert PARSERS["labeled"](msg) == MINT_A
+
+def test_text_parser_takes_label_link_or_bare_mint_from_the_text():
+    assert PARSERS["text"](_message(f"🔥 {MINT_B}")) == MINT_B
+    assert PARSERS["text"](_message(f"🔥 pump.fun/{MINT_B}")) == MINT_B
+    msg = _message(f"🔥 {MINT_B}", entity_urls=[f"https://dexscreener.com/solana/{MINT_A}"])
+    assert PARSERS["text"](msg) == MINT_B
+    assert PARSERS["default"](msg) == MINT_A  # platform link outranks a bare mint
+
+def test_default_parser_falls_back_to_buttons():
+    assert PARSERS["default"](_message("🔥", button_urls=[f"https://x.io/?a={MINT_A}"])) == MINT_A
+    assert PARSERS["labeled"](_message("🔥", button_urls=[f"https://x.io/?a={MINT_A}"])) is None
+
+def test_parse_channels():
+    alpha, beta = parse_channels("-1001:🔥,-1002:🚀|💎:labeled:1:alpha")
+    assert (alpha.chat_id, alpha.prefixes, alpha.parser, alpha.priority) == (-1001, ("🔥",), "default", 0)
+    assert (beta.name, beta.prefixes, beta.parser, beta.priority) == ("alpha", ("🚀", "💎"), "labeled", 1)
+    assert beta.accepts("💎 gem") and not beta.accepts("🔥 hot")
+    assert parse_channels("", fallback_id=-1003)[0].chat_id == -1003
+    with pytest.raises(ValueError):
+        parse_channels("-1001:🔥:nope")
@@ -0,0 +1,58 @@
+# /root/ux-solsniper/tests/test_dedup.py
+"""DedupIndex: exact recent tier, Bloom folding and persistence."""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dedup import DedupIndex
+
+def test_recent_window_folds_into_bloom():
+    index = DedupIndex(window=60, bloom_bits=1 << 12)
+    index.add("A", now=0)
+    index.add("B", now=30)
+    assert list(index.recent) == ["A", "B"] and index.folded == 0
+    index.add("C", now=100)  # A and B are older than the window
+    assert list(index.recent) == ["C"]
+    assert index.folded == 2
+    assert "A" in index and "B" in index and "C" in index
+    assert "D" not in index
+    assert len(index) == 3
+
+def test_recent_max_bounds_the_exact_tier():
+    index = DedupIndex(recent_max=2, bloom_bits=1 << 12)
+    now = time.time()
+    for i, ca in enumerate("ABCD"):
+        index.add(ca, now=now + i)
+    assert list(index.recent) == ["C", "D"]
+    assert all(ca in index for ca in "ABCD")
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "processed.bin")
+    now = time.time()
+    index = DedupIndex(path, recent_max=2, bloom_bits=1 << 12)
+    for i, ca in enumerate("ABC"):
+        index.add(ca, now=now + i)
+    index.save()
+    assert not index.dirty
+
+    loaded = DedupIndex.load(path, recent_max=2, bloom_bits=1 << 12)
+    assert list(loaded.recent) == ["B", "C"]
+    assert loaded.folded == 1
+    assert all(ca in loaded for ca in "ABC")
+
+def test_bloom_size_change_forgets_folded(tmp_path):
+    path = str(tmp_path / "processed.bin")
+    index = DedupIndex(path, recent_max=1, bloom_bits=1 << 12)
+    index.add("A")
+    index.add("B")
+    index.save()
+    loaded = DedupIndex.load(path, recent_max=1, bloom_bits=1 << 13)
+    assert "B" in loaded and "A" not in loaded
+
+def test_corrupt_file_starts_empty(tmp_path):
+    path = tmp_path / "processed.bin"
+    path.write_bytes(b"garbage")
+    loaded = DedupIndex.load(str(path))
+    assert len(loaded) == 0
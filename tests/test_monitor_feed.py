@@ -0,0 +1,96 @@
+# /root/ux-solsniper/tests/test_monitor_feed.py
+"""PriceFeed + MonitorEngine together: positions keep getting re-priced."""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import price_feed
+from monitor import MonitorEngine
+from price_feed import PriceFeed
+
+MINT = "So11111111111111111111111111111111111111112"
+
+def _config(adaptive: int) -> dict:
+    return {
+        "TAKE_PROFIT": 1000.0,
+        "STOP_LOSS": -90.0,
+        "MONITOR_POLL_SEC": 0.05,
+        "MONITOR_ADAPTIVE": adaptive,
+        "MONITOR_MIN_POLL_SEC": 0.05,
+        "MONITOR_MAX_POLL_SEC": 0.2,
+    }
+
+async def _run(monkeypatch, config: dict, seconds: float, prices=None) -> tuple[int, list, MonitorEngine]:
+    polls = 0
+    sold = []
+
+    async def fake_prices(mints, session, sources=None):
+        nonlocal polls
+        polls += 1
+        price = prices(polls) if prices else 1.0 + 0.001 * polls  # always changing
+        return {m: price for m in mints}
+
+    async def fake_sell(session, mint, wallet, config, **kwargs):
+        sold.append(kwargs["is_tp"])
+        return "SIG"
+
+    monkeypatch.setattr(price_feed, "get_token_prices", fake_prices)
+    feed = PriceFeed(None, interval=config["MONITOR_POLL_SEC"])
+    monitor = MonitorEngine(None, None, config, feed, sell_fn=fake_sell, prepare_fn=None)
+    monitor.start()
+    monitor.add(MINT, entry_price=1.0, token_name="TEST")
+    await asyncio.sleep(seconds)
+    await monitor.stop()
+    await feed.stop()
+    return polls, sold, monitor
+
+@pytest.mark.parametrize("adaptive", [0, 1])
+def test_feed_keeps_polling_while_monitored(monkeypatch, adaptive):
+    polls, _, _ = asyncio.run(_run(monkeypatch, _config(adaptive), 1.0))
+    # 1s at a 0.05s (fixed) or <= 0.2s (adaptive) interval; a stalled feed polls once
+    assert polls >= (10 if not adaptive else 4)
+
+@pytest.mark.parametrize("adaptive", [0, 1])
+def test_take_profit_fires_after_later_polls(monkeypatch, adaptive):
+    config = dict(_config(adaptive), TAKE_PROFIT=20.0)
+    _, sold, monitor = asyncio.run(_run(monkeypatch, config, 1.5, prices=lambda n: 1.0 if n < 5 else 1.5))
+    assert sold == [True]
+    assert MINT not in monitor.positions
+
+class _StubFeed:
+    def __init__(self):
+        self.subscribers = {}
+
+    def subscribe(self, mint, cb):
+        self.subscribers[mint] = cb
+
+    def unsubscribe(self, mint, cb):
+        self.subscribers.pop(mint, None)
+
+    def schedule(self, mint, delay):
+        pass
+
+def test_idle_positions_cost_nothing_per_tick():
+    now = [0.0]
+    feed = _StubFeed()
+    monitor = MonitorEngine(None, None, _config(0), feed, sell_fn=None, prepare_fn=None, clock=lambda: now[0])
+    for i in range(100):
+        monitor.add(f"MINT{i}", entry_price=1.0, token_name=f"T{i}")
+    for mint, cb in feed.subscribers.items():
+        cb(mint, 1.0)
+    monitor.step()
+    assert monitor.evaluations == 100
+    # Same prices again: nothing is scheduled, nothing is evaluated
+    for mint, cb in feed.subscribers.items():
+        cb(mint, 1.0)
+    now[0] = 10.0
+    monitor.step()
+    assert monitor.evaluations == 100 and not monitor._heap
+    # One price moves: one evaluation
+    feed.subscribers["MINT7"]("MINT7", 1.01)
+    monitor.step()
+    assert monitor.evaluations == 101
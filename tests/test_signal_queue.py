@@ -0,0 +1,82 @@
+# /root/ux-solsniper/tests/test_signal_queue.py
+"""SignalQueue ordering, expiry and overflow."""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from signal_queue import SignalQueue
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def _drain(queue) -> list[str]:
+    out = []
+    while True:
+        try:
+            out.append(queue.get_nowait().ca)
+        except asyncio.QueueEmpty:
+            return out
+
+def test_newest_first_within_a_priority():
+    clock = Clock()
+    queue = SignalQueue(max_age=30, clock=clock)
+    for i, ca in enumerate("ABC"):
+        queue.put_nowait(ca, msg_time=990 + i)
+    assert _drain(queue) == ["C", "B", "A"]
+
+def test_priority_beats_freshness():
+    queue = SignalQueue(max_age=30, clock=Clock())
+    queue.put_nowait("LOW", msg_time=999)
+    queue.put_nowait("HIGH", msg_time=980, priority=1)
+    assert _drain(queue) == ["HIGH", "LOW"]
+
+def test_stale_signals_expire_on_put_and_get():
+    clock = Clock()
+    dropped = []
+    queue = SignalQueue(max_age=30, clock=clock, on_drop=lambda s, reason: dropped.append((s.ca, reason)))
+    assert not queue.put_nowait("OLD", msg_time=900)
+    queue.put_nowait("A", msg_time=990)
+    queue.put_nowait("B", msg_time=1000)
+    clock.now = 1025  # A is now 35s old, B 25s
+    assert _drain(queue) == ["B"]
+    assert dropped == [("OLD", "expired"), ("A", "expired")]
+    assert queue.stats()["expired"] == 2
+
+def test_purge_expires_without_a_get():
+    clock = Clock()
+    queue = SignalQueue(max_age=30, clock=clock)
+    queue.put_nowait("A", msg_time=990)
+    queue.put_nowait("B", msg_time=1000)
+    clock.now = 1025
+    assert queue.purge() == 1
+    assert queue.qsize() == 1
+
+def test_full_queue_drops_the_worst_entry():
+    dropped = []
+    queue = SignalQueue(max_age=30, maxsize=2, clock=Clock(),
+                        on_drop=lambda s, reason: dropped.append((s.ca, reason)))
+    queue.put_nowait("OLDEST", msg_time=980)
+    queue.put_nowait("MID", msg_time=990)
+    assert queue.put_nowait("NEW", msg_time=1000)
+    assert not queue.put_nowait("OLDER", msg_time=970)  # worse than everything queued
+    assert dropped == [("OLDEST", "dropped"), ("OLDER", "dropped")]
+    assert _drain(queue) == ["NEW", "MID"]
+
+def test_get_waits_for_a_signal():
+    async def run():
+        queue = SignalQueue(max_age=30)
+        getter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0.01)
+        assert not getter.done()
+        await queue.put("A")
+        return (await asyncio.wait_for(getter, 1)).ca
+
+    assert asyncio.run(run()) == "A"
@@ -0,0 +1,54 @@
+# /root/ux-solsniper/tests/test_startup.py
+"""SniperBot.start_worker: startup waits for the worker, or fails with it."""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sniper import SniperBot
+
+def _bot(worker) -> SniperBot:
+    # Skip __init__: it needs a wallet and a Telegram session
+    bot = SniperBot.__new__(SniperBot)
+    bot.ready = asyncio.Event()
+    bot.worker = worker
+    return bot
+
+def test_failing_worker_aborts_startup():
+    async def worker():
+        raise ValueError("bad METADATA_LOOKUP_MODE")
+
+    async def run():
+        await asyncio.wait_for(_bot(worker).start_worker(), timeout=1)
+
+    with pytest.raises(ValueError, match="METADATA_LOOKUP_MODE"):
+        asyncio.run(run())
+
+def test_worker_returning_early_aborts_startup():
+    async def worker():
+        return None
+
+    async def run():
+        await asyncio.wait_for(_bot(worker).start_worker(), timeout=1)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+
+def test_ready_worker_keeps_running():
+    async def run():
+        bot = None
+
+        async def worker():
+            await asyncio.sleep(0.01)
+            bot.ready.set()
+            await asyncio.sleep(3600)
+
+        bot = _bot(worker)
+        task = await asyncio.wait_for(bot.start_worker(), timeout=1)
+        assert not task.done()
+        task.cancel()
+
+    asyncio.run(run())
@@ -0,0 +1,49 @@
+# /root/ux-solsniper/tests/test_stats.py
+"""RunningStats against direct computation, merge and persistence."""
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from stats import PNL_EDGES, RunningStats
+
+VALUES = [-12.5, 3.0, 0.4, -0.7, 25.0, 1.2, -60.0, 8.8]
+
+def _stats(values) -> RunningStats:
+    stats = RunningStats()
+    for v in values:
+        stats.add(v)
+    return stats
+
+def test_add_matches_direct_computation():
+    stats = _stats(VALUES)
+    assert stats.count == len(VALUES)
+    assert stats.total == pytest.approx(sum(VALUES))
+    assert (stats.min, stats.max) == (min(VALUES), max(VALUES))
+    assert stats.mean == pytest.approx(statistics.mean(VALUES))
+    assert stats.variance == pytest.approx(statistics.variance(VALUES))
+    assert sum(stats.hist) == len(VALUES)
+    assert stats.hist[0] == 1 and stats.hist[-1] == 0  # -60 ≤ -50; nothing > 50
+
+def test_merge_equals_one_pass():
+    merged = _stats(VALUES[:3]).merge(_stats(VALUES[3:]))
+    whole = _stats(VALUES)
+    for attr in ("count", "total", "min", "max", "mean", "variance"):
+        assert getattr(merged, attr) == pytest.approx(getattr(whole, attr))
+    assert merged.hist == whole.hist
+
+def test_merge_with_empty():
+    stats = _stats(VALUES)
+    assert RunningStats().merge(stats).mean == pytest.approx(stats.mean)
+    assert stats.merge(RunningStats()).count == len(VALUES)
+
+def test_dict_round_trip():
+    stats = _stats(VALUES)
+    restored = RunningStats.from_dict(stats.to_dict())
+    assert restored.count == stats.count
+    assert restored.variance == pytest.approx(stats.variance)
+    assert restored.hist == stats.hist
+    assert len(restored.hist) == len(PNL_EDGES) + 1
@@ -0,0 +1,54 @@
+# /root/ux-solsniper/tests/test_sweep.py
+"""sweep.py on hand-sized paths with known record_sell / CapitalLedger outcomes."""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sweep import sweep, sweep_compound
+
+def _path(*ticks):
+    return np.array([t for t, _ in ticks], dtype=float), np.array([p for _, p in ticks], dtype=float)
+
+TP, SL, NO_FEE, NO_SLIP = np.array([20.0]), np.array([20.0]), np.array([0.0]), np.array([0.0])
+WIN = _path((0, 1.0), (10, 1.5))     # TP at t=10
+LOSS = _path((1, 1.0), (2, 0.7))     # SL at t=2, while WIN is still open
+
+def _run(paths, max_open=1, fee=NO_FEE):
+    result = sweep(paths, TP, SL, fee, NO_SLIP, 100.0, max_open)
+    return {k: v[0, 0, 0, 0] for k, v in result.items()}
+
+def test_sequential_positions_compound_whole_balance():
+    later_loss = _path((20, 1.0), (21, 0.7))
+    r = _run([WIN, later_loss])
+    assert r["balance"] == pytest.approx(105.0)  # 100 → 150 → 150 - 45
+    assert (r["tp_hits"], r["sl_hits"], r["open"], r["skipped"]) == (1, 1, 0, 0)
+
+def test_overlapping_position_is_skipped_with_one_slot():
+    r = _run([WIN, LOSS], max_open=1)
+    assert r["balance"] == pytest.approx(150.0)
+    assert r["skipped"] == 1
+
+def test_overlapping_positions_share_the_balance():
+    r = _run([WIN, LOSS], max_open=2)
+    # $50 each: LOSS books -15 first, WIN +25 later
+    assert r["balance"] == pytest.approx(110.0)
+    assert (r["tp_hits"], r["sl_hits"], r["skipped"]) == (1, 1, 0)
+
+def test_fees_follow_record_sell():
+    r = _run([WIN], fee=np.array([1.0]))
+    # 99 tokens at 1.0; (1.5 - 1.0) * 99 - 1% of 1.5 * 99
+    assert r["balance"] == pytest.approx(148.015, abs=0.006)
+
+def test_path_that_never_exits_keeps_its_slot():
+    flat = _path((0, 1.0), (5, 1.05))
+    r = _run([flat, LOSS])
+    assert r["balance"] == pytest.approx(100.0)
+    assert (r["open"], r["skipped"]) == (1, 1)
+
+def test_compound_model_ignores_overlap():
+    result = sweep_compound([WIN, LOSS], TP, SL, NO_FEE, NO_SLIP, 100.0)
+    assert result["balance"][0, 0, 0, 0] == pytest.approx(105.0)
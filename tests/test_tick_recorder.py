@@ -0,0 +1,44 @@
+# /root/ux-solsniper/tests/test_tick_recorder.py
+"""TickRecorder round trip through read_day/load_paths, including a crash-torn tail."""
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tick_recorder import RECORD, TickRecorder, day_file, load_mints, load_paths, read_day
+
+T0 = datetime(2026, 1, 2, 12, tzinfo=timezone.utc).timestamp()
+DAY = "20260102"
+
+def _record(directory, ticks):
+    recorder = TickRecorder(directory, clock=lambda: T0)
+    for ts, mint, price in ticks:
+        recorder.record(mint, price, "jupiter", ts=ts)
+    recorder.close()
+
+def test_round_trip(tmp_path):
+    _record(tmp_path, [(T0, "A", 1.0), (T0 + 1, "B", 2.0), (T0 + 2, "A", 1.5)])
+    ticks = read_day(tmp_path, DAY)
+    assert ticks["price"].tolist() == [1.0, 2.0, 1.5]
+    assert ticks["mint"].tolist() == [0, 1, 0]
+    assert load_mints(tmp_path) == ["A", "B"]
+    (a_times, a_prices), (b_times, b_prices) = load_paths(tmp_path)
+    assert a_times.tolist() == [T0, T0 + 2] and a_prices.tolist() == [1.0, 1.5]
+    assert b_prices.tolist() == [2.0]
+
+def test_torn_tail_is_cut_before_appending(tmp_path):
+    _record(tmp_path, [(T0, "A", 1.0), (T0 + 1, "A", 1.1)])
+    path = day_file(tmp_path, DAY)
+    with open(path, "ab") as f:
+        f.write(RECORD.pack(T0 + 2, 0, 9.9, 2)[:13])  # crash mid-write
+    assert len(read_day(tmp_path, DAY)) == 2  # the reader skips the torn record
+
+    _record(tmp_path, [(T0 + 3, "A", 1.2), (T0 + 4, "B", 3.0)])
+    assert path.stat().st_size == 4 * RECORD.size
+    ticks = read_day(tmp_path, DAY)
+    assert ticks["ts"].tolist() == [T0, T0 + 1, T0 + 3, T0 + 4]
+    assert ticks["price"].tolist() == pytest.approx([1.0, 1.1, 1.2, 3.0])
+    assert ticks["mint"].tolist() == [0, 0, 0, 1]
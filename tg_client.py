@@ -0,0 +1,20 @@
+# /root/ux-solsniper/tg_client.py
+import os
+
+SESSION_FILE = os.getenv("SESSION_FILE", "/root/ux-solsniper/session_string.txt")
+
+def build_client(config: dict, session_file: str = SESSION_FILE):
+    """The one TelegramClient of the process, from the saved string session."""
+    # Telethon is imported here so tools that never talk to Telegram don't pay for it
+    from telethon import TelegramClient
+    from telethon.sessions import StringSession
+
+    if not os.path.exists(session_file):
+        raise FileNotFoundError(f"{os.path.basename(session_file)} not found!")
+    with open(session_file, "r") as f:
+        session_str = f.read().strip()
+    return TelegramClient(
+        StringSession(session_str),
+        int(config["TELEGRAM_API_ID"]),
+        config["TELEGRAM_API_HASH"]
+    )
@@ -0,0 +1,170 @@
+# /root/ux-solsniper/tick_recorder.py
+"""Append-only binary recorder for every price the feed fetches.
+
+Off unless TICK_DIR is set; the bot then records into that directory.
+
+One fixed-width little-endian record per tick, 21 bytes:
+
+    ts f8 (unix seconds) | mint u4 (id) | price f8 | source u1
+
+Records go to <dir>/ticks-YYYYMMDD.bin, rotated on the UTC date of the
+tick; mint ids are assigned on first sight and appended to <dir>/mints.tsv
+("id<TAB>mint"). Writes are buffered and flushed every `flush_every`
+records or `flush_sec` seconds, so a crash loses at most that much. A
+record torn by a crash is cut off before the file is appended to again, so
+later records stay aligned.
+
+Reading needs NumPy: `read_day()` memory-maps a day straight into a
+structured array, `load_paths()` turns days into per-mint (times, prices)
+paths for sweep.py.
+"""
+import os
+import struct
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from loguru import logger
+
+RECORD = struct.Struct("<dIdB")
+SOURCES = {"unknown": 0, "dexscreener": 1, "jupiter": 2, "replay": 3}
+MINTS_FILE = "mints.tsv"
+
+def day_file(directory: str | Path, day: str) -> Path:
+    """day is 'YYYYMMDD'."""
+    return Path(directory) / f"ticks-{day}.bin"
+
+def _day(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y%m%d")
+
+def load_mints(directory: str | Path) -> list[str]:
+    """Mint address per id (index = id)."""
+    path = Path(directory) / MINTS_FILE
+    mints: list[str] = []
+    if not path.exists():
+        return mints
+    with open(path) as f:
+        for line in f:
+            idx, _, mint = line.rstrip("\n").partition("\t")
+            if mint and int(idx) == len(mints):
+                mints.append(mint)
+    return mints
+
+def _trim_torn_tail(path: Path):
+    """Cut a partial trailing record so appends start on a record boundary."""
+    try:
+        size = os.path.getsize(path)
+    except FileNotFoundError:
+        return
+    torn = size % RECORD.size
+    if torn:
+        with open(path, "r+b") as f:
+            f.truncate(size - torn)
+        logger.warning(f"TICK dropped a torn {torn}-byte record at the end of {path.name}")
+
+class TickRecorder:
+    def __init__(self, directory: str | Path, flush_every: int = 512, flush_sec: float = 5.0, clock=time.time):
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.flush_sec = flush_sec
+        self.clock = clock
+        self.ids = {mint: i for i, mint in enumerate(load_mints(self.dir))}
+        self._buf = bytearray()
+        self._pending = 0
+        self._day: str | None = None
+        self._trimmed: set[str] = set()  # day files checked for a torn tail
+        self._flushed = clock()
+        self.records = 0
+        self.enabled = True
+
+    def mint_id(self, mint: str) -> int:
+        idx = self.ids.get(mint)
+        if idx is None:
+            idx = self.ids[mint] = len(self.ids)
+            with open(self.dir / MINTS_FILE, "a") as f:
+                f.write(f"{idx}\t{mint}\n")
+        return idx
+
+    def record(self, mint: str, price: float, source: str = "unknown", ts: float | None = None):
+        if not self.enabled:
+            return
+        ts = self.clock() if ts is None else ts
+        try:
+            day = _day(ts)
+            if day != self._day:
+                self.flush()  # pending records belong to the previous file
+                self._day = day
+            self._buf += RECORD.pack(ts, self.mint_id(mint), price, SOURCES.get(source, 0))
+            self._pending += 1
+            self.records += 1
+            if self._pending >= self.flush_every or ts - self._flushed >= self.flush_sec:
+                self.flush()
+        except Exception as e:
+            logger.warning(f"TICK recorder disabled: {e}")
+            self.enabled = False
+
+    def flush(self):
+        self._flushed = self.clock()
+        if not self._buf or self._day is None:
+            return
+        path = day_file(self.dir, self._day)
+        if self._day not in self._trimmed:
+            _trim_torn_tail(path)
+            self._trimmed.add(self._day)
+        with open(path, "ab") as f:
+            f.write(self._buf)
+        self._buf.clear()
+        self._pending = 0
+
+    def close(self):
+        if self.enabled:
+            self.flush()
+
+# === READER ===
+def tick_dtype():
+    import numpy as np
+    return np.dtype([("ts", "<f8"), ("mint", "<u4"), ("price", "<f8"), ("source", "u1")])
+
+def read_day(directory: str | Path, day: str):
+    """Memory-mapped structured array (ts, mint, price, source) of one day's ticks."""
+    import numpy as np
+    path = day_file(directory, day)
+    dtype = tick_dtype()
+    count = os.path.getsize(path) // dtype.itemsize  # ignore a torn trailing record
+    if not count:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+def days(directory: str | Path) -> list[str]:
+    return sorted(p.stem.removeprefix("ticks-") for p in Path(directory).glob("ticks-*.bin"))
+
+def load_paths(directory: str | Path, selected: list[str] | None = None):
+    """[(tick times, prices)] per mint over the selected days (all by default), in entry order."""
+    import numpy as np
+    arrays = [read_day(directory, d) for d in (selected or days(directory))]
+    arrays = [a for a in arrays if len(a)]
+    if not arrays:
+        return []
+    ticks = np.concatenate(arrays)
+    ticks = ticks[np.lexsort((ticks["ts"], ticks["mint"]))]
+    prices = ticks["price"].astype(np.float64)
+    times = ticks["ts"].astype(np.float64)
+    starts = np.flatnonzero(np.r_[True, ticks["mint"][1:] != ticks["mint"][:-1]])
+    paths = [
+        (times[s:e], prices[s:e])
+        for s, e in zip(starts, np.r_[starts[1:], len(ticks)])
+    ]
+    paths.sort(key=lambda p: p[0][0])
+    return paths
+
+def main():
+    import sys
+    directory = sys.argv[1] if len(sys.argv) > 1 else "ticks"
+    mints = load_mints(directory)
+    for day in days(directory):
+        ticks = read_day(directory, day)
+        print(f"{day}: {len(ticks)} ticks, {len(set(ticks['mint'].tolist()))} mints")
+    print(f"{len(mints)} mints known")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# /root/ux-solsniper/tracing.py
+"""Per-signal latency traces.
+
+Every buy is traced from the channel post to record_buy and every exit from
+the TP/SL trigger to record_sell. Finished traces are appended to a compact
+JSONL file, one line per trace with each stage as milliseconds since the
+trace origin, plus one line per upstream HTTP request:
+
+    {"k":"buy","id":"<ca>","t":1760000000.123,"s":"ok","st":{"message":0,"handler":812,...}}
+    {"k":"http","h":"lite-api.jup.ag","ms":143.2,"c":200}
+
+Summarise with `python tracing.py [traces.jsonl]`.
+"""
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from loguru import logger
+
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+
+BUY_STAGES = ("message", "handler", "enqueue", "dequeue", "metadata", "sizing",
+              "order", "sign", "execute", "record_buy")
+SELL_STAGES = ("trigger", "balance", "order", "sign", "execute", "record_sell")
+
+class Trace:
+    __slots__ = ("kind", "key", "stages")
+
+    def __init__(self, kind: str, key: str):
+        self.kind = kind
+        self.key = key
+        self.stages: list[tuple[str, float]] = []
+
+    def mark(self, stage: str, ts: float | None = None):
+        self.stages.append((stage, time.time() if ts is None else ts))
+
+    def to_line(self, status: str) -> str:
+        t0 = self.stages[0][1] if self.stages else time.time()
+        return json.dumps({
+            "k": self.kind,
+            "id": self.key,
+            "t": round(t0, 3),
+            "s": status,
+            "st": {stage: round((ts - t0) * 1000, 1) for stage, ts in self.stages},
+        }, separators=(",", ":"))
+
+class Tracer:
+    def __init__(self, path: str | None = TRACE_FILE):
+        self.path = path
+        self.active: dict[tuple[str, str], Trace] = {}
+        self._fh = None
+
+    def _write(self, line: str, flush: bool = False):
+        if not self.path:
+            return
+        try:
+            if self._fh is None:
+                self._fh = open(self.path, "a", buffering=1 << 16)
+            self._fh.write(line + "\n")
+            if flush:
+                self._fh.flush()
+        except Exception as e:
+            logger.warning(f"TRACE write failed: {e}")
+            self.path = None
+
+    # === TRACES ===
+    def start(self, kind: str, key: str, origin: float | None = None) -> Trace:
+        trace = Trace(kind, key)
+        if origin is not None:
+            trace.mark("message" if kind == "buy" else "trigger", origin)
+        self.active[(kind, key)] = trace
+        return trace
+
+    def mark(self, kind: str, key: str, stage: str, ts: float | None = None):
+        trace = self.active.get((kind, key))
+        if trace is not None:
+            trace.mark(stage, ts)
+
+    def finish(self, kind: str, key: str, status: str = "ok"):
+        trace = self.active.pop((kind, key), None)
+        if trace is not None:
+            self._write(trace.to_line(status), flush=True)
+
+    def drop(self, kind: str, key: str):
+        self.active.pop((kind, key), None)
+
+    # === UPSTREAM HOSTS ===
+    def record_http(self, host: str, seconds: float, status):
+        self._write(json.dumps({"k": "http", "h": host, "ms": round(seconds * 1000, 1), "c": status},
+                               separators=(",", ":")))
+
+    def http_trace_config(self):
+        """aiohttp TraceConfig timing every request of the session per host."""
+        import aiohttp
+
+        async def on_start(session, ctx, params):
+            ctx.started = time.perf_counter()
+
+        async def on_end(session, ctx, params):
+            self.record_http(params.url.host, time.perf_counter() - ctx.started, params.response.status)
+
+        async def on_error(session, ctx, params):
+            self.record_http(params.url.host, time.perf_counter() - ctx.started, type(params.exception).__name__)
+
+        config = aiohttp.TraceConfig()
+        config.on_request_start.append(on_start)
+        config.on_request_end.append(on_end)
+        config.on_request_exception.append(on_error)
+        return config
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+tracer = Tracer()
+
+# === SUMMARY ===
+def _pct(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+def summarize(path: str = TRACE_FILE) -> dict:
+    """p50/p90/p99 per stage (time since the previous stage) and per host."""
+    stages: dict[str, dict[str, list]] = {"buy": defaultdict(list), "sell": defaultdict(list)}
+    hosts: dict[str, list] = defaultdict(list)
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if rec.get("k") == "http":
+                hosts[rec["h"]].append(rec["ms"])
+                continue
+            if rec.get("k") not in stages or rec.get("s") != "ok":
+                continue
+            prev = None
+            for stage, ms in rec["st"].items():
+                if prev is not None:
+                    stages[rec["k"]][stage].append(ms - prev)
+                prev = ms
+            if prev is not None:
+                stages[rec["k"]]["total"].append(prev)
+    row = lambda v: {"n": len(v), "p50": _pct(v, 50), "p90": _pct(v, 90), "p99": _pct(v, 99)}
+    return {
+        "buy": {s: row(v) for s, v in stages["buy"].items() if v},
+        "sell": {s: row(v) for s, v in stages["sell"].items() if v},
+        "hosts": {h: row(v) for h, v in hosts.items() if v},
+    }
+
+def _print_summary(summary: dict):
+    for section, order in (("buy", BUY_STAGES + ("total",)), ("sell", SELL_STAGES + ("total",)), ("hosts", None)):
+        rows = summary[section]
+        if not rows:
+            continue
+        print(f"\n{section.upper():<22} {'n':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}")
+        for name in order or sorted(rows):
+            if name in rows:
+                r = rows[name]
+                print(f"{name:<22} {r['n']:>6} {r['p50']:>9.1f} {r['p90']:>9.1f} {r['p99']:>9.1f}")
+
+if __name__ == "__main__":
+    _print_summary(summarize(sys.argv[1] if len(sys.argv) > 1 else TRACE_FILE))
@@ -0,0 +1,289 @@
+# /root/ux-solsniper/trade_store.py
+import asyncio
+import atexit
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from loguru import logger
+from stats import RunningStats
+
+DB_FILE = os.getenv("TRADE_DB_FILE", "trades.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    ca          TEXT PRIMARY KEY,
+    name        TEXT,
+    mcap        REAL,
+    gross       REAL,
+    net         REAL,
+    fee         REAL,
+    buy_time    TEXT,
+    buy_date    TEXT,
+    buy_sig     TEXT,
+    sell_time   TEXT,
+    sell_date   TEXT,
+    sell_sig    TEXT,
+    profit_usd  REAL,
+    profit_pct  REAL,
+    is_tp       INTEGER
+);
+CREATE INDEX IF NOT EXISTS trades_buy_date ON trades(buy_date);
+CREATE INDEX IF NOT EXISTS trades_sell_date ON trades(sell_date);
+CREATE TABLE IF NOT EXISTS state (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS daily_stats (
+    date         TEXT PRIMARY KEY,
+    buys         INTEGER NOT NULL DEFAULT 0,
+    tp_count     INTEGER NOT NULL DEFAULT 0,
+    sl_count     INTEGER NOT NULL DEFAULT 0,
+    total_profit REAL    NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS pnl_stats (
+    date  TEXT NOT NULL,
+    kind  TEXT NOT NULL,
+    stats TEXT NOT NULL,
+    PRIMARY KEY (date, kind)
+);
+"""
+
+PNL_KINDS = ("tp", "sl")
+
+class TradeStore:
+    """SQLite (WAL) store for trades, compounding state and daily stats.
+
+    Writes go to one background thread in submission order, so callers on
+    the event loop never wait on disk. Each write is its own transaction, so
+    a crash loses at most the writes still queued, never half a file.
+    State (balance, cycle) is mirrored in memory so reads right after a
+    write see the new value without waiting for the writer.
+
+    Per-day P&L of TP and SL exits is kept as constant-size RunningStats
+    (one JSON row per date and kind), updated per sell and merged for
+    rollups instead of re-reading trades. Those and the daily_stats rows are
+    loaded once at open and then served from memory, so recording a sell
+    never touches disk on the caller's thread. Trade reads run on the writer
+    thread behind the queued writes, which also makes them see those writes.
+    """
+
+    def __init__(self, path: str = DB_FILE):
+        self.path = path
+        self._local = threading.local()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trade-store")
+        self._pending = []
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        self.state = {k: json.loads(v) for k, v in conn.execute("SELECT key, value FROM state")}
+        self._backfill_pnl()
+        self._daily = {r["date"]: dict(r) for r in conn.execute("SELECT * FROM daily_stats")}
+        self._pnl = {
+            (r["date"], r["kind"]): RunningStats.from_dict(json.loads(r["stats"]))
+            for r in conn.execute("SELECT date, kind, stats FROM pnl_stats")
+        }
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread: the writer thread and the one that opened the store
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # === WRITES (off the event loop) ===
+    def _write(self, sql: str, params: tuple = (), many: bool = False):
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN")
+            if many:
+                conn.executemany(sql, params)
+            else:
+                conn.execute(sql, params)
+
+    def _submit(self, sql: str, params: tuple = (), many: bool = False):
+        future = self._writer.submit(self._write, sql, params, many)
+        future.add_done_callback(self._report)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            future.exception()  # no loop (scripts, replay): wait for the write; errors are logged
+            return
+        self._pending = [f for f in self._pending if not f.done()]
+        self._pending.append(future)
+
+    @staticmethod
+    def _report(future):
+        if future.exception():
+            logger.error(f"TRADE STORE write failed: {future.exception()}")
+
+    def flush(self):
+        """Block until every queued write is committed."""
+        for future in self._pending:
+            future.exception()
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        self._writer.shutdown(wait=True)
+
+    def set_state(self, key: str, value):
+        self.state[key] = value
+        self._submit(
+            "INSERT INTO state(key, value) VALUES(?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value))
+        )
+
+    def insert_buy(self, ca, name, mcap, gross, net, fee, time, tx_sig=None):
+        # Same semantics as the JSON file: a new buy replaces the CA's previous record
+        self._submit(
+            "INSERT OR REPLACE INTO trades(ca, name, mcap, gross, net, fee, buy_time, buy_date, buy_sig) "
+            "VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (ca, name, mcap, gross, net, fee, time, time[:10], tx_sig)
+        )
+
+    def update_sell(self, ca, signature, profit_usd, profit_pct, is_tp, time):
+        self._submit(
+            "UPDATE trades SET sell_time = ?, sell_date = ?, sell_sig = ?, profit_usd = ?, profit_pct = ?, is_tp = ? "
+            "WHERE ca = ?",
+            (time, time[:10], signature, profit_usd, profit_pct, int(is_tp), ca)
+        )
+
+    def bump_daily(self, date: str, is_tp: bool, profit_usd: float):
+        day = self._daily.setdefault(date, {"date": date, "buys": 0, "tp_count": 0, "sl_count": 0, "total_profit": 0.0})
+        day["buys"] += 1
+        day["tp_count" if is_tp else "sl_count"] += 1
+        day["total_profit"] = round(day["total_profit"] + profit_usd, 2)
+        self._submit(
+            "INSERT INTO daily_stats(date, buys, tp_count, sl_count, total_profit) VALUES(?, 1, ?, ?, ROUND(?, 2)) "
+            "ON CONFLICT(date) DO UPDATE SET buys = buys + 1, tp_count = tp_count + excluded.tp_count, "
+            "sl_count = sl_count + excluded.sl_count, total_profit = ROUND(total_profit + ?, 2)",
+            (date, int(is_tp), int(not is_tp), profit_usd, profit_usd)
+        )
+        kind = "tp" if is_tp else "sl"
+        stats = self._pnl.setdefault((date, kind), RunningStats())
+        stats.add(profit_usd)
+        self._submit(
+            "INSERT INTO pnl_stats(date, kind, stats) VALUES(?, ?, ?) "
+            "ON CONFLICT(date, kind) DO UPDATE SET stats = excluded.stats",
+            (date, kind, json.dumps(stats.to_dict(), separators=(",", ":")))
+        )
+
+    def _backfill_pnl(self):
+        """Build pnl_stats from already sold trades the first time the table is used."""
+        conn = self._conn()
+        if conn.execute("SELECT 1 FROM pnl_stats LIMIT 1").fetchone():
+            return
+        built: dict[tuple[str, str], RunningStats] = {}
+        for r in conn.execute(
+            "SELECT sell_date, is_tp, profit_usd FROM trades WHERE sell_date IS NOT NULL ORDER BY sell_time"
+        ):
+            key = (r["sell_date"], "tp" if r["is_tp"] else "sl")
+            built.setdefault(key, RunningStats()).add(r["profit_usd"] or 0.0)
+        if built:
+            self._write(
+                "INSERT OR REPLACE INTO pnl_stats(date, kind, stats) VALUES(?, ?, ?)",
+                [(d, k, json.dumps(v.to_dict(), separators=(",", ":"))) for (d, k), v in built.items()],
+                many=True
+            )
+            logger.info(f"TRADE STORE built P&L stats for {len({d for d, _ in built})} days")
+
+    # === READS ===
+    def _read(self, sql: str, params: tuple = ()) -> list[dict]:
+        """Run a SELECT on the writer thread, after every write queued before it."""
+        def select():
+            return [dict(r) for r in self._conn().execute(sql, params)]
+        return self._writer.submit(select).result()
+
+    def get_trade(self, ca: str) -> dict | None:
+        rows = self._read("SELECT * FROM trades WHERE ca = ?", (ca,))
+        return rows[0] if rows else None
+
+    def trades_bought_on(self, date: str) -> list[dict]:
+        return self._read("SELECT * FROM trades WHERE buy_date = ?", (date,))
+
+    def trades_sold_on(self, date: str) -> list[dict]:
+        return self._read("SELECT * FROM trades WHERE sell_date = ?", (date,))
+
+    def daily_stats(self, date: str) -> dict | None:
+        day = self._daily.get(date)
+        if day is None:
+            return None
+        stats = dict(day)
+        stats["wins"] = self.pnl_stats(date, "tp").to_dict()
+        stats["losses"] = self.pnl_stats(date, "sl").to_dict()
+        return stats
+
+    def pnl_stats(self, date: str, kind: str) -> RunningStats:
+        """Live RunningStats of one day's TP or SL exits (empty if there were none)."""
+        return self._pnl.get((date, kind)) or RunningStats()
+
+    def pnl_rollup(self, start: str, end: str) -> dict[str, RunningStats]:
+        """TP and SL stats merged over dates start..end (inclusive, YYYY-MM-DD)."""
+        merged = {kind: RunningStats() for kind in PNL_KINDS}
+        for (date, kind), stats in self._pnl.items():
+            if start <= date <= end:
+                merged[kind].merge(stats)
+        return merged
+
+    # === JSON MIGRATION / EXPORT ===
+    def import_json(self, trade_file: str, state_file: str):
+        """One-time import of the old JSON files into an empty database."""
+        if self._conn().execute("SELECT 1 FROM trades LIMIT 1").fetchone() or self.state:
+            return
+        for file, loader in ((trade_file, self._import_trades), (state_file, self._import_state)):
+            if os.path.exists(file):
+                try:
+                    with open(file, "r") as f:
+                        loader(json.loads(f.read().strip() or "{}"))
+                    logger.info(f"TRADE STORE imported {file}")
+                except Exception as e:
+                    logger.warning(f"TRADE STORE could not import {file}: {e}")
+        self.flush()
+
+    def _import_trades(self, trades: dict):
+        rows = []
+        for ca, t in trades.items():
+            b = t.get("buy", {})
+            when = b.get("time") or ""
+            rows.append((ca, b.get("name"), b.get("mcap"), b.get("gross"), b.get("net"), b.get("fee"),
+                         when, when[:10], b.get("tx_sig")))
+        self._submit(
+            "INSERT OR REPLACE INTO trades(ca, name, mcap, gross, net, fee, buy_time, buy_date, buy_sig) "
+            "VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows, many=True
+        )
+
+    def _import_state(self, state: dict):
+        for key in ("balance", "cycle"):
+            if key in state:
+                self.set_state(key, state[key])
+
+    def export_trades(self) -> dict:
+        """Trades in the trades_history.json layout (plus a "sell" block once sold)."""
+        out = {}
+        for r in self._read("SELECT * FROM trades ORDER BY buy_time"):
+            entry = {"buy": {
+                "name": r["name"], "mcap": r["mcap"], "gross": r["gross"], "net": r["net"],
+                "fee": r["fee"], "time": r["buy_time"], "tx_sig": r["buy_sig"],
+            }}
+            if r["sell_time"]:
+                entry["sell"] = {
+                    "time": r["sell_time"], "tx_sig": r["sell_sig"], "profit_usd": r["profit_usd"],
+                    "profit_pct": r["profit_pct"], "is_tp": bool(r["is_tp"]),
+                }
+            out[r["ca"]] = entry
+        return out
+
+_store: TradeStore | None = None
+
+def get_store() -> TradeStore:
+    global _store
+    if _store is None:
+        _store = TradeStore()
+        atexit.register(_store.close)
+    return _store
@@ -0,0 +1,177 @@
+# /root/ux-solsniper/upstreams.py
+import asyncio
+import time
+from collections import deque
+from loguru import logger
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+class SourceHealth:
+    """Rolling latency/error window and circuit breaker for one upstream.
+
+    The breaker opens after `consecutive` failures in a row or once the
+    error rate over the window reaches `max_error_rate`. While open the
+    source is skipped; after `cooldown` seconds one probe request is let
+    through (half-open) and its outcome closes the breaker or re-opens it
+    with a doubled cooldown (capped at `max_cooldown`).
+    """
+
+    def __init__(self, name: str, window: int = 50, min_samples: int = 5, max_error_rate: float = 0.5,
+                 consecutive: int = 3, cooldown: float = 15.0, max_cooldown: float = 300.0, clock=time.monotonic):
+        self.name = name
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.consecutive = consecutive
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+        self.outcomes: deque = deque(maxlen=window)    # True = ok
+        self.latencies: deque = deque(maxlen=window)   # seconds, successful calls only
+        self.state = CLOSED
+        self.cooldown = cooldown
+        self.opened_at = 0.0
+        self.failures_in_row = 0
+        self.probing = False
+        self.probe_started = 0.0
+        self.trips = 0
+        self.calls = 0
+
+    # === BREAKER ===
+    def allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self.clock() - self.opened_at >= self.cooldown:
+            self.state = HALF_OPEN
+            self.probing = False
+            logger.info(f"UPSTREAM {self.name} half-open → probing")
+        if self.state == HALF_OPEN:
+            now = self.clock()
+            # A claimed probe that never reported (caller skipped it) expires
+            if not self.probing or now - self.probe_started > self.base_cooldown:
+                self.probing = True
+                self.probe_started = now
+                return True
+        return False
+
+    def record(self, ok: bool, seconds: float):
+        self.calls += 1
+        self.outcomes.append(ok)
+        if ok:
+            self.latencies.append(seconds)
+            self.failures_in_row = 0
+            if self.state != CLOSED:
+                logger.info(f"UPSTREAM {self.name} recovered → closed")
+                self.state = CLOSED
+                self.cooldown = self.base_cooldown
+                self.outcomes.clear()
+                self.outcomes.append(True)
+            self.probing = False
+            return
+        self.failures_in_row += 1
+        if self.state == HALF_OPEN:
+            self._trip(min(self.max_cooldown, self.cooldown * 2))
+        elif self.state == CLOSED and (
+            self.failures_in_row >= self.consecutive
+            or (len(self.outcomes) >= self.min_samples and self.error_rate() >= self.max_error_rate)
+        ):
+            self._trip(self.base_cooldown)
+
+    def _trip(self, cooldown: float):
+        self.state = OPEN
+        self.cooldown = cooldown
+        self.opened_at = self.clock()
+        self.probing = False
+        self.trips += 1
+        logger.warning(
+            f"UPSTREAM {self.name} OPEN for {cooldown:.0f}s | "
+            f"error rate {self.error_rate():.0%}, {self.failures_in_row} failures in a row"
+        )
+
+    # === METRICS ===
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1 - sum(self.outcomes) / len(self.outcomes)
+
+    def percentile(self, q: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    def score(self) -> float:
+        """Lower is better: median latency inflated by the error rate."""
+        p50 = self.percentile(50)
+        return (p50 if p50 is not None else 0.5) * (1 + 4 * self.error_rate())
+
+class _Call:
+    """`with upstreams.track(name) as call:` times a request; call.fail() or an exception marks it failed."""
+    __slots__ = ("health", "ok", "started")
+
+    def __init__(self, health: SourceHealth):
+        self.health = health
+        self.ok = True
+        self.started = time.monotonic()
+
+    def fail(self):
+        self.ok = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and issubclass(exc_type, asyncio.CancelledError):
+            return False  # a cancelled hedge says nothing about the source
+        self.health.record(self.ok and exc_type is None, time.monotonic() - self.started)
+        return False
+
+class SourceRegistry:
+    """Health of every upstream, shared by the price, SOL and execution paths."""
+
+    def __init__(self, **defaults):
+        self.defaults = defaults
+        self.sources: dict[str, SourceHealth] = {}
+
+    def get(self, name: str) -> SourceHealth:
+        health = self.sources.get(name)
+        if health is None:
+            health = self.sources[name] = SourceHealth(name, **self.defaults)
+        return health
+
+    def configure(self, **defaults):
+        self.defaults.update(defaults)
+        for name in list(self.sources):
+            self.sources[name] = SourceHealth(name, **self.defaults)
+
+    def track(self, name: str) -> _Call:
+        return _Call(self.get(name))
+
+    def allow(self, name: str) -> bool:
+        return self.get(name).allow()
+
+    def percentile(self, name: str, q: float) -> float | None:
+        return self.get(name).percentile(q)
+
+    def rank(self, names) -> list[str]:
+        """Sources whose breaker lets a request through, healthiest first.
+
+        Checking allow() claims a half-open probe; an unused claim expires
+        after the base cooldown.
+        """
+        allowed = [n for n in names if self.allow(n)]
+        return sorted(allowed, key=lambda n: self.get(n).score())
+
+    def snapshot(self) -> dict:
+        return {
+            name: {
+                "state": h.state,
+                "error_rate": round(h.error_rate(), 3),
+                "p50_ms": None if h.percentile(50) is None else round(h.percentile(50) * 1000, 1),
+                "p90_ms": None if h.percentile(90) is None else round(h.percentile(90) * 1000, 1),
+                "calls": h.calls,
+                "trips": h.trips,
+            }
+            for name, h in self.sources.items()
+        }
+
+upstreams = SourceRegistry()
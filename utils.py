@@ -4,34 +4,30 @@ from loguru import logger
 import aiohttp
 import os
 from jupiter_price import get_sol_price_usd
+from endpoints import TELEGRAM_API
 
-async def compute_amount_from_usd(session, config, ca=None):
-    sol_price = 0.0
-    for attempt in range(1, 4):
-        try:
-            sol_price = await get_sol_price_usd(session)
-            if sol_price and sol_price > 0:
-                break
-        except Exception as e:
-            logger.warning("Attempt %d/3: get_sol_price_usd() failed: %s", attempt, e)
-        await asyncio.sleep(attempt * 1.5)
+async def compute_amount_from_usd(session, config, ca=None, usd_amount=None):
+    lamports, _ = await compute_buy_size(session, config, usd_amount)
+    return lamports
+
+async def compute_buy_size(session, config, usd_amount=None) -> tuple[int, float]:
+    """(lamports to spend, SOL price used); the price is passed on so the buy never refetches it."""
+    # Served from the background-refreshed cache; only a cold cache waits
+    sol_price = await get_sol_price_usd(session)
     if not sol_price or sol_price <= 0:
         logger.error("Could not not fetch SOL price. Skipping buy.")
-        return 0
-    from reports import get_balance, _load, _save
-    STATE_FILE = "position_state.json"
+        return 0, 0.0
+    from reports import get_balance, init_balance
     current_balance_usd = get_balance()
     if current_balance_usd <= 0:
         current_balance_usd = float(config.get("DAILY_CAPITAL_USD", 0.0))
-        # INITIALIZE STATE FILE
-        state = _load(STATE_FILE)
-        state["balance"] = current_balance_usd
-        state["cycle"] = state.get("cycle", 0)
-        _save(STATE_FILE, state)
+        # INITIALIZE STATE
+        init_balance(current_balance_usd)
         logger.info("COMPOUNDING: Initialized with DAILY_CAPITAL_USD: $%.2f", current_balance_usd)
     else:
         logger.info("COMPOUNDING: Using current balance: $%.2f", current_balance_usd)
-    buy_usd = current_balance_usd
+    # Parallel workers pass their reserved share instead of the whole balance
+    buy_usd = current_balance_usd if usd_amount is None else min(usd_amount, current_balance_usd)
     buy_fee_pct = float(config.get("BUY_FEE_PERCENT", 0.0))
     sol_equivalent = buy_usd / sol_price
     sol_after_fee = sol_equivalent * (1.0 - buy_fee_pct / 100.0)
@@ -40,7 +36,7 @@ async def compute_amount_from_usd(session, config, ca=None):
         "COMPOUND BUY | Balance: $%.2f → Using: $%.2f → %.6f SOL → %d lamports",
         current_balance_usd, buy_usd, sol_after_fee, lamports
     )
-    return lamports
+    return lamports, sol_price
 
 async def sleep_with_logging(sec: float, reason: str = ""):
     logger.info(f"Sleeping {sec}s: {reason}")
@@ -62,7 +58,7 @@ async def send_telegram_message(
         logger.warning("TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID missing!")
         return
 
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
+    url = f"{TELEGRAM_API}/bot{token}/sendMessage"
     payload = {
         "chat_id": chat,
         "text": text,